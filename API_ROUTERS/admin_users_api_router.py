@@ -2,17 +2,12 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, EmailStr
 from typing import Dict, Any
 import asyncpg
-import os
-from dotenv import load_dotenv
 from DATABASE_HANDLER.utils.General_Functions import sha256_hash
 from DATABASE_HANDLER.auth import require_admin
-
-load_dotenv()
+from DATABASE_HANDLER.connection_pool import get_db_connection
 
 router = APIRouter(prefix="/api", tags=["Admin Users Management"])
 
-DATABASE_URL = os.getenv("POSTGRES_CONNECTION_URL")
-
 class CreateAdminUserRequest(BaseModel):
     username: str
     email: EmailStr
@@ -25,13 +20,12 @@ class UpdateStatusRequest(BaseModel):
     active: bool
 
 @router.get("/admin-users")
-async def get_admin_users(current_user: Dict[str, Any] = Depends(require_admin)):
+async def get_admin_users(current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Get all admin users with their details
     Returns list of users without sensitive password information
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         users = await conn.fetch(
             """
@@ -41,8 +35,6 @@ async def get_admin_users(current_user: Dict[str, Any] = Depends(require_admin))
             """
         )
         
-        await conn.close()
-        
         users_list = [
             {
                 "id": str(user['id']),
@@ -65,7 +57,7 @@ async def get_admin_users(current_user: Dict[str, Any] = Depends(require_admin))
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/admin-users")
-async def create_admin_user(user_data: CreateAdminUserRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+async def create_admin_user(user_data: CreateAdminUserRequest, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Create a new admin user
     Hashes email and password before storing
@@ -77,7 +69,6 @@ async def create_admin_user(user_data: CreateAdminUserRequest, current_user: Dic
     hashed_password = sha256_hash(user_data.password)
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         existing_user = await conn.fetchrow(
             "SELECT id FROM admin_users WHERE email = $1 OR username = $2",
@@ -86,7 +77,6 @@ async def create_admin_user(user_data: CreateAdminUserRequest, current_user: Dic
         )
         
         if existing_user:
-            await conn.close()
             raise HTTPException(status_code=400, detail="User with this email or username already exists")
         
         new_user = await conn.fetchrow(
@@ -100,8 +90,6 @@ async def create_admin_user(user_data: CreateAdminUserRequest, current_user: Dic
             hashed_password
         )
         
-        await conn.close()
-        
         print(f"✓ Admin user created successfully: {user_data.username}")
         return {
             "status": "success",
@@ -125,7 +113,7 @@ async def create_admin_user(user_data: CreateAdminUserRequest, current_user: Dic
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.put("/admin-users/{user_id}")
-async def update_admin_user_password(user_id: str, password_data: UpdatePasswordRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+async def update_admin_user_password(user_id: str, password_data: UpdatePasswordRequest, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Update admin user password
     Does not require old password - direct password reset
@@ -135,7 +123,6 @@ async def update_admin_user_password(user_id: str, password_data: UpdatePassword
     hashed_password = sha256_hash(password_data.password)
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         user = await conn.fetchrow(
             "SELECT id, username FROM admin_users WHERE id = $1",
@@ -143,7 +130,6 @@ async def update_admin_user_password(user_id: str, password_data: UpdatePassword
         )
         
         if not user:
-            await conn.close()
             raise HTTPException(status_code=404, detail="User not found")
         
         await conn.execute(
@@ -156,8 +142,6 @@ async def update_admin_user_password(user_id: str, password_data: UpdatePassword
             user_id
         )
         
-        await conn.close()
-        
         print(f"✓ Password updated successfully for user: {user['username']}")
         return {
             "status": "success",
@@ -174,7 +158,7 @@ async def update_admin_user_password(user_id: str, password_data: UpdatePassword
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.delete("/admin-users/{user_id}")
-async def delete_admin_user(user_id: str, current_user: Dict[str, Any] = Depends(require_admin)):
+async def delete_admin_user(user_id: str, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Delete an admin user
     Permanently removes the user from the database
@@ -182,7 +166,6 @@ async def delete_admin_user(user_id: str, current_user: Dict[str, Any] = Depends
     print(f"Deleting user ID: {user_id}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         user = await conn.fetchrow(
             "SELECT username FROM admin_users WHERE id = $1",
@@ -190,7 +173,6 @@ async def delete_admin_user(user_id: str, current_user: Dict[str, Any] = Depends
         )
         
         if not user:
-            await conn.close()
             raise HTTPException(status_code=404, detail="User not found")
         
         await conn.execute(
@@ -198,8 +180,6 @@ async def delete_admin_user(user_id: str, current_user: Dict[str, Any] = Depends
             user_id
         )
         
-        await conn.close()
-        
         print(f"✓ User deleted successfully: {user['username']}")
         return {
             "status": "success",
@@ -216,7 +196,7 @@ async def delete_admin_user(user_id: str, current_user: Dict[str, Any] = Depends
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.patch("/admin-users/{user_id}/status")
-async def update_admin_user_status(user_id: str, status_data: UpdateStatusRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+async def update_admin_user_status(user_id: str, status_data: UpdateStatusRequest, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Activate or deactivate an admin user
     When deactivated, user cannot login
@@ -225,7 +205,6 @@ async def update_admin_user_status(user_id: str, status_data: UpdateStatusReques
     print(f"Updating status for user ID: {user_id} to {'active' if status_data.active else 'inactive'}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         user = await conn.fetchrow(
             "SELECT username FROM admin_users WHERE id = $1",
@@ -233,7 +212,6 @@ async def update_admin_user_status(user_id: str, status_data: UpdateStatusReques
         )
         
         if not user:
-            await conn.close()
             raise HTTPException(status_code=404, detail="User not found")
         
         await conn.execute(
@@ -246,8 +224,6 @@ async def update_admin_user_status(user_id: str, status_data: UpdateStatusReques
             user_id
         )
         
-        await conn.close()
-        
         status_text = "activated" if status_data.active else "deactivated"
         print(f"✓ User {status_text} successfully: {user['username']}")
         return {
@@ -1,18 +1,42 @@
 import logging
-from fastapi import APIRouter, HTTPException, Query, Request, Depends
-from pydantic import BaseModel, field_validator, ValidationError
+from fastapi import APIRouter, HTTPException, Query, Request, Response, Depends, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, field_validator, ValidationError
 from typing import Optional, Dict, Any, List
+from uuid import UUID
 import asyncpg
 import json
 import re
+from datetime import date, datetime, timedelta
 from DATABASE_HANDLER.auth import require_admin
+from DATABASE_HANDLER.connection_pool import get_db_connection, get_db_transaction
 from DATABASE_HANDLER.utils.shared_utils import generate_slug, ensure_unique_slug
+from PAGE_SERVING_ROUTERS.static_site_generator import refresh_blog_pages
+from DATABASE_HANDLER.utils.generate_blog_sections import compute_blog_card_fields
+from DATABASE_HANDLER.utils.conditional_requests import make_etag, is_not_modified, not_modified_response, validator_headers
+from DATABASE_HANDLER.utils.json_response import FastJSONResponse, FastJSONRoute
+from DATABASE_HANDLER.utils.pdf_download_rollups import fetch_pdf_download_kpis, fetch_pdf_download_range
+from DATABASE_HANDLER.utils.copy_export import MEDIA_TYPES, stream_copy
+from DATABASE_HANDLER.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields, build_filters, where_clause, keyset_query, split_page, stream_ndjson, fetch_page_with_total
 from config import config, StatusConstants, ContentTypeConstants
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api", tags=["Blogs Management"])
+router = APIRouter(prefix="/api", tags=["Blogs Management"], route_class=FastJSONRoute, default_response_class=FastJSONResponse)
 
-DATABASE_URL = config.DATABASE_URL
+# Fields the admin listing can return (field -> column); listings return card metadata unless fields= asks for more
+BLOG_FIELDS = {
+    "id": "id", "slug": "slug", "title": "title", "summary": "summary", "cover_image": "cover_image",
+    "cover_image_alt": "cover_image_alt", "category": "category", "status": "status", "type": "type", "date": "date",
+    "editors_choice": "editors_choice", "redirect_url": "redirect_url", "read_time": "read_time",
+    "isdeleted": "isdeleted", "created_at": "created_at", "updated_at": "updated_at",
+    "keyword": "keyword", "blogContent": "blogContent"
+}
+BLOG_CARD_FIELDS = [field for field in BLOG_FIELDS if field not in ("keyword", "blogContent")]
+
+# Longest range /pdf-downloads-kpi/range serves; its daily series has one entry per day
+MAX_KPI_RANGE_DAYS = 366 * 5
+
+PDF_DOWNLOAD_COLUMNS = ["timestamp", "first_name", "last_name", "email", "company_name", "mobile_number", "pdf_link"]
 
 class CreateBlogRequest(BaseModel):
     blogContent: Dict[str, Any]
@@ -107,41 +131,11 @@ class UpdateBlogRequest(BaseModel):
                 raise ValueError('Redirect URL must start with http:// or https://')
         return v
 
-def _extract_blog_image(blog_content: Dict[str, Any]) -> Optional[str]:
-    if not blog_content:
-        return None
-    
-    if blog_content.get('mainImageUrl'):
-        return blog_content['mainImageUrl']
-    
-    if blog_content.get('blogTitleImage'):
-        return blog_content['blogTitleImage']
-    
-    if blog_content.get('blog_cover_image') and isinstance(blog_content['blog_cover_image'], dict):
-        return blog_content['blog_cover_image'].get('url')
-    
-    if blog_content.get('blogcontent') and isinstance(blog_content['blogcontent'], dict):
-        blocks = blog_content['blogcontent'].get('blocks', [])
-        for block in blocks:
-            if block.get('type') == 'image' and block.get('data', {}).get('file', {}).get('url'):
-                return block['data']['file']['url']
-    
-    return None
-
-
 def _parse_blog_content_from_db(blog_content_raw: Any, blog_id: str) -> Dict[str, Any]:
-    parsed_content = {}
-    if isinstance(blog_content_raw, str):
-        try:
-            parsed_content = json.loads(blog_content_raw)
-        except json.JSONDecodeError:
-            logger.error(f"Failed to decode blogcontent JSON for blog ID {blog_id}: {blog_content_raw}")
-            return {}
-    elif isinstance(blog_content_raw, dict):
-        parsed_content = blog_content_raw
-    else:
-        logger.warning(f"Unexpected type for blogcontent for blog ID {blog_id}: {type(blog_content_raw)}. Expected str or dict.")
+    if not isinstance(blog_content_raw, dict):
+        logger.warning(f"Unexpected type for blogcontent for blog ID {blog_id}: {type(blog_content_raw)}. Expected dict.")
         return {}
+    parsed_content = blog_content_raw
     
     actual_blog_content = {}
     if 'blogcontent' in parsed_content and isinstance(parsed_content['blogcontent'], dict):
@@ -154,64 +148,109 @@ def _parse_blog_content_from_db(blog_content_raw: Any, blog_id: str) -> Dict[str
     
     return actual_blog_content
 
-def _format_blog_list(blogs_list_raw: List[asyncpg.Record]) -> List[Dict[str, Any]]:
+def _format_landing_blog_list(blogs_list_raw: List[asyncpg.Record]) -> List[Dict[str, Any]]:
+    """
+    Format blogs for the landing page from the denormalized card columns only.
+    blogContent carries just the fields the landing page script reads.
+    """
     formatted_blogs = []
     for blog in blogs_list_raw:
-        actual_blog_content = _parse_blog_content_from_db(blog['blogcontent'], str(blog['id']))
-        
-        keyword_dict = blog['keyword']
-        if isinstance(keyword_dict, str):
-            try:
-                keyword_dict = json.loads(keyword_dict)
-            except json.JSONDecodeError:
-                logger.error(f"Failed to decode keyword for blog ID {blog['id']}: {keyword_dict}")
-                keyword_dict = {}
-
-        blog_category = blog.get('category', '')
-        if not blog_category:
-            blog_category = actual_blog_content.get('blogcategory') or actual_blog_content.get('blogCategory') or ''
-
-        cover_image = _extract_blog_image(actual_blog_content)
-        
-        actual_blog_content['coverImage'] = cover_image
-
         formatted_blogs.append({
-            "id": str(blog['id']),
-            "blogContent": actual_blog_content,
+            "id": blog['id'],
+            "blogContent": {
+                "blogTitle": blog['title'],
+                "blogSummary": blog['summary'],
+                "coverImage": blog['cover_image']
+            },
             "status": blog['status'],
-            "date": blog['date'].isoformat() if blog['date'] else None,
-            "keyword": keyword_dict,
-            "category": blog_category,
+            "date": blog['date'],
+            "category": blog['category'] or '',
             "slug": blog['slug'],
             "type": blog['type'],
             "redirect_url": blog['redirect_url'],
             "isdeleted": blog['isdeleted'],
-            "created_at": blog['created_at'].isoformat() if blog['created_at'] else None,
-            "updated_at": blog['updated_at'].isoformat() if blog['updated_at'] else None,
-            "editors_choice": blog.get('editors_choice', 'N'),
-            "coverImage": cover_image
+            "created_at": blog['created_at'],
+            "updated_at": blog['updated_at'],
+            "editors_choice": blog['editors_choice'] or 'N',
+            "coverImage": blog['cover_image']
         })
     return formatted_blogs
 
+def _blog_columns(fields: List[str]) -> List[str]:
+    columns = [BLOG_FIELDS[field] for field in fields]
+    if "blogContent" in fields:
+        # blogContent carries the cover image from the card column
+        columns.append("cover_image")
+    return list(dict.fromkeys(columns))
+
+def _format_blog_row(blog: asyncpg.Record, fields: List[str]) -> Dict[str, Any]:
+    formatted = {}
+    for field in fields:
+        if field == "blogContent":
+            actual_blog_content = _parse_blog_content_from_db(blog['blogcontent'], str(blog['id']))
+            actual_blog_content['coverImage'] = blog['cover_image']
+            formatted[field] = actual_blog_content
+        elif field == "editors_choice":
+            formatted[field] = blog['editors_choice'] or 'N'
+        else:
+            formatted[field] = blog[BLOG_FIELDS[field].lower()]
+    return formatted
+
+def _format_blog_list(blogs_list_raw: List[asyncpg.Record], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    fields = fields or list(BLOG_FIELDS)
+    return [_format_blog_row(blog, fields) for blog in blogs_list_raw]
+
 
 @router.get("/blogs")
 async def get_blogs(
-    include_deleted: bool = Query(False, description="Include soft-deleted blogs"),
-    purpose: Optional[str] = Query(None, description="Purpose of the request, e.g., 'landing_page'")
+    request: Request,
+    response: Response,
+    include_deleted: bool = Query(False, description="Include soft-deleted blogs (same as deleted=all)"),
+    purpose: Optional[str] = Query(None, description="Purpose of the request, e.g., 'landing_page'"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    blog_type: Optional[str] = Query(None, alias="type", description="Filter by type"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    editors_choice: Optional[str] = Query(None, pattern="^[YN]$", description="Filter by editor's choice flag"),
+    deleted: str = Query("false", description="Soft-deleted state: false, true or all"),
+    q: Optional[str] = Query(None, description="Search blog titles"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; card metadata by default, * for all"),
+    sort: str = Query("date", description="Sort column"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort direction"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    conn: asyncpg.Connection = Depends(get_db_connection)
 ):
     """
-    Get all blogs.
-    - By default excludes soft-deleted entries. Set include_deleted=true to show all.
+    Get blogs, one keyset-paginated page at a time.
+    - Filters by status, type, category, editors_choice and deleted state on the server; by default
+      soft-deleted entries are excluded, so the isDeleted = FALSE partial indexes apply.
+    - Returns card metadata only unless fields= names more (e.g. fields=id,title,blogContent, or * for everything).
+    - Follow next_cursor for the next page; total is the size of the whole filtered set.
     - Use purpose=landing_page to get blogs structured for the landing page sections.
+    - Sends ETag / Last-Modified from max(updated_at) and the row count of the listed set,
+      and answers a matching conditional request with 304 before fetching any rows.
     """
     try:
-        logger.debug(f"Attempting to connect to database with URL: {DATABASE_URL}")
-        conn = await asyncpg.connect(DATABASE_URL)
-        logger.debug("Successfully connected to database.")
+        if purpose == 'landing_page':
+            conditions, params = ["isdeleted = FALSE", "status = 'published'"], []
+        else:
+            conditions, params = build_filters(
+                {"status": status, "type": blog_type, "category": category, "editors_choice": editors_choice},
+                "all" if include_deleted else deleted,
+                q
+            )
+            selected_fields = parse_fields(fields, list(BLOG_FIELDS), BLOG_CARD_FIELDS)
+            query, query_params = keyset_query("blogs", _blog_columns(selected_fields), conditions, params, sort, order == "desc", cursor, limit)
+
+        version = await conn.fetchrow(f"SELECT MAX(updated_at) AS last_modified, COUNT(*) AS total FROM blogs {where_clause(conditions)}", *params)
+        etag = make_etag("blogs", purpose, request.url.query, version['last_modified'], version['total'])
+        if is_not_modified(request, etag, version['last_modified']):
+            return not_modified_response(etag, version['last_modified'])
+        response.headers.update(validator_headers(etag, version['last_modified']))
 
         if purpose == 'landing_page':
             query = """
-                SELECT id, blogContent, status, date, keyword, slug, type, redirect_url, category, isdeleted, created_at, updated_at, editors_choice
+                SELECT id, title, summary, cover_image, status, date, slug, type, redirect_url, category, isdeleted, created_at, updated_at, editors_choice
                 FROM blogs
                 WHERE isdeleted = FALSE AND status = 'published'
                 ORDER BY date DESC
@@ -228,41 +267,30 @@ async def get_blogs(
             # The rest for "Read More"
             read_more_blogs = other_blogs[3:]
 
-            await conn.close()
-            
             return {
                 "status": "success",
                 "sections": {
-                    "editors_choice": _format_blog_list(editors_choice_blogs),
-                    "latest_gossip": _format_blog_list(latest_gossip_blogs),
-                    "read_more": _format_blog_list(read_more_blogs)
+                    "editors_choice": _format_landing_blog_list(editors_choice_blogs),
+                    "latest_gossip": _format_landing_blog_list(latest_gossip_blogs),
+                    "read_more": _format_landing_blog_list(read_more_blogs)
                 }
             }
         
-        else:
-            if include_deleted:
-                query = """
-                    SELECT id, blogContent, status, date, keyword, slug, type, redirect_url, category, isdeleted, created_at, updated_at, editors_choice
-                    FROM blogs
-                    ORDER BY date DESC
-                """
-            else:
-                query = """
-                    SELECT id, blogContent, status, date, keyword, slug, type, redirect_url, category, isdeleted, created_at, updated_at, editors_choice
-                    FROM blogs
-                    WHERE isdeleted = FALSE
-                    ORDER BY date DESC
-                """
-            
-            logger.debug(f"Executing query for general blogs: {query}")
-            blogs = await conn.fetch(query)
-            logger.debug(f"Fetched {len(blogs)} general blogs. Raw data: {blogs}")
-            await conn.close()
-            
-            blogs_list = _format_blog_list(blogs)
-            
-            return {"status": "success", "blogs": blogs_list, "count": len(blogs_list)}
-            
+        logger.debug(f"Executing query for general blogs: {query}")
+        blogs, next_cursor = split_page(await conn.fetch(query, *query_params), sort, limit)
+        blogs_list = _format_blog_list(blogs, selected_fields)
+
+        return {
+            "status": "success",
+            "blogs": blogs_list,
+            "count": len(blogs_list),
+            "total": version['total'],
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None
+        }
+
+    except HTTPException:
+        raise
     except asyncpg.PostgresError as e:
         logger.error(f"Database error in get_blogs: {e}")
         raise HTTPException(status_code=500, detail="Database error occurred")
@@ -272,7 +300,7 @@ async def get_blogs(
 
 
 @router.post("/blogs", status_code=201)
-async def create_blog(blog_data: CreateBlogRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+async def create_blog(blog_data: CreateBlogRequest, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Create a new blog
     Requires blog content as JSONB
@@ -284,46 +312,52 @@ async def create_blog(blog_data: CreateBlogRequest, current_user: Dict[str, Any]
         raise HTTPException(status_code=400, detail="Blog content is required")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         # Extract the type from blog data if it exists
         blog_content = blog_data.blogContent.copy() if blog_data.blogContent else {}
         content_type = blog_content.get('contentType', ContentTypeConstants.BLOG)
+        card = compute_blog_card_fields(blog_content)
         
         new_blog = await conn.fetchrow(
             """
-            INSERT INTO blogs (blogContent, status, keyword, editors_choice, slug, type, redirect_url, isdeleted)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, FALSE)
+            INSERT INTO blogs (blogContent, status, keyword, editors_choice, slug, type, redirect_url, isdeleted,
+                               category, title, summary, cover_image, cover_image_alt, read_time)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, FALSE, $8, $9, $10, $11, $12, $13)
             RETURNING id, blogContent, status, date, keyword, editors_choice, slug, type, redirect_url, isdeleted, created_at, updated_at
             """,
-            json.dumps(blog_content),
+            blog_content,
             blog_data.status,
-            json.dumps(blog_data.keyword),
+            blog_data.keyword,
             blog_data.editors_choice,
             blog_data.slug,
             content_type,
-            blog_data.redirect_url
+            blog_data.redirect_url,
+            card['category'],
+            card['title'],
+            card['summary'],
+            card['cover_image'],
+            card['cover_image_alt'],
+            card['read_time']
         )
         
-        await conn.close()
-        
         logger.info(f"Blog created successfully with ID: {new_blog['id']}")
+        background_tasks.add_task(refresh_blog_pages, new_blog['slug'])
         return {
             "status": "success",
             "message": "Blog created successfully",
             "blog": {
-                "id": str(new_blog['id']),
+                "id": new_blog['id'],
                 "blogContent": _parse_blog_content_from_db(new_blog['blogcontent'], str(new_blog['id'])),
                 "status": new_blog['status'],
-                "date": new_blog['date'].isoformat() if new_blog['date'] else None,
-                "keyword": json.loads(new_blog['keyword']) if isinstance(new_blog['keyword'], str) else new_blog['keyword'],
+                "date": new_blog['date'],
+                "keyword": new_blog['keyword'],
                 "category": _parse_blog_content_from_db(new_blog['blogcontent'], str(new_blog['id'])).get('blogcategory', 'General'),
                 "slug": new_blog['slug'],
                 "type": new_blog['type'],
                 "redirect_url": new_blog['redirect_url'],
                 "isdeleted": new_blog['isdeleted'],
-                "created_at": new_blog['created_at'].isoformat() if new_blog['created_at'] else None,
-                "updated_at": new_blog['updated_at'].isoformat() if new_blog['updated_at'] else None
+                "created_at": new_blog['created_at'],
+                "updated_at": new_blog['updated_at']
             }
         }
         
@@ -335,7 +369,7 @@ async def create_blog(blog_data: CreateBlogRequest, current_user: Dict[str, Any]
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.put("/blogs/{blog_id}")
-async def update_blog(blog_id: str, blog_data: UpdateBlogRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+async def update_blog(blog_id: str, blog_data: UpdateBlogRequest, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Update an existing blog
     Only updates provided fields (partial update)
@@ -344,19 +378,16 @@ async def update_blog(blog_id: str, blog_data: UpdateBlogRequest, current_user:
     logger.info(f"Updating blog ID: {blog_id}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         existing_blog = await conn.fetchrow(
-            "SELECT id, isdeleted FROM blogs WHERE id = $1",
+            "SELECT id, slug, isdeleted FROM blogs WHERE id = $1",
             blog_id
         )
         
         if not existing_blog:
-            await conn.close()
             raise HTTPException(status_code=404, detail="Blog not found")
         
         if existing_blog['isdeleted']:
-            await conn.close()
             raise HTTPException(status_code=400, detail="Cannot update deleted blog")
         
         update_fields = []
@@ -365,8 +396,18 @@ async def update_blog(blog_id: str, blog_data: UpdateBlogRequest, current_user:
         
         if blog_data.blogContent is not None:
             update_fields.append(f"blogContent = ${param_count}")
-            update_values.append(json.dumps(blog_data.blogContent))
+            update_values.append(blog_data.blogContent)
             param_count += 1
+
+            card = compute_blog_card_fields(blog_data.blogContent)
+            for column in ('title', 'summary', 'cover_image', 'cover_image_alt', 'read_time'):
+                update_fields.append(f"{column} = ${param_count}")
+                update_values.append(card[column])
+                param_count += 1
+            if card['category']:
+                update_fields.append(f"category = ${param_count}")
+                update_values.append(card['category'])
+                param_count += 1
         
         if blog_data.status is not None:
             update_fields.append(f"status = ${param_count}")
@@ -375,7 +416,7 @@ async def update_blog(blog_id: str, blog_data: UpdateBlogRequest, current_user:
         
         if blog_data.keyword is not None:
             update_fields.append(f"keyword = ${param_count}")
-            update_values.append(json.dumps(blog_data.keyword))
+            update_values.append(blog_data.keyword)
             param_count += 1
         
         if blog_data.slug is not None:
@@ -394,7 +435,6 @@ async def update_blog(blog_id: str, blog_data: UpdateBlogRequest, current_user:
             param_count += 1
         
         if not update_fields:
-            await conn.close()
             raise HTTPException(status_code=400, detail="No fields to update")
         
         update_fields.append(f"updated_at = CURRENT_TIMESTAMP")
@@ -408,25 +448,25 @@ async def update_blog(blog_id: str, blog_data: UpdateBlogRequest, current_user:
         """
         
         updated_blog = await conn.fetchrow(query, *update_values)
-        await conn.close()
         
         logger.info(f"Blog updated successfully: {blog_id}")
+        background_tasks.add_task(refresh_blog_pages, existing_blog['slug'], updated_blog['slug'])
         return {
             "status": "success",
             "message": "Blog updated successfully",
             "blog": {
-                "id": str(updated_blog['id']),
+                "id": updated_blog['id'],
                 "blogContent": _parse_blog_content_from_db(updated_blog['blogcontent'], str(updated_blog['id'])),
                 "status": updated_blog['status'],
-                "date": updated_blog['date'].isoformat() if updated_blog['date'] else None,
-                "keyword": json.loads(updated_blog['keyword']) if isinstance(updated_blog['keyword'], str) else updated_blog['keyword'],
+                "date": updated_blog['date'],
+                "keyword": updated_blog['keyword'],
                 "category": _parse_blog_content_from_db(updated_blog['blogcontent'], str(updated_blog['id'])).get('blogcategory', 'General'),
                 "slug": updated_blog['slug'],
                 "type": updated_blog['type'],
                 "redirect_url": updated_blog['redirect_url'],
                 "isdeleted": updated_blog['isdeleted'],
-                "created_at": updated_blog['created_at'].isoformat() if updated_blog['created_at'] else None,
-                "updated_at": updated_blog['updated_at'].isoformat() if updated_blog['updated_at'] else None
+                "created_at": updated_blog['created_at'],
+                "updated_at": updated_blog['updated_at']
             }
         }
         
@@ -440,16 +480,16 @@ async def update_blog(blog_id: str, blog_data: UpdateBlogRequest, current_user:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.patch("/blogs/{blog_id}")
-async def partial_update_blog(blog_id: str, blog_data: UpdateBlogRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+async def partial_update_blog(blog_id: str, blog_data: UpdateBlogRequest, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Partial update of an existing blog (alias for PUT endpoint)
     Only updates provided fields
     Cannot update soft-deleted blogs
     """
-    return await update_blog(blog_id, blog_data)
+    return await update_blog(blog_id, blog_data, background_tasks, current_user, conn)
 
 @router.delete("/blogs/{blog_id}")
-async def delete_blog(blog_id: str, current_user: Dict[str, Any] = Depends(require_admin)):
+async def delete_blog(blog_id: str, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_transaction)):
     """
     Permanently delete a blog from the database
     This action cannot be undone
@@ -457,15 +497,13 @@ async def delete_blog(blog_id: str, current_user: Dict[str, Any] = Depends(requi
     logger.warning(f"Permanently deleting blog ID: {blog_id}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         blog = await conn.fetchrow(
-            "SELECT id FROM blogs WHERE id = $1",
+            "SELECT id, slug FROM blogs WHERE id = $1",
             blog_id
         )
         
         if not blog:
-            await conn.close()
             raise HTTPException(status_code=404, detail="Blog not found")
         
         await conn.execute(
@@ -473,9 +511,8 @@ async def delete_blog(blog_id: str, current_user: Dict[str, Any] = Depends(requi
             blog_id
         )
         
-        await conn.close()
-        
         logger.info(f"Blog permanently deleted successfully: {blog_id}")
+        background_tasks.add_task(refresh_blog_pages, blog['slug'])
         return {
             "status": "success",
             "message": "Blog deleted successfully"
@@ -491,7 +528,7 @@ async def delete_blog(blog_id: str, current_user: Dict[str, Any] = Depends(requi
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/blogs/{blog_id}/restore")
-async def restore_blog(blog_id: str, current_user: Dict[str, Any] = Depends(require_admin)):
+async def restore_blog(blog_id: str, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_transaction)):
     """
     Restore a soft-deleted blog
     Sets isdeleted back to FALSE
@@ -499,19 +536,16 @@ async def restore_blog(blog_id: str, current_user: Dict[str, Any] = Depends(requ
     logger.info(f"Restoring blog ID: {blog_id}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         blog = await conn.fetchrow(
-            "SELECT id, isdeleted FROM blogs WHERE id = $1",
+            "SELECT id, slug, isdeleted FROM blogs WHERE id = $1",
             blog_id
         )
         
         if not blog:
-            await conn.close()
             raise HTTPException(status_code=404, detail="Blog not found")
         
         if not blog['isdeleted']:
-            await conn.close()
             raise HTTPException(status_code=400, detail="Blog is not deleted")
         
         await conn.execute(
@@ -523,9 +557,8 @@ async def restore_blog(blog_id: str, current_user: Dict[str, Any] = Depends(requ
             blog_id
         )
         
-        await conn.close()
-        
         logger.info(f"Blog restored successfully: {blog_id}")
+        background_tasks.add_task(refresh_blog_pages, blog['slug'])
         return {
             "status": "success",
             "message": "Blog restored successfully"
@@ -540,7 +573,7 @@ async def restore_blog(blog_id: str, current_user: Dict[str, Any] = Depends(requ
         logger.error(f"Unexpected error in restore_blog: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 @router.post("/blogs/{blog_id}/toggle-editors-choice")
-async def toggle_editors_choice(blog_id: str, current_user: Dict[str, Any] = Depends(require_admin)):
+async def toggle_editors_choice(blog_id: str, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_transaction)):
     """
     Toggle editor's choice status for a blog
     Validates the 5-item maximum limit before setting to 'Y'
@@ -548,7 +581,6 @@ async def toggle_editors_choice(blog_id: str, current_user: Dict[str, Any] = Dep
     logger.info(f"Toggling editor's choice for blog ID: {blog_id}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         existing_blog = await conn.fetchrow(
             "SELECT id, editors_choice, isdeleted FROM blogs WHERE id = $1",
@@ -556,11 +588,9 @@ async def toggle_editors_choice(blog_id: str, current_user: Dict[str, Any] = Dep
         )
         
         if not existing_blog:
-            await conn.close()
             raise HTTPException(status_code=404, detail="Blog not found")
         
         if existing_blog['isdeleted']:
-            await conn.close()
             raise HTTPException(status_code=400, detail="Cannot modify deleted blog")
         
         current_status = existing_blog['editors_choice']
@@ -576,7 +606,6 @@ async def toggle_editors_choice(blog_id: str, current_user: Dict[str, Any] = Dep
             )
             
             if count_result >= 5:
-                await conn.close()
                 raise HTTPException(
                     status_code=400,
                     detail="Maximum of 5 blogs can be marked as Editor's Choice. Please remove one before adding another."
@@ -593,26 +622,25 @@ async def toggle_editors_choice(blog_id: str, current_user: Dict[str, Any] = Dep
             blog_id
         )
         
-        await conn.close()
-        
         logger.info(f"Editor's choice toggled successfully for blog: {blog_id} to {new_status}")
+        background_tasks.add_task(refresh_blog_pages, updated_blog['slug'])
         return {
             "status": "success",
             "message": f"Editor's choice {'added' if new_status == 'Y' else 'removed'} successfully",
             "editors_choice": new_status,
             "blog": {
-                "id": str(updated_blog['id']),
+                "id": updated_blog['id'],
                 "blogContent": updated_blog['blogcontent'],
                 "status": updated_blog['status'],
-                "date": updated_blog['date'].isoformat() if updated_blog['date'] else None,
+                "date": updated_blog['date'],
                 "keyword": updated_blog['keyword'],
                 "editors_choice": updated_blog['editors_choice'],
                 "slug": updated_blog['slug'],
                 "type": updated_blog['type'],
                 "redirect_url": updated_blog['redirect_url'],
                 "isdeleted": updated_blog['isdeleted'],
-                "created_at": updated_blog['created_at'].isoformat() if updated_blog['created_at'] else None,
-                "updated_at": updated_blog['updated_at'].isoformat() if updated_blog['updated_at'] else None
+                "created_at": updated_blog['created_at'],
+                "updated_at": updated_blog['updated_at']
             }
         }
         
@@ -627,19 +655,16 @@ async def toggle_editors_choice(blog_id: str, current_user: Dict[str, Any] = Dep
 
 
 @router.get("/blogs/type-counts")
-async def get_blog_type_counts():
+async def get_blog_type_counts(conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Get the current count of blogs for special types.
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         type_counts = await conn.fetch(
             "SELECT type, COUNT(*) as count FROM blogs WHERE type IN ('EDITORS_CHOICE', 'BLOG_HERO', 'BLOG_HOME_PAGE') AND isdeleted = FALSE GROUP BY type"
         )
         
-        await conn.close()
-        
         counts = {
             "EDITORS_CHOICE": 0,
             "BLOG_HERO": 0,
@@ -661,8 +686,63 @@ async def get_blog_type_counts():
         logger.error(f"Error getting blog type counts: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+
+@router.get("/blogs/export")
+async def export_blogs(
+    status: Optional[str] = Query(None, description="Filter by status"),
+    blog_type: Optional[str] = Query(None, alias="type", description="Filter by type"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    editors_choice: Optional[str] = Query(None, pattern="^[YN]$", description="Filter by editor's choice flag"),
+    deleted: str = Query("all", description="Soft-deleted state: false, true or all"),
+    q: Optional[str] = Query(None, description="Search blog titles"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export; every field by default"),
+    sort: str = Query("created_at", description="Sort column"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Sort direction"),
+    current_user: Dict[str, Any] = Depends(require_admin)
+):
+    """
+    Export every matching blog as newline-delimited JSON
+    Takes the same filters as GET /blogs; rows are streamed through a server-side cursor,
+    so the export is never held in memory whole
+    """
+    conditions, params = build_filters(
+        {"status": status, "type": blog_type, "category": category, "editors_choice": editors_choice},
+        deleted,
+        q
+    )
+    selected_fields = parse_fields(fields, list(BLOG_FIELDS), list(BLOG_FIELDS))
+    query, query_params = keyset_query("blogs", _blog_columns(selected_fields), conditions, params, sort, order == "desc", None, None)
+
+    return StreamingResponse(
+        stream_ndjson(query, query_params, lambda blog: _format_blog_row(blog, selected_fields)),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="blogs.ndjson"'}
+    )
+
+
+@router.get("/blogs/{blog_id}")
+async def get_blog(blog_id: UUID, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
+    """
+    Get one blog with every field, including soft-deleted ones
+    Used by the admin editor, since listings only carry card metadata
+    """
+    try:
+        blog = await conn.fetchrow(f"SELECT {', '.join(_blog_columns(list(BLOG_FIELDS)))} FROM blogs WHERE id = $1", blog_id)
+        if not blog:
+            raise HTTPException(status_code=404, detail="Blog not found")
+        return {"status": "success", "blog": _format_blog_row(blog, list(BLOG_FIELDS))}
+
+    except HTTPException:
+        raise
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database error in get_blog: {e}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_blog: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.post("/admin_save_blog")
-async def admin_save_blog(request: Request, current_user: Dict[str, Any] = Depends(require_admin)):
+async def admin_save_blog(request: Request, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_transaction)):
     """
     Save blog from admin panel (Draft or Publish)
     Receives complete blog data from frontend and saves to database
@@ -691,70 +771,73 @@ async def admin_save_blog(request: Request, current_user: Dict[str, Any] = Depen
         blog_type = data.get('blogType', 'GENERAL')
         editors_choice_val = 'Y' if blog_type == 'EDITORS_CHOICE' else 'N'
 
-        conn = await asyncpg.connect(DATABASE_URL)
-        
-        try:
-            # Check limits for special types
-            type_limits = {"EDITORS_CHOICE": 3, "BLOG_HERO": 1, "BLOG_HOME_PAGE": 3}
-            if blog_type in type_limits:
-                query = "SELECT COUNT(*) FROM blogs WHERE type = $1 AND isdeleted = FALSE"
-                params = [blog_type]
-                if blog_id:
-                    query += " AND id != $2"
-                    params.append(blog_id)
-                
-                count = await conn.fetchval(query, *params)
-                if count >= type_limits[blog_type]:
-                    raise HTTPException(status_code=400, detail=f"Maximum of {type_limits[blog_type]} blogs can be marked as {blog_type.replace('_', ' ')}.")
-
-            if reason == 'update' and blog_id:
-                existing_blog = await conn.fetchrow("SELECT id, slug FROM blogs WHERE id = $1 AND isdeleted = FALSE", blog_id)
-                if not existing_blog:
-                    raise HTTPException(status_code=404, detail="Blog not found for update")
-                
-                if slug != existing_blog['slug']:
-                    slug = await ensure_unique_slug(conn, slug, "blogs", blog_id)
-                
-                blog_category = data.get('blogCategory', '')
-                
-                updated_blog = await conn.fetchrow(
-                    """
-                    UPDATE blogs
-                    SET blogContent = $1, status = $2, editors_choice = $3, slug = $4, type = $5, category = $6, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = $7
-                    RETURNING id, slug
-                    """,
-                    json.dumps(data), blog_status, editors_choice_val, slug, blog_type, blog_category, blog_id
-                )
-                
-                if not updated_blog:
-                    raise HTTPException(status_code=404, detail="Blog not found for update")
-                
-                blog_url = f"{config.BACKEND_URL}/blog/{updated_blog['slug']}"
-                logger.info(f"Blog updated successfully - ID: {blog_id}, slug: {updated_blog['slug']}, status: {blog_status}, type: {blog_type}")
-                
-                return {"status": "success", "message": "Blog updated successfully", "blog_id": blog_id, "slug": updated_blog['slug'], "url": blog_url}
-            else:
-                slug = await ensure_unique_slug(conn, slug, "blogs")
-                blog_category = data.get('blogCategory', '')
-                
-                new_blog = await conn.fetchrow(
-                    """
-                    INSERT INTO blogs (blogContent, status, editors_choice, slug, type, category, isdeleted)
-                    VALUES ($1, $2, $3, $4, $5, $6, FALSE)
-                    RETURNING id, slug
-                    """,
-                    json.dumps(data), blog_status, editors_choice_val, slug, blog_type, blog_category
-                )
-                
-                blog_id = str(new_blog['id'])
-                blog_url = f"{config.BACKEND_URL}/blog/{new_blog['slug']}"
-                logger.info(f"Blog saved successfully - ID: {blog_id}, slug: {new_blog['slug']}, status: {blog_status}, type: {blog_type}")
-                
-                return {"status": "success", "message": "Blog saved successfully", "blog_id": blog_id, "slug": new_blog['slug'], "url": blog_url}
+        # Check limits for special types
+        type_limits = {"EDITORS_CHOICE": 3, "BLOG_HERO": 1, "BLOG_HOME_PAGE": 3}
+        if blog_type in type_limits:
+            query = "SELECT COUNT(*) FROM blogs WHERE type = $1 AND isdeleted = FALSE"
+            params = [blog_type]
+            if blog_id:
+                query += " AND id != $2"
+                params.append(blog_id)
+            
+            count = await conn.fetchval(query, *params)
+            if count >= type_limits[blog_type]:
+                raise HTTPException(status_code=400, detail=f"Maximum of {type_limits[blog_type]} blogs can be marked as {blog_type.replace('_', ' ')}.")
+
+        card = compute_blog_card_fields(data)
+
+        if reason == 'update' and blog_id:
+            existing_blog = await conn.fetchrow("SELECT id, slug FROM blogs WHERE id = $1 AND isdeleted = FALSE", blog_id)
+            if not existing_blog:
+                raise HTTPException(status_code=404, detail="Blog not found for update")
+            
+            if slug != existing_blog['slug']:
+                slug = await ensure_unique_slug(conn, slug, "blogs", blog_id)
+            
+            blog_category = data.get('blogCategory', '')
             
-        finally:
-            await conn.close()
+            updated_blog = await conn.fetchrow(
+                """
+                UPDATE blogs
+                SET blogContent = $1, status = $2, editors_choice = $3, slug = $4, type = $5, category = $6,
+                    title = $8, summary = $9, cover_image = $10, cover_image_alt = $11, read_time = $12,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = $7
+                RETURNING id, slug
+                """,
+                data, blog_status, editors_choice_val, slug, blog_type, blog_category, blog_id,
+                card['title'], card['summary'], card['cover_image'], card['cover_image_alt'], card['read_time']
+            )
+            
+            if not updated_blog:
+                raise HTTPException(status_code=404, detail="Blog not found for update")
+            
+            blog_url = f"{config.BACKEND_URL}/blog/{updated_blog['slug']}"
+            logger.info(f"Blog updated successfully - ID: {blog_id}, slug: {updated_blog['slug']}, status: {blog_status}, type: {blog_type}")
+            background_tasks.add_task(refresh_blog_pages, existing_blog['slug'], updated_blog['slug'])
+            
+            return {"status": "success", "message": "Blog updated successfully", "blog_id": blog_id, "slug": updated_blog['slug'], "url": blog_url}
+        else:
+            slug = await ensure_unique_slug(conn, slug, "blogs")
+            blog_category = data.get('blogCategory', '')
+            
+            new_blog = await conn.fetchrow(
+                """
+                INSERT INTO blogs (blogContent, status, editors_choice, slug, type, category, isdeleted,
+                                   title, summary, cover_image, cover_image_alt, read_time)
+                VALUES ($1, $2, $3, $4, $5, $6, FALSE, $7, $8, $9, $10, $11)
+                RETURNING id, slug
+                """,
+                data, blog_status, editors_choice_val, slug, blog_type, blog_category,
+                card['title'], card['summary'], card['cover_image'], card['cover_image_alt'], card['read_time']
+            )
+            
+            blog_id = str(new_blog['id'])
+            blog_url = f"{config.BACKEND_URL}/blog/{new_blog['slug']}"
+            logger.info(f"Blog saved successfully - ID: {blog_id}, slug: {new_blog['slug']}, status: {blog_status}, type: {blog_type}")
+            background_tasks.add_task(refresh_blog_pages, new_blog['slug'])
+            
+            return {"status": "success", "message": "Blog saved successfully", "blog_id": blog_id, "slug": new_blog['slug'], "url": blog_url}
         
     except HTTPException:
         raise
@@ -771,18 +854,20 @@ async def admin_save_blog(request: Request, current_user: Dict[str, Any] = Depen
 
 from DATABASE_HANDLER.utils.General_Functions import store_pdf_download
 class PDFDownloadFormRequest(BaseModel):
-    first_name: str
-    last_name: Optional[str] = None
-    email: str
-    company_name: Optional[str] = None
-    mobile_number: Optional[str] = None
+    # Lengths match the pdf_downloads columns, so a lead is rejected here rather than when its batch is written
+    first_name: str = Field(max_length=255)
+    last_name: Optional[str] = Field(default=None, max_length=255)
+    email: str = Field(max_length=255)
+    company_name: Optional[str] = Field(default=None, max_length=255)
+    mobile_number: Optional[str] = Field(default=None, max_length=50)
     pdf_link: str # For blogs, this will be the blog slug
 
 
 @router.post("/pdf-download-form-blog")
 async def save_pdf_download_form_blog(form_data: PDFDownloadFormRequest):
     """
-    Save PDF download form submission to the database for a blog.
+    Save PDF download form submission for a blog.
+    Acknowledged once the lead is spooled; it reaches the database with the next batch.
     """
     logger.info(f"Saving PDF download form for blog: {form_data.pdf_link}")
     
@@ -808,30 +893,26 @@ async def save_pdf_download_form_blog(form_data: PDFDownloadFormRequest):
 @router.get("/pdf-downloads")
 async def get_pdf_downloads(
     page: int = Query(1, ge=1, description="Page number (starting from 1)"),
-    per_page: int = Query(10, ge=1, le=100, description="Items per page")
+    per_page: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; page is then only the number shown"),
+    conn: asyncpg.Connection = Depends(get_db_connection)
 ):
     """
-    Get paginated PDF download records.
+    Get paginated PDF download records, newest first.
+    Pages are keyed on (timestamp, id): follow next_cursor to step forward without rescanning
+    earlier pages; a bare page number still works for jumps. total_count comes from the count
+    cache, or is fetched in the same round trip as the page when the cache is cold.
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
-        
-        offset = (page - 1) * per_page
-        
-        count_query = "SELECT COUNT(*) FROM pdf_downloads"
-        total_count = await conn.fetchval(count_query)
         
-        query = """
-            SELECT timestamp, first_name, last_name, email, company_name, mobile_number, pdf_link
-            FROM pdf_downloads
-            ORDER BY timestamp DESC
-            LIMIT $1 OFFSET $2
-        """
-        downloads = await conn.fetch(query, per_page, offset)
-        
-        await conn.close()
+        query, query_params = keyset_query(
+            "pdf_downloads", PDF_DOWNLOAD_COLUMNS, [], [], "timestamp", True, cursor, per_page,
+            sort_columns={"timestamp": datetime.fromisoformat}, offset=(page - 1) * per_page
+        )
+        records, total_count = await fetch_page_with_total(conn, "pdf_downloads", [], [], query, query_params, "timestamp", True)
+        downloads, next_cursor = split_page(records, "timestamp", per_page)
         
-        downloads_list = [dict(record) for record in downloads]
+        downloads_list = [{column: record[column] for column in PDF_DOWNLOAD_COLUMNS} for record in downloads]
         
         total_pages = (total_count + per_page - 1) // per_page
         
@@ -842,10 +923,13 @@ async def get_pdf_downloads(
             "per_page": per_page,
             "total_count": total_count,
             "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
+            "has_next": next_cursor is not None,
+            "has_prev": page > 1,
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
     except asyncpg.PostgresError as e:
         logger.error(f"Database error in get_pdf_downloads: {e}")
         raise HTTPException(status_code=500, detail="Database error occurred")
@@ -853,47 +937,86 @@ async def get_pdf_downloads(
         logger.error(f"Unexpected error in get_pdf_downloads: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/pdf-downloads/export")
+async def export_pdf_downloads(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    start: Optional[date] = Query(None, description="First day to export, inclusive"),
+    end: Optional[date] = Query(None, description="Last day to export, inclusive"),
+    pdf_link: Optional[str] = Query(None, description="Only leads for this PDF link or blog slug"),
+    gzip: bool = Query(False, description="Gzip the file"),
+    current_user: Dict[str, Any] = Depends(require_admin)
+):
+    """
+    Export PDF download leads, oldest first, as a CSV or NDJSON file
+    Rows are streamed from COPY ... TO STDOUT as the database produces them, so memory stays
+    constant however many leads match
+    """
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    conditions, params = [], []
+    if start:
+        params.append(start)
+        conditions.append(f"timestamp >= ${len(params)}::date")
+    if end:
+        params.append(end)
+        conditions.append(f"timestamp < ${len(params)}::date + 1")
+    if pdf_link:
+        params.append(pdf_link)
+        conditions.append(f"pdf_link = ${len(params)}")
+    query = f"SELECT id, {', '.join(PDF_DOWNLOAD_COLUMNS)} FROM pdf_downloads {where_clause(conditions)} ORDER BY timestamp, id"
+
+    filename = f"pdf_downloads.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_copy(query, params, export_format, compress=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/pdf-downloads-kpi")
-async def get_pdf_downloads_kpi():
+async def get_pdf_downloads_kpi(conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Get Key Performance Indicators for PDF downloads.
+    Read from the daily rollups, so the cost does not grow with the number of leads.
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
-        # Total downloads this month
-        monthly_downloads_query = """
-            SELECT COUNT(*) FROM pdf_downloads
-            WHERE timestamp >= date_trunc('month', CURRENT_DATE)
-        """
-        total_downloads_this_month = await conn.fetchval(monthly_downloads_query)
-        
-        # Most downloaded PDF
-        most_downloaded_query = """
-            SELECT pdf_link, COUNT(*) as download_count
-            FROM pdf_downloads
-            GROUP BY pdf_link
-            ORDER BY download_count DESC
-            LIMIT 1
-        """
-        most_downloaded_record = await conn.fetchrow(most_downloaded_query)
-        most_downloaded_pdf = most_downloaded_record['pdf_link'] if most_downloaded_record else "-"
+        return await fetch_pdf_download_kpis(conn)
         
-        # Total downloads
-        total_downloads_query = "SELECT COUNT(*) FROM pdf_downloads"
-        total_downloads = await conn.fetchval(total_downloads_query)
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database error in get_pdf_downloads_kpi: {e}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_pdf_downloads_kpi: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/pdf-downloads-kpi/range")
+async def get_pdf_downloads_kpi_range(
+    start: Optional[date] = Query(None, description="First day of the range (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day of the range (default: today)"),
+    top: int = Query(5, ge=1, le=50, description="Number of PDFs to return in top_pdfs"),
+    conn: asyncpg.Connection = Depends(get_db_connection)
+):
+    """
+    Get PDF download KPIs for a date range: the total, a per-day series and the top PDFs.
+    Read from the daily rollups, like /pdf-downloads-kpi.
+    """
+    try:
         
-        await conn.close()
+        end = end or date.today()
+        start = start or end - timedelta(days=29)
+        if start > end:
+            raise HTTPException(status_code=400, detail="start must not be after end")
+        if (end - start).days >= MAX_KPI_RANGE_DAYS:
+            raise HTTPException(status_code=400, detail=f"Range must be at most {MAX_KPI_RANGE_DAYS} days")
         
-        return {
-            "total_downloads_this_month": total_downloads_this_month,
-            "most_downloaded_pdf": most_downloaded_pdf,
-            "total_downloads": total_downloads,
-        }
+        return await fetch_pdf_download_range(conn, start, end, top)
         
+    except HTTPException:
+        raise
     except asyncpg.PostgresError as e:
-        logger.error(f"Database error in get_pdf_downloads_kpi: {e}")
+        logger.error(f"Database error in get_pdf_downloads_kpi_range: {e}")
         raise HTTPException(status_code=500, detail="Database error occurred")
     except Exception as e:
-        logger.error(f"Unexpected error in get_pdf_downloads_kpi: {e}")
+        logger.error(f"Unexpected error in get_pdf_downloads_kpi_range: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
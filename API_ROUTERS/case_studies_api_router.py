@@ -1,17 +1,34 @@
 import logging
-from fastapi import APIRouter, HTTPException, Query, Request, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request, Response, Depends, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
+from uuid import UUID
 import asyncpg
 import json
 from DATABASE_HANDLER.auth import require_admin
+from DATABASE_HANDLER.connection_pool import get_db_connection, get_db_transaction
 from DATABASE_HANDLER.utils.shared_utils import generate_slug, ensure_unique_slug
+from PAGE_SERVING_ROUTERS.static_site_generator import refresh_case_study_pages
+from DATABASE_HANDLER.utils.generate_case_study_sections import compute_case_study_card_fields, parse_project_snapshots, fetch_portfolio_page
+from DATABASE_HANDLER.utils.conditional_requests import make_etag, is_not_modified, not_modified_response, validator_headers
+from DATABASE_HANDLER.utils.json_response import FastJSONResponse, FastJSONRoute
+from DATABASE_HANDLER.utils.lead_ingestion import lead_buffer
+from DATABASE_HANDLER.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, parse_fields, build_filters, where_clause, keyset_query, split_page, stream_ndjson
 from config import config, StatusConstants, ContentTypeConstants
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api", tags=["Case Studies Management"])
+router = APIRouter(prefix="/api", tags=["Case Studies Management"], route_class=FastJSONRoute, default_response_class=FastJSONResponse)
 
-DATABASE_URL = config.DATABASE_URL
+# Fields the admin listing can return (field -> column); listings return card metadata unless fields= asks for more
+CASE_STUDY_FIELDS = {
+    "id": "id", "slug": "slug", "title": "title", "summary": "summary", "cover_image": "cover_image",
+    "cover_image_alt": "cover_image_alt", "category": "category", "status": "status", "type": "type", "date": "date",
+    "editors_choice": "editors_choice", "redirect_url": "redirect_url", "pdf_url": "pdf_url",
+    "isdeleted": "isdeleted", "created_at": "created_at", "updated_at": "updated_at",
+    "keyword": "keyword", "preview": "preview", "blog": "case_study"
+}
+CASE_STUDY_CARD_FIELDS = [field for field in CASE_STUDY_FIELDS if field not in ("keyword", "preview", "blog")]
 
 class CreateCaseStudyRequest(BaseModel):
     blogContent: Dict[str, Any]
@@ -33,57 +50,66 @@ class UpdateCaseStudyRequest(BaseModel):
     redirect_url: Optional[str] = None
     category: Optional[str] = None
 
+def _format_case_study_row(case_study: asyncpg.Record, fields: List[str]) -> Dict[str, Any]:
+    return {field: case_study[CASE_STUDY_FIELDS[field]] for field in fields}
+
+def _case_study_columns(fields: List[str]) -> List[str]:
+    return list(dict.fromkeys(CASE_STUDY_FIELDS[field] for field in fields))
+
 @router.get("/case-studies")
-async def get_case_studies(include_deleted: bool = Query(False, description="Include soft-deleted case studies")):
+async def get_case_studies(
+    request: Request,
+    response: Response,
+    include_deleted: bool = Query(False, description="Include soft-deleted case studies (same as deleted=all)"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    case_study_type: str = Query(ContentTypeConstants.CASE_STUDY, alias="type", description="Filter by type"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    editors_choice: Optional[str] = Query(None, pattern="^[YN]$", description="Filter by editor's choice flag"),
+    deleted: str = Query("false", description="Soft-deleted state: false, true or all"),
+    q: Optional[str] = Query(None, description="Search case study titles"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; card metadata by default, * for all"),
+    sort: str = Query("date", description="Sort column"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort direction"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    conn: asyncpg.Connection = Depends(get_db_connection)
+):
     """
-    Get all case studies
-    By default excludes soft-deleted entries
-    Set include_deleted=true to show all case studies including deleted ones
+    Get case studies, one keyset-paginated page at a time
+    Filters by status, type, category, editors_choice and deleted state on the server;
+    soft-deleted entries are excluded by default
+    Returns card metadata only unless fields= names more (e.g. fields=id,blog,preview, or * for everything)
+    Follow next_cursor for the next page; total is the size of the whole filtered set
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
-        
-        if include_deleted:
-            query = f"""
-                SELECT id, case_study, status, date, keyword, preview, slug, type, redirect_url, pdf_url, category, editors_choice, isdeleted, created_at, updated_at
-                FROM case_studies
-                WHERE type = '{ContentTypeConstants.CASE_STUDY}'
-                ORDER BY date DESC
-            """
-        else:
-            query = f"""
-                SELECT id, case_study, status, date, keyword, preview, slug, type, redirect_url, pdf_url, category, editors_choice, isdeleted, created_at, updated_at
-                FROM case_studies
-                WHERE isdeleted = FALSE AND type = '{ContentTypeConstants.CASE_STUDY}'
-                ORDER BY date DESC
-            """
-        
-        case_studies = await conn.fetch(query)
-        await conn.close()
-        
-        case_studies_list = [
-            {
-                "id": str(case_study['id']),
-                "blog": case_study['case_study'],
-                "status": case_study['status'],
-                "date": case_study['date'].isoformat() if case_study['date'] else None,
-                "keyword": case_study['keyword'],
-                "preview": case_study['preview'],
-                "slug": case_study['slug'],
-                "type": case_study['type'],
-                "redirect_url": case_study['redirect_url'],
-                "pdf_url": case_study['pdf_url'],
-                "category": case_study['category'],
-                "editors_choice": case_study['editors_choice'],
-                "isdeleted": case_study['isdeleted'],
-                "created_at": case_study['created_at'].isoformat() if case_study['created_at'] else None,
-                "updated_at": case_study['updated_at'].isoformat() if case_study['updated_at'] else None
-            }
-            for case_study in case_studies
-        ]
+        conditions, params = build_filters(
+            {"status": status, "type": case_study_type, "category": category, "editors_choice": editors_choice},
+            "all" if include_deleted else deleted,
+            q
+        )
+        selected_fields = parse_fields(fields, list(CASE_STUDY_FIELDS), CASE_STUDY_CARD_FIELDS)
+        query, query_params = keyset_query("case_studies", _case_study_columns(selected_fields), conditions, params, sort, order == "desc", cursor, limit)
+
+        version = await conn.fetchrow(f"SELECT MAX(updated_at) AS last_modified, COUNT(*) AS total FROM case_studies {where_clause(conditions)}", *params)
+        etag = make_etag("case-studies-admin", request.url.query, version['last_modified'], version['total'])
+        if is_not_modified(request, etag, version['last_modified']):
+            return not_modified_response(etag, version['last_modified'])
+        response.headers.update(validator_headers(etag, version['last_modified']))
+
+        case_studies, next_cursor = split_page(await conn.fetch(query, *query_params), sort, limit)
+        case_studies_list = [_format_case_study_row(case_study, selected_fields) for case_study in case_studies]
         
-        return {"status": "success", "case_studies": case_studies_list, "count": len(case_studies_list)}
+        return {
+            "status": "success",
+            "case_studies": case_studies_list,
+            "count": len(case_studies_list),
+            "total": version['total'],
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None
+        }
         
+    except HTTPException:
+        raise
     except asyncpg.PostgresError as e:
         logger.error(f"Database error in get_case_studies: {e}")
         raise HTTPException(status_code=500, detail="Database error occurred")
@@ -93,7 +119,7 @@ async def get_case_studies(include_deleted: bool = Query(False, description="Inc
 
 
 @router.post("/case-studies", status_code=201)
-async def create_case_study(case_study_data: CreateCaseStudyRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+async def create_case_study(case_study_data: CreateCaseStudyRequest, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Create a new case study
     Requires case study content as JSONB
@@ -105,7 +131,6 @@ async def create_case_study(case_study_data: CreateCaseStudyRequest, current_use
         raise HTTPException(status_code=400, detail="Case study content is required")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         case_study_content = case_study_data.blogContent.copy() if case_study_data.blogContent else {}
         content_type = case_study_content.get('contentType', ContentTypeConstants.CASE_STUDY)
@@ -116,34 +141,39 @@ async def create_case_study(case_study_data: CreateCaseStudyRequest, current_use
             preview_data = {}
         if blog_title:
             preview_data['blogTitle'] = blog_title
+        card = compute_case_study_card_fields(preview_data)
         
         new_case_study = await conn.fetchrow(
             """
-            INSERT INTO case_studies (case_study, status, keyword, preview, editors_choice, slug, type, redirect_url, isdeleted)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, FALSE)
+            INSERT INTO case_studies (case_study, status, keyword, preview, editors_choice, slug, type, redirect_url, isdeleted,
+                                      title, summary, cover_image, cover_image_alt)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, FALSE, $9, $10, $11, $12)
             RETURNING id, case_study, status, date, keyword, preview, editors_choice, slug, type, redirect_url, pdf_url, isdeleted, created_at, updated_at
             """,
-            json.dumps(case_study_content),
+            case_study_content,
             case_study_data.status,
-            json.dumps(case_study_data.keyword),
-            json.dumps(preview_data),
+            case_study_data.keyword,
+            preview_data,
             case_study_data.editors_choice,
             case_study_data.slug,
             content_type,
-            case_study_data.redirect_url
+            case_study_data.redirect_url,
+            card['title'],
+            card['summary'],
+            card['cover_image'],
+            card['cover_image_alt']
         )
         
-        await conn.close()
-        
         logger.info(f"Case study created successfully with ID: {new_case_study['id']}")
+        background_tasks.add_task(refresh_case_study_pages, new_case_study['slug'])
         return {
             "status": "success",
             "message": "Case study created successfully",
             "case_study": {
-                "id": str(new_case_study['id']),
+                "id": new_case_study['id'],
                 "blog": new_case_study['case_study'],
                 "status": new_case_study['status'],
-                "date": new_case_study['date'].isoformat() if new_case_study['date'] else None,
+                "date": new_case_study['date'],
                 "keyword": new_case_study['keyword'],
                 "preview": new_case_study['preview'],
                 "slug": new_case_study['slug'],
@@ -151,8 +181,8 @@ async def create_case_study(case_study_data: CreateCaseStudyRequest, current_use
                 "redirect_url": new_case_study['redirect_url'],
                 "pdf_url": new_case_study['pdf_url'],
                 "isdeleted": new_case_study['isdeleted'],
-                "created_at": new_case_study['created_at'].isoformat() if new_case_study['created_at'] else None,
-                "updated_at": new_case_study['updated_at'].isoformat() if new_case_study['updated_at'] else None
+                "created_at": new_case_study['created_at'],
+                "updated_at": new_case_study['updated_at']
             }
         }
         
@@ -164,7 +194,7 @@ async def create_case_study(case_study_data: CreateCaseStudyRequest, current_use
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.put("/case-studies/{case_study_id}")
-async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudyRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudyRequest, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Update an existing case study
     Only updates provided fields (partial update)
@@ -173,19 +203,16 @@ async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudy
     logger.info(f"Updating case study ID: {case_study_id}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         existing_case_study = await conn.fetchrow(
-            "SELECT id, isdeleted, case_study, preview FROM case_studies WHERE id = $1",
+            "SELECT id, slug, isdeleted, case_study, preview FROM case_studies WHERE id = $1",
             case_study_id
         )
         
         if not existing_case_study:
-            await conn.close()
             raise HTTPException(status_code=404, detail="Case study not found")
         
         if existing_case_study['isdeleted']:
-            await conn.close()
             raise HTTPException(status_code=400, detail="Cannot update deleted case study")
         
         update_fields = []
@@ -197,7 +224,7 @@ async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudy
         
         if blog_content is not None:
             update_fields.append(f"case_study = ${param_count}")
-            update_values.append(json.dumps(blog_content))
+            update_values.append(blog_content)
             param_count += 1
             blog_title = blog_content.get('blogTitle')
         else:
@@ -212,7 +239,7 @@ async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudy
         
         if case_study_data.keyword is not None:
             update_fields.append(f"keyword = ${param_count}")
-            update_values.append(json.dumps(case_study_data.keyword))
+            update_values.append(case_study_data.keyword)
             param_count += 1
         
         preview_data = case_study_data.preview
@@ -226,8 +253,14 @@ async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudy
             
         if preview_data is not None:
             update_fields.append(f"preview = ${param_count}")
-            update_values.append(json.dumps(preview_data))
+            update_values.append(preview_data)
             param_count += 1
+
+            card = compute_case_study_card_fields(preview_data)
+            for column in ('title', 'summary', 'cover_image', 'cover_image_alt'):
+                update_fields.append(f"{column} = ${param_count}")
+                update_values.append(card[column])
+                param_count += 1
         
         if case_study_data.slug is not None:
             update_fields.append(f"slug = ${param_count}")
@@ -250,7 +283,6 @@ async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudy
             param_count += 1
         
         if not update_fields:
-            await conn.close()
             raise HTTPException(status_code=400, detail="No fields to update")
         
         update_fields.append(f"updated_at = CURRENT_TIMESTAMP")
@@ -264,17 +296,17 @@ async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudy
         """
         
         updated_case_study = await conn.fetchrow(query, *update_values)
-        await conn.close()
         
         logger.info(f"Case study updated successfully: {case_study_id}")
+        background_tasks.add_task(refresh_case_study_pages, existing_case_study['slug'], updated_case_study['slug'])
         return {
             "status": "success",
             "message": "Case study updated successfully",
             "case_study": {
-                "id": str(updated_case_study['id']),
+                "id": updated_case_study['id'],
                 "blog": updated_case_study['case_study'],
                 "status": updated_case_study['status'],
-                "date": updated_case_study['date'].isoformat() if updated_case_study['date'] else None,
+                "date": updated_case_study['date'],
                 "keyword": updated_case_study['keyword'],
                 "preview": updated_case_study['preview'],
                 "slug": updated_case_study['slug'],
@@ -283,8 +315,8 @@ async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudy
                 "pdf_url": updated_case_study['pdf_url'],
                 "category": updated_case_study['category'],
                 "isdeleted": updated_case_study['isdeleted'],
-                "created_at": updated_case_study['created_at'].isoformat() if updated_case_study['created_at'] else None,
-                "updated_at": updated_case_study['updated_at'].isoformat() if updated_case_study['updated_at'] else None
+                "created_at": updated_case_study['created_at'],
+                "updated_at": updated_case_study['updated_at']
             }
         }
         
@@ -298,16 +330,16 @@ async def update_case_study(case_study_id: str, case_study_data: UpdateCaseStudy
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.patch("/case-studies/{case_study_id}")
-async def partial_update_case_study(case_study_id: str, case_study_data: UpdateCaseStudyRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+async def partial_update_case_study(case_study_id: str, case_study_data: UpdateCaseStudyRequest, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Partial update of an existing case study (alias for PUT endpoint)
     Only updates provided fields
     Cannot update soft-deleted case studies
     """
-    return await update_case_study(case_study_id, case_study_data)
+    return await update_case_study(case_study_id, case_study_data, background_tasks, current_user, conn)
 
 @router.delete("/case-studies/{case_study_id}")
-async def delete_case_study(case_study_id: str, current_user: Dict[str, Any] = Depends(require_admin)):
+async def delete_case_study(case_study_id: str, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_transaction)):
     """
     Permanently delete a case study from the database
     This action cannot be undone
@@ -315,15 +347,13 @@ async def delete_case_study(case_study_id: str, current_user: Dict[str, Any] = D
     logger.warning(f"Permanently deleting case study ID: {case_study_id}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         case_study = await conn.fetchrow(
-            "SELECT id FROM case_studies WHERE id = $1",
+            "SELECT id, slug FROM case_studies WHERE id = $1",
             case_study_id
         )
         
         if not case_study:
-            await conn.close()
             raise HTTPException(status_code=404, detail="Case study not found")
         
         await conn.execute(
@@ -331,9 +361,8 @@ async def delete_case_study(case_study_id: str, current_user: Dict[str, Any] = D
             case_study_id
         )
         
-        await conn.close()
-        
         logger.info(f"Case study permanently deleted successfully: {case_study_id}")
+        background_tasks.add_task(refresh_case_study_pages, case_study['slug'])
         return {
             "status": "success",
             "message": "Case study deleted successfully"
@@ -349,7 +378,7 @@ async def delete_case_study(case_study_id: str, current_user: Dict[str, Any] = D
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/case-studies/{case_study_id}/restore")
-async def restore_case_study(case_study_id: str, current_user: Dict[str, Any] = Depends(require_admin)):
+async def restore_case_study(case_study_id: str, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_transaction)):
     """
     Restore a soft-deleted case study
     Sets isdeleted back to FALSE
@@ -357,19 +386,16 @@ async def restore_case_study(case_study_id: str, current_user: Dict[str, Any] =
     logger.info(f"Restoring case study ID: {case_study_id}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         case_study = await conn.fetchrow(
-            "SELECT id, isdeleted FROM case_studies WHERE id = $1",
+            "SELECT id, slug, isdeleted FROM case_studies WHERE id = $1",
             case_study_id
         )
         
         if not case_study:
-            await conn.close()
             raise HTTPException(status_code=404, detail="Case study not found")
         
         if not case_study['isdeleted']:
-            await conn.close()
             raise HTTPException(status_code=400, detail="Case study is not deleted")
         
         await conn.execute(
@@ -381,9 +407,8 @@ async def restore_case_study(case_study_id: str, current_user: Dict[str, Any] =
             case_study_id
         )
         
-        await conn.close()
-        
         logger.info(f"Case study restored successfully: {case_study_id}")
+        background_tasks.add_task(refresh_case_study_pages, case_study['slug'])
         return {
             "status": "success",
             "message": "Case study restored successfully"
@@ -430,79 +455,47 @@ def get_display_category(category: str) -> str:
 
 @router.get("/case-studies/paginated")
 async def get_paginated_case_studies(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="Page number (starting from 1)"),
     per_page: int = Query(4, ge=1, le=20, description="Items per page"),
-    category: Optional[str] = Query(None, description="Filter by category")
+    category: Optional[str] = Query(None, description="Filter by category"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; page is then only the number shown"),
+    conn: asyncpg.Connection = Depends(get_db_connection)
 ):
     """
     Get paginated case studies for portfolio page
     Returns only published case studies with pagination
     Optionally filters by category when provided
+    Pages are keyed on (editor's choice, date, id): follow next_cursor to step forward without
+    rescanning earlier pages; a bare page number still works for jumps. The total comes from the
+    count cache, or is fetched in the same round trip as the page when the cache is cold.
+    Sends ETag / Last-Modified built from the page rows and the total, and answers a matching
+    conditional request with 304
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
-        
-        offset = (page - 1) * per_page
         
         mapped_category = CATEGORY_MAPPING.get(category) if category else None
         
-        if mapped_category:
-            count_query = f"""
-                SELECT COUNT(*)
-                FROM case_studies
-                WHERE isdeleted = FALSE
-                    AND status = '{StatusConstants.PUBLISHED}'
-                    AND type = '{ContentTypeConstants.CASE_STUDY}'
-                    AND LOWER(category) = LOWER($1)
-            """
-            total_count = await conn.fetchval(count_query, mapped_category)
-            
-            query = f"""
-                SELECT slug, preview, category
-                FROM case_studies
-                WHERE isdeleted = FALSE
-                    AND status = '{StatusConstants.PUBLISHED}'
-                    AND type = '{ContentTypeConstants.CASE_STUDY}'
-                    AND LOWER(category) = LOWER($3)
-                ORDER BY
-                    CASE WHEN editors_choice = 'Y' THEN 0 ELSE 1 END,
-                    date DESC
-                LIMIT $1 OFFSET $2
-            """
-            case_studies = await conn.fetch(query, per_page, offset, mapped_category)
-        else:
-            count_query = f"""
-                SELECT COUNT(*)
-                FROM case_studies
-                WHERE isdeleted = FALSE
-                    AND status = '{StatusConstants.PUBLISHED}'
-                    AND type = '{ContentTypeConstants.CASE_STUDY}'
-            """
-            total_count = await conn.fetchval(count_query)
-            
-            query = f"""
-                SELECT slug, preview, category
-                FROM case_studies
-                WHERE isdeleted = FALSE
-                    AND status = '{StatusConstants.PUBLISHED}'
-                    AND type = '{ContentTypeConstants.CASE_STUDY}'
-                ORDER BY
-                    CASE WHEN editors_choice = 'Y' THEN 0 ELSE 1 END,
-                    date DESC
-                LIMIT $1 OFFSET $2
-            """
-            case_studies = await conn.fetch(query, per_page, offset)
+        case_studies, total_count, next_cursor = await fetch_portfolio_page(conn, mapped_category, per_page, cursor, page)
         
-        await conn.close()
+        last_modified = max((record['updated_at'] for record in case_studies if record['updated_at']), default=None)
+        etag = make_etag(
+            "case-studies", page, per_page, mapped_category, cursor, total_count,
+            [(record['id'], record['updated_at']) for record in case_studies]
+        )
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
         
         case_studies_list = []
         for record in case_studies:
-            preview = record['preview']
-            if isinstance(preview, str):
-                try:
-                    preview = json.loads(preview)
-                except:
-                    preview = {}
+            preview = {
+                'blogTitle': record['title'],
+                'text': record['summary'],
+                'imageUrl': record['cover_image'],
+                'imageAlt': record['cover_image_alt'],
+                'projectSnapshots': parse_project_snapshots(record['project_snapshots'])
+            }
             
             raw_category = record['category'] or ''
             display_category = get_display_category(raw_category)
@@ -515,6 +508,7 @@ async def get_paginated_case_studies(
         
         total_pages = (total_count + per_page - 1) // per_page
         
+        response.headers.update(validator_headers(etag, last_modified))
         return {
             "status": "success",
             "case_studies": case_studies_list,
@@ -522,10 +516,13 @@ async def get_paginated_case_studies(
             "per_page": per_page,
             "total_count": total_count,
             "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
+            "has_next": next_cursor is not None,
+            "has_prev": page > 1,
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
     except asyncpg.PostgresError as e:
         logger.error(f"Database error in get_paginated_case_studies: {e}")
         raise HTTPException(status_code=500, detail="Database error occurred")
@@ -534,13 +531,12 @@ async def get_paginated_case_studies(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/case-studies/editors-choice")
-async def get_editors_choice_case_studies():
+async def get_editors_choice_case_studies(conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     Get all case studies marked as editor's choice
     Returns only published case studies with editors_choice = 'Y'
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         query = f"""
             SELECT id, case_study, status, date, keyword, preview, slug, type, redirect_url, pdf_url, category, editors_choice, isdeleted, created_at, updated_at
@@ -552,14 +548,13 @@ async def get_editors_choice_case_studies():
         """
         
         case_studies = await conn.fetch(query)
-        await conn.close()
         
         case_studies_list = [
             {
-                "id": str(case_study['id']),
+                "id": case_study['id'],
                 "blog": case_study['case_study'],
                 "status": case_study['status'],
-                "date": case_study['date'].isoformat() if case_study['date'] else None,
+                "date": case_study['date'],
                 "keyword": case_study['keyword'],
                 "preview": case_study['preview'],
                 "slug": case_study['slug'],
@@ -569,8 +564,8 @@ async def get_editors_choice_case_studies():
                 "category": case_study['category'] or '',
                 "editors_choice": case_study['editors_choice'],
                 "isdeleted": case_study['isdeleted'],
-                "created_at": case_study['created_at'].isoformat() if case_study['created_at'] else None,
-                "updated_at": case_study['updated_at'].isoformat() if case_study['updated_at'] else None
+                "created_at": case_study['created_at'],
+                "updated_at": case_study['updated_at']
             }
             for case_study in case_studies
         ]
@@ -584,8 +579,65 @@ async def get_editors_choice_case_studies():
         logger.error(f"Unexpected error in get_editors_choice_case_studies: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/case-studies/export")
+async def export_case_studies(
+    status: Optional[str] = Query(None, description="Filter by status"),
+    case_study_type: Optional[str] = Query(None, alias="type", description="Filter by type"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    editors_choice: Optional[str] = Query(None, pattern="^[YN]$", description="Filter by editor's choice flag"),
+    deleted: str = Query("all", description="Soft-deleted state: false, true or all"),
+    q: Optional[str] = Query(None, description="Search case study titles"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export; every field by default"),
+    sort: str = Query("created_at", description="Sort column"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Sort direction"),
+    current_user: Dict[str, Any] = Depends(require_admin)
+):
+    """
+    Export every matching case study as newline-delimited JSON
+    Takes the same filters as GET /case-studies; rows are streamed through a server-side cursor
+    """
+    conditions, params = build_filters(
+        {"status": status, "type": case_study_type, "category": category, "editors_choice": editors_choice},
+        deleted,
+        q
+    )
+    selected_fields = parse_fields(fields, list(CASE_STUDY_FIELDS), list(CASE_STUDY_FIELDS))
+    query, query_params = keyset_query("case_studies", _case_study_columns(selected_fields), conditions, params, sort, order == "desc", None, None)
+
+    return StreamingResponse(
+        stream_ndjson(query, query_params, lambda case_study: _format_case_study_row(case_study, selected_fields)),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="case_studies.ndjson"'}
+    )
+
+
+@router.get("/case-studies/{case_study_id}")
+async def get_case_study(case_study_id: UUID, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_connection)):
+    """
+    Get one case study with every field, including soft-deleted ones
+    Used by the admin editor, since listings only carry card metadata
+    """
+    try:
+        case_study = await conn.fetchrow(
+            f"SELECT {', '.join(_case_study_columns(list(CASE_STUDY_FIELDS)))} FROM case_studies WHERE id = $1",
+            case_study_id
+        )
+        if not case_study:
+            raise HTTPException(status_code=404, detail="Case study not found")
+        return {"status": "success", "case_study": _format_case_study_row(case_study, list(CASE_STUDY_FIELDS))}
+
+    except HTTPException:
+        raise
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database error in get_case_study: {e}")
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error(f"Unexpected error in get_case_study: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.post("/case-studies/{case_study_id}/toggle-editors-choice")
-async def toggle_editors_choice(case_study_id: str, current_user: Dict[str, Any] = Depends(require_admin)):
+async def toggle_editors_choice(case_study_id: str, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_transaction)):
     """
     Toggle editor's choice status for a case study
     Only 1 case study can be marked as Editor's Choice at a time
@@ -594,7 +646,6 @@ async def toggle_editors_choice(case_study_id: str, current_user: Dict[str, Any]
     logger.info(f"Toggling editor's choice for case study ID: {case_study_id}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         existing_case_study = await conn.fetchrow(
             "SELECT id, editors_choice, isdeleted FROM case_studies WHERE id = $1",
@@ -602,11 +653,9 @@ async def toggle_editors_choice(case_study_id: str, current_user: Dict[str, Any]
         )
         
         if not existing_case_study:
-            await conn.close()
             raise HTTPException(status_code=404, detail="Case study not found")
         
         if existing_case_study['isdeleted']:
-            await conn.close()
             raise HTTPException(status_code=400, detail="Cannot modify deleted case study")
         
         current_status = existing_case_study['editors_choice']
@@ -634,18 +683,17 @@ async def toggle_editors_choice(case_study_id: str, current_user: Dict[str, Any]
             case_study_id
         )
         
-        await conn.close()
-        
         logger.info(f"Editor's choice toggled successfully for case study: {case_study_id} to {new_status}")
+        background_tasks.add_task(refresh_case_study_pages, updated_case_study['slug'])
         return {
             "status": "success",
             "message": f"Editor's choice {'set' if new_status == 'Y' else 'removed'} successfully",
             "editors_choice": new_status,
             "case_study": {
-                "id": str(updated_case_study['id']),
+                "id": updated_case_study['id'],
                 "blog": updated_case_study['case_study'],
                 "status": updated_case_study['status'],
-                "date": updated_case_study['date'].isoformat() if updated_case_study['date'] else None,
+                "date": updated_case_study['date'],
                 "keyword": updated_case_study['keyword'],
                 "preview": updated_case_study['preview'],
                 "editors_choice": updated_case_study['editors_choice'],
@@ -654,8 +702,8 @@ async def toggle_editors_choice(case_study_id: str, current_user: Dict[str, Any]
                 "redirect_url": updated_case_study['redirect_url'],
                 "pdf_url": updated_case_study['pdf_url'],
                 "isdeleted": updated_case_study['isdeleted'],
-                "created_at": updated_case_study['created_at'].isoformat() if updated_case_study['created_at'] else None,
-                "updated_at": updated_case_study['updated_at'].isoformat() if updated_case_study['updated_at'] else None
+                "created_at": updated_case_study['created_at'],
+                "updated_at": updated_case_study['updated_at']
             }
         }
         
@@ -741,7 +789,7 @@ async def admin_case_study_preview(request: Request, current_user: Dict[str, Any
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/admin_save_case_study")
-async def admin_save_case_study(request: Request, current_user: Dict[str, Any] = Depends(require_admin)):
+async def admin_save_case_study(request: Request, background_tasks: BackgroundTasks, current_user: Dict[str, Any] = Depends(require_admin), conn: asyncpg.Connection = Depends(get_db_transaction)):
     """
     Save case study from admin panel (Draft or Publish)
     Receives complete case study data from frontend and saves to database
@@ -771,137 +819,145 @@ async def admin_save_case_study(request: Request, current_user: Dict[str, Any] =
         
         data['contentType'] = content_type
         
-        conn = await asyncpg.connect(DATABASE_URL)
-        
-        try:
-            if reason == 'update' and case_study_id:
-                existing_case_study = await conn.fetchrow(
-                    "SELECT id, slug FROM case_studies WHERE id = $1 AND isdeleted = FALSE",
-                    case_study_id
-                )
-                
-                if not existing_case_study:
-                    raise HTTPException(status_code=404, detail="Case study not found for update")
-                
-                existing_slug = existing_case_study['slug']
-                if slug != existing_slug:
-                    existing_slug_record = await conn.fetchrow(
-                        "SELECT id FROM case_studies WHERE slug = $1 AND id != $2 AND isdeleted = FALSE",
-                        slug,
-                        case_study_id
-                    )
-                    
-                    if existing_slug_record:
-                        original_slug = slug
-                        counter = 1
-                        while existing_slug_record:
-                            slug = f"{original_slug}-{counter}"
-                            existing_slug_record = await conn.fetchrow(
-                                "SELECT id FROM case_studies WHERE slug = $1 AND id != $2 AND isdeleted = FALSE",
-                                slug,
-                                case_study_id
-                            )
-                            counter += 1
-                        logger.info(f"Generated unique slug: {slug}")
-                
-                preview_data = data.pop('previewData', None)
-                pdf_url = data.pop('pdfUrl', None)
-                case_study_category = data.get('blogCategory', '')
-                
-                if preview_data is None:
-                    preview_data = {}
-                preview_data['blogTitle'] = case_study_title
-                
-                updated_case_study = await conn.fetchrow(
-                    """
-                    UPDATE case_studies
-                    SET case_study = $1, status = $2, preview = $3, editors_choice = $4, slug = $5, type = $6, pdf_url = $7, category = $8, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = $9
-                    RETURNING id, case_study, status, date, keyword, preview, editors_choice, slug, type, redirect_url, pdf_url, category, isdeleted, created_at, updated_at
-                    """,
-                    json.dumps(data),
-                    case_study_status,
-                    json.dumps(preview_data),
-                    data.get('editors_choice', 'N'),
+        if reason == 'update' and case_study_id:
+            existing_case_study = await conn.fetchrow(
+                "SELECT id, slug FROM case_studies WHERE id = $1 AND isdeleted = FALSE",
+                case_study_id
+            )
+            
+            if not existing_case_study:
+                raise HTTPException(status_code=404, detail="Case study not found for update")
+            
+            existing_slug = existing_case_study['slug']
+            if slug != existing_slug:
+                existing_slug_record = await conn.fetchrow(
+                    "SELECT id FROM case_studies WHERE slug = $1 AND id != $2 AND isdeleted = FALSE",
                     slug,
-                    content_type,
-                    pdf_url,
-                    case_study_category,
                     case_study_id
                 )
                 
-                if not updated_case_study:
-                    raise HTTPException(status_code=404, detail="Case study not found for update")
-                
-                case_study_id = str(updated_case_study['id'])
-                case_study_url = f"{config.BACKEND_URL}/case-study/{slug}"
-                
-                logger.info(f"Case study updated successfully - ID: {case_study_id}, slug: {slug}, status: {case_study_status}, type: {content_type}, URL: {case_study_url}")
-                
-                return {
-                    "status": "success",
-                    "message": f"Case study {'published' if case_study_status == StatusConstants.PUBLISHED else 'updated'} successfully",
-                    "blog_id": case_study_id,
-                    "slug": slug,
-                    "url": case_study_url
-                }
-            else:
-                existing_case_study = await conn.fetchrow(
-                    "SELECT id FROM case_studies WHERE slug = $1 AND isdeleted = FALSE",
-                    slug
-                )
-                
-                if existing_case_study:
+                if existing_slug_record:
                     original_slug = slug
                     counter = 1
-                    while existing_case_study:
+                    while existing_slug_record:
                         slug = f"{original_slug}-{counter}"
-                        existing_case_study = await conn.fetchrow(
-                            "SELECT id FROM case_studies WHERE slug = $1 AND isdeleted = FALSE",
-                            slug
+                        existing_slug_record = await conn.fetchrow(
+                            "SELECT id FROM case_studies WHERE slug = $1 AND id != $2 AND isdeleted = FALSE",
+                            slug,
+                            case_study_id
                         )
                         counter += 1
                     logger.info(f"Generated unique slug: {slug}")
             
-                preview_data = data.pop('previewData', None)
-                pdf_url = data.pop('pdfUrl', None)
-                case_study_category = data.get('blogCategory', '')
-                
-                if preview_data is None:
-                    preview_data = {}
-                preview_data['blogTitle'] = case_study_title
-                
-                new_case_study = await conn.fetchrow(
-                    """
-                    INSERT INTO case_studies (case_study, status, preview, editors_choice, slug, type, pdf_url, category, isdeleted)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, FALSE)
-                    RETURNING id, case_study, status, date, keyword, preview, editors_choice, slug, type, redirect_url, pdf_url, category, isdeleted, created_at, updated_at
-                    """,
-                    json.dumps(data),
-                    case_study_status,
-                    json.dumps(preview_data),
-                    data.get('editors_choice', 'N'),
-                    slug,
-                    content_type,
-                    pdf_url,
-                    case_study_category
-                )
-                
-                case_study_id = str(new_case_study['id'])
-                case_study_url = f"{config.BACKEND_URL}/case-study/{slug}"
-                
-                logger.info(f"Case study saved successfully - ID: {case_study_id}, slug: {slug}, status: {case_study_status}, type: {content_type}, URL: {case_study_url}")
-                
-                return {
-                    "status": "success",
-                    "message": f"Case study {'published' if case_study_status == StatusConstants.PUBLISHED else 'saved as draft'} successfully",
-                    "blog_id": case_study_id,
-                    "slug": slug,
-                    "url": case_study_url
-                }
+            preview_data = data.pop('previewData', None)
+            pdf_url = data.pop('pdfUrl', None)
+            case_study_category = data.get('blogCategory', '')
             
-        finally:
-            await conn.close()
+            if preview_data is None:
+                preview_data = {}
+            preview_data['blogTitle'] = case_study_title
+            card = compute_case_study_card_fields(preview_data)
+            
+            updated_case_study = await conn.fetchrow(
+                """
+                UPDATE case_studies
+                SET case_study = $1, status = $2, preview = $3, editors_choice = $4, slug = $5, type = $6, pdf_url = $7, category = $8,
+                    title = $10, summary = $11, cover_image = $12, cover_image_alt = $13, updated_at = CURRENT_TIMESTAMP
+                WHERE id = $9
+                RETURNING id, case_study, status, date, keyword, preview, editors_choice, slug, type, redirect_url, pdf_url, category, isdeleted, created_at, updated_at
+                """,
+                data,
+                case_study_status,
+                preview_data,
+                data.get('editors_choice', 'N'),
+                slug,
+                content_type,
+                pdf_url,
+                case_study_category,
+                case_study_id,
+                card['title'],
+                card['summary'],
+                card['cover_image'],
+                card['cover_image_alt']
+            )
+            
+            if not updated_case_study:
+                raise HTTPException(status_code=404, detail="Case study not found for update")
+            
+            case_study_id = str(updated_case_study['id'])
+            case_study_url = f"{config.BACKEND_URL}/case-study/{slug}"
+            
+            logger.info(f"Case study updated successfully - ID: {case_study_id}, slug: {slug}, status: {case_study_status}, type: {content_type}, URL: {case_study_url}")
+            background_tasks.add_task(refresh_case_study_pages, existing_slug, slug)
+            
+            return {
+                "status": "success",
+                "message": f"Case study {'published' if case_study_status == StatusConstants.PUBLISHED else 'updated'} successfully",
+                "blog_id": case_study_id,
+                "slug": slug,
+                "url": case_study_url
+            }
+        else:
+            existing_case_study = await conn.fetchrow(
+                "SELECT id FROM case_studies WHERE slug = $1 AND isdeleted = FALSE",
+                slug
+            )
+            
+            if existing_case_study:
+                original_slug = slug
+                counter = 1
+                while existing_case_study:
+                    slug = f"{original_slug}-{counter}"
+                    existing_case_study = await conn.fetchrow(
+                        "SELECT id FROM case_studies WHERE slug = $1 AND isdeleted = FALSE",
+                        slug
+                    )
+                    counter += 1
+                logger.info(f"Generated unique slug: {slug}")
+        
+            preview_data = data.pop('previewData', None)
+            pdf_url = data.pop('pdfUrl', None)
+            case_study_category = data.get('blogCategory', '')
+            
+            if preview_data is None:
+                preview_data = {}
+            preview_data['blogTitle'] = case_study_title
+            card = compute_case_study_card_fields(preview_data)
+            
+            new_case_study = await conn.fetchrow(
+                """
+                INSERT INTO case_studies (case_study, status, preview, editors_choice, slug, type, pdf_url, category, isdeleted,
+                                          title, summary, cover_image, cover_image_alt)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, FALSE, $9, $10, $11, $12)
+                RETURNING id, case_study, status, date, keyword, preview, editors_choice, slug, type, redirect_url, pdf_url, category, isdeleted, created_at, updated_at
+                """,
+                data,
+                case_study_status,
+                preview_data,
+                data.get('editors_choice', 'N'),
+                slug,
+                content_type,
+                pdf_url,
+                case_study_category,
+                card['title'],
+                card['summary'],
+                card['cover_image'],
+                card['cover_image_alt']
+            )
+            
+            case_study_id = str(new_case_study['id'])
+            case_study_url = f"{config.BACKEND_URL}/case-study/{slug}"
+            
+            logger.info(f"Case study saved successfully - ID: {case_study_id}, slug: {slug}, status: {case_study_status}, type: {content_type}, URL: {case_study_url}")
+            background_tasks.add_task(refresh_case_study_pages, slug)
+            
+            return {
+                "status": "success",
+                "message": f"Case study {'published' if case_study_status == StatusConstants.PUBLISHED else 'saved as draft'} successfully",
+                "blog_id": case_study_id,
+                "slug": slug,
+                "url": case_study_url
+            }
         
     except HTTPException:
         raise
@@ -917,30 +973,27 @@ async def admin_save_case_study(request: Request, current_user: Dict[str, Any] =
 
 
 class PDFDownloadFormRequest(BaseModel):
-    first_name: str
-    last_name: Optional[str] = None
-    email: str
-    company_name: Optional[str] = None
-    mobile_number: Optional[str] = None
+    # Lengths match the pdf_downloads columns, so a lead is rejected here rather than when its batch is written
+    first_name: str = Field(max_length=255)
+    last_name: Optional[str] = Field(default=None, max_length=255)
+    email: str = Field(max_length=255)
+    company_name: Optional[str] = Field(default=None, max_length=255)
+    mobile_number: Optional[str] = Field(default=None, max_length=50)
     pdf_link: str
 
 
 @router.post("/pdf-download-form")
 async def save_pdf_download_form(form_data: PDFDownloadFormRequest):
     """
-    Save PDF download form submission to database.
+    Save PDF download form submission.
     Called when user fills out the download form before downloading a PDF.
+    Acknowledged once the lead is spooled; it reaches the database with the next batch.
     """
     logger.info(f"Saving PDF download form for email: {form_data.email}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
-        await conn.execute(
-            """
-            INSERT INTO pdf_downloads (first_name, last_name, email, company_name, mobile_number, pdf_link)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            """,
+        await lead_buffer.submit(
             form_data.first_name,
             form_data.last_name or '',
             form_data.email,
@@ -949,8 +1002,6 @@ async def save_pdf_download_form(form_data: PDFDownloadFormRequest):
             form_data.pdf_link
         )
         
-        await conn.close()
-        
         logger.info(f"PDF download form saved successfully for: {form_data.email}")
         return {
             "status": "success",
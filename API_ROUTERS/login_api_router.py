@@ -1,23 +1,18 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, EmailStr
 import asyncpg
-import os
-from dotenv import load_dotenv
 from DATABASE_HANDLER.utils.General_Functions import sha256_hash
 from DATABASE_HANDLER.auth import create_access_token
-
-load_dotenv()
+from DATABASE_HANDLER.connection_pool import get_db_connection
 
 router = APIRouter(prefix="/api", tags=["Authentication"])
 
-DATABASE_URL = os.getenv("POSTGRES_CONNECTION_URL")
-
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
 
 @router.post("/login")
-async def login(credentials: LoginRequest):
+async def login(credentials: LoginRequest, conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     API endpoint to handle user login
     Accepts email and password from frontend
@@ -34,7 +29,6 @@ async def login(credentials: LoginRequest):
     print(f"Hashed Password: {hashed_password}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         user = await conn.fetchrow(
             "SELECT * FROM admin_users WHERE email = $1 AND password = $2",
@@ -42,8 +36,6 @@ async def login(credentials: LoginRequest):
             hashed_password
         )
         
-        await conn.close()
-        
         if user:
             if not user['active']:
                 print(f"Login failed - Account is deactivated: {user['username']}")
@@ -84,7 +76,7 @@ class AutoLoginRequest(BaseModel):
     hashed_password: str
 
 @router.post("/auto-login")
-async def auto_login(credentials: AutoLoginRequest):
+async def auto_login(credentials: AutoLoginRequest, conn: asyncpg.Connection = Depends(get_db_connection)):
     """
     API endpoint to handle automatic login using stored hashed credentials
     Accepts hashed email and password from localStorage
@@ -96,7 +88,6 @@ async def auto_login(credentials: AutoLoginRequest):
     print(f"Hashed Password: {credentials.hashed_password}")
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
         
         user = await conn.fetchrow(
             "SELECT * FROM admin_users WHERE email = $1 AND password = $2",
@@ -104,8 +95,6 @@ async def auto_login(credentials: AutoLoginRequest):
             credentials.hashed_password
         )
         
-        await conn.close()
-        
         if user:
             if not user['active']:
                 print(f"Auto-login failed - Account is deactivated: {user['username']}")
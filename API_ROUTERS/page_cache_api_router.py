@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from typing import Dict, Any
+from DATABASE_HANDLER.auth import require_admin
+from DATABASE_HANDLER.utils.page_cache import page_cache
+from DATABASE_HANDLER.utils.static_site import static_site
+
+router = APIRouter(prefix="/api", tags=["Page Cache"])
+
+@router.get("/page-cache/stats")
+async def get_page_cache_stats(current_user: Dict[str, Any] = Depends(require_admin)):
+    """
+    Get rendered-page cache counters
+    Returns entry count, size in bytes and hit/miss/eviction counters, plus pre-rendered site counters
+    """
+    return {"status": "success", "stats": page_cache.stats(), "static_site": static_site.stats()}
+
+@router.post("/page-cache/clear")
+async def clear_page_cache(current_user: Dict[str, Any] = Depends(require_admin)):
+    """
+    Drop every cached page
+    Pages are re-rendered from the database on their next request
+    """
+    page_cache.clear()
+    return {"status": "success", "message": "Page cache cleared"}
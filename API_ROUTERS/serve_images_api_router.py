@@ -1,39 +1,42 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from pydantic import BaseModel
-from minio import Minio
 from minio.error import S3Error
 import os
-from dotenv import load_dotenv
-from urllib.parse import urlparse
 import uuid
+from config import config
+from DATABASE_HANDLER.utils.json_response import FastJSONResponse, FastJSONRoute
+from DATABASE_HANDLER.utils.object_storage import object_storage
 
-load_dotenv()
+router = APIRouter(prefix="/api", tags=["Images"], route_class=FastJSONRoute, default_response_class=FastJSONResponse)
 
-router = APIRouter(prefix="/api", tags=["Images"])
+UPLOAD_SIZE_LIMITS = {
+    "image": config.UPLOAD_MAX_IMAGE_BYTES,
+    "PDF": config.UPLOAD_MAX_PDF_BYTES,
+    "file": config.UPLOAD_MAX_FILE_BYTES,
+}
 
-MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
-MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
-MINIO_PUBLIC_ENDPOINT = os.getenv("MINIO_PUBLIC_ENDPOINT")
-MINIO_BUCKET_NAME = os.getenv("MINIO_BUCKET_NAME")
-
-parsed_url = urlparse(MINIO_PUBLIC_ENDPOINT)
-endpoint = parsed_url.netloc
-secure = parsed_url.scheme == 'https'
-
-minio_client = Minio(
-    endpoint=endpoint,
-    access_key=MINIO_ACCESS_KEY,
-    secret_key=MINIO_SECRET_KEY,
-    secure=secure
-)
-
-try:
-    minio_client.list_buckets()
-    found = any(bucket.name == MINIO_BUCKET_NAME for bucket in minio_client.list_buckets())
-    if not found:
-        minio_client.make_bucket(MINIO_BUCKET_NAME)
-except Exception as e:
-    print(f"Warning: Could not check/create bucket: {e}")
+def upload_size(file: UploadFile) -> int:
+    """
+    Size of an upload, refused with 413 above the limit for its kind (image, PDF or other file).
+    The multipart parser has already spooled it, to disk past 1MB, so this never reads it into memory.
+    """
+    file_name = (file.filename or '').lower()
+    content_type = (file.content_type or '').lower()
+    if content_type == 'application/pdf' or file_name.endswith('.pdf'):
+        kind = "PDF"
+    elif content_type.startswith('image/'):
+        kind = "image"
+    else:
+        kind = "file"
+    
+    size = file.size if file.size is not None else file.file.seek(0, os.SEEK_END)
+    limit = UPLOAD_SIZE_LIMITS[kind]
+    if size > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{file.filename} is {size / 1024 / 1024:.1f}MB; {kind}s can be at most {limit / 1024 / 1024:.0f}MB"
+        )
+    return size
 
 class ImageUploadResponse(BaseModel):
     status: str
@@ -69,12 +72,12 @@ async def list_images():
     print("Image list request received")
     
     try:
-        objects = minio_client.list_objects(MINIO_BUCKET_NAME)
+        objects = await object_storage.list_objects()
         
         images = []
         for obj in objects:
             if not obj.object_name.lower().endswith('.pdf'):
-                public_url = f"{MINIO_PUBLIC_ENDPOINT}/{MINIO_BUCKET_NAME}/{obj.object_name}"
+                public_url = object_storage.public_url(obj.object_name)
                 images.append({
                     "object_name": obj.object_name,
                     "public_url": public_url,
@@ -107,11 +110,11 @@ async def list_pdfs():
     print("File list request received")
     
     try:
-        objects = minio_client.list_objects(MINIO_BUCKET_NAME)
+        objects = await object_storage.list_objects()
         
         files = []
         for obj in objects:
-            public_url = f"{MINIO_PUBLIC_ENDPOINT}/{MINIO_BUCKET_NAME}/{obj.object_name}"
+            public_url = object_storage.public_url(obj.object_name)
             files.append({
                 "object_name": obj.object_name,
                 "public_url": public_url,
@@ -140,30 +143,29 @@ async def upload_image(file: UploadFile = File(...)):
     """
     API endpoint to upload images to MinIO bucket
     Accepts multipart/form-data with image file
-    Stores file in MinIO with unique name
+    Stores file in MinIO with unique name, streamed from the spooled upload
     Returns object name and public URL for direct access
+    Refused with 413 above the size limit for its kind
     """
     print(f"Image upload request - Filename: {file.filename}")
     
     try:
-        image_data = await file.read()
-        image_size = len(image_data)
+        image_size = upload_size(file)
         
         file_extension = file.filename.split('.')[-1] if '.' in file.filename else ''
         object_name = f"{uuid.uuid4()}.{file_extension}" if file_extension else str(uuid.uuid4())
         
         print(f"Processing upload - Name: {file.filename}, Size: {image_size} bytes")
         
-        from io import BytesIO
-        minio_client.put_object(
-            bucket_name=MINIO_BUCKET_NAME,
+        await file.seek(0)
+        await object_storage.put_object(
             object_name=object_name,
-            data=BytesIO(image_data),
+            data=file.file,
             length=image_size,
             content_type=file.content_type or 'application/octet-stream'
         )
         
-        public_url = f"{MINIO_PUBLIC_ENDPOINT}/{MINIO_BUCKET_NAME}/{object_name}"
+        public_url = object_storage.public_url(object_name)
         
         print(f"Image uploaded successfully - Object: {object_name}")
         
@@ -176,6 +178,8 @@ async def upload_image(file: UploadFile = File(...)):
             public_url=public_url
         )
             
+    except HTTPException:
+        raise
     except S3Error as e:
         print(f"MinIO error: {e}")
         raise HTTPException(status_code=500, detail=f"MinIO error: {str(e)}")
@@ -190,53 +194,41 @@ async def upload_file(file: UploadFile = File(...)):
     Accepts multipart/form-data with file
     Preserves original filename, checks for duplicates
     Returns object name and public URL for direct access
-    No size limit enforced
+    Streamed from the spooled upload; refused with 413 above the size limit for its kind
     """
     print(f"File upload request - Filename: {file.filename}")
     
     try:
-        file_data = await file.read()
-        file_size = len(file_data)
+        file_size = upload_size(file)
         
         original_filename = file.filename
         object_name = original_filename
-        is_duplicate = False
+        is_duplicate = await object_storage.object_exists(object_name)
         
-        try:
-            minio_client.stat_object(MINIO_BUCKET_NAME, object_name)
-            is_duplicate = True
-            
+        if is_duplicate:
             base_name = original_filename.rsplit('.', 1)[0] if '.' in original_filename else original_filename
             extension = original_filename.rsplit('.', 1)[1] if '.' in original_filename else ''
             
             counter = 1
             while True:
                 object_name = f"{base_name}_{counter}.{extension}" if extension else f"{base_name}_{counter}"
-                try:
-                    minio_client.stat_object(MINIO_BUCKET_NAME, object_name)
-                    counter += 1
-                except S3Error as e:
-                    if e.code == 'NoSuchKey':
-                        break
-                    raise
+                if not await object_storage.object_exists(object_name):
+                    break
+                counter += 1
             
             print(f"Duplicate found, using name: {object_name}")
-        except S3Error as e:
-            if e.code != 'NoSuchKey':
-                raise
         
         print(f"Processing upload - Name: {object_name}, Size: {file_size} bytes")
         
-        from io import BytesIO
-        minio_client.put_object(
-            bucket_name=MINIO_BUCKET_NAME,
+        await file.seek(0)
+        await object_storage.put_object(
             object_name=object_name,
-            data=BytesIO(file_data),
+            data=file.file,
             length=file_size,
             content_type=file.content_type or 'application/octet-stream'
         )
         
-        public_url = f"{MINIO_PUBLIC_ENDPOINT}/{MINIO_BUCKET_NAME}/{object_name}"
+        public_url = object_storage.public_url(object_name)
         
         message = "File uploaded successfully"
         if is_duplicate:
@@ -253,6 +245,8 @@ async def upload_file(file: UploadFile = File(...)):
             public_url=public_url
         )
             
+    except HTTPException:
+        raise
     except S3Error as e:
         print(f"MinIO error: {e}")
         raise HTTPException(status_code=500, detail=f"MinIO error: {str(e)}")
@@ -271,10 +265,7 @@ async def delete_image(object_name: str):
     print(f"Image delete request - Object: {object_name}")
     
     try:
-        minio_client.remove_object(
-            bucket_name=MINIO_BUCKET_NAME,
-            object_name=object_name
-        )
+        await object_storage.remove_object(object_name)
         
         print(f"Image deleted successfully - Object: {object_name}")
         
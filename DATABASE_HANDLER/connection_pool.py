@@ -1,9 +1,48 @@
+import json
 import asyncpg
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 from config import config
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
 DATABASE_URL = config.DATABASE_URL
 
+# CURRENT_TIMESTAMP defaults are taken in the session time zone; pinning it to UTC keeps them on the
+# same clock as timestamps stamped in Python (the lead buffer) and as conditional_requests assumes
+SESSION_SETTINGS = {"timezone": "UTC"}
+
+
+if orjson is not None:
+    def _encode_json(value) -> str:
+        return orjson.dumps(value).decode()
+
+    _decode_json = orjson.loads
+else:
+    _encode_json = json.dumps
+    _decode_json = json.loads
+
+
+async def init_connection(conn: asyncpg.Connection):
+    """
+    Install JSON codecs on a new connection so json/jsonb columns arrive as Python objects
+    and query parameters for them can be passed as dicts/lists instead of pre-serialised strings
+
+    Args:
+        conn: Freshly opened connection (called by the pool for every connection it creates)
+    """
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=_encode_json,
+            decoder=_decode_json,
+            schema="pg_catalog",
+            format="text"
+        )
+
 
 class DatabasePool:
     """
@@ -30,7 +69,9 @@ class DatabasePool:
                 DATABASE_URL,
                 min_size=min_size,
                 max_size=max_size,
-                command_timeout=60
+                command_timeout=60,
+                server_settings=SESSION_SETTINGS,
+                init=init_connection
             )
     
     async def close(self):
@@ -65,6 +106,25 @@ class DatabasePool:
         pool = self.get_pool()
         return pool.acquire()
     
+    @asynccontextmanager
+    async def connection(self, transaction: bool = False) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Borrow a connection from the pool for the duration of a block
+        
+        Args:
+            transaction: Wrap the block in a transaction (committed on success, rolled back on error)
+        
+        Yields:
+            Pooled database connection, released back to the pool on exit
+        """
+        pool = self.get_pool()
+        async with pool.acquire() as conn:
+            if transaction:
+                async with conn.transaction():
+                    yield conn
+            else:
+                yield conn
+    
     async def execute(self, query: str, *args):
         """
         Execute a query using a connection from the pool
@@ -126,4 +186,26 @@ class DatabasePool:
             return await conn.fetchval(query, *args)
 
 
-db_pool = DatabasePool()
\ No newline at end of file
+db_pool = DatabasePool()
+
+
+async def get_db_connection() -> AsyncIterator[asyncpg.Connection]:
+    """
+    FastAPI dependency that hands out a pooled connection for one request
+    
+    Yields:
+        Pooled database connection
+    """
+    async with db_pool.connection() as conn:
+        yield conn
+
+
+async def get_db_transaction() -> AsyncIterator[asyncpg.Connection]:
+    """
+    FastAPI dependency that hands out a pooled connection with the request wrapped in a transaction
+    
+    Yields:
+        Pooled database connection inside an open transaction
+    """
+    async with db_pool.connection(transaction=True) as conn:
+        yield conn
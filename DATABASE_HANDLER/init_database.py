@@ -2,7 +2,11 @@ import os
 import logging
 import asyncpg
 from dotenv import load_dotenv
+from .connection_pool import SESSION_SETTINGS, init_connection
 from .utils import sha256_hash
+from .utils.generate_blog_sections import compute_blog_card_fields
+from .utils.generate_case_study_sections import compute_case_study_card_fields
+from .utils.pdf_download_rollups import rebuild_pdf_download_rollups
 
 logger = logging.getLogger(__name__)
 load_dotenv()
@@ -39,13 +43,76 @@ async def ensure_admin_user(conn):
         logger.error(f"Error ensuring admin user: {e}")
         raise
 
+async def backfill_card_fields(conn):
+    """
+    Populate the denormalized card columns for rows written before they existed.
+    Rows are picked up by a NULL summary, which every write path sets.
+    """
+    try:
+        blogs = await conn.fetch("SELECT id, blogContent FROM blogs WHERE summary IS NULL")
+        if blogs:
+            rows = []
+            for blog in blogs:
+                fields = compute_blog_card_fields(blog['blogcontent'])
+                rows.append((blog['id'], fields['title'], fields['summary'], fields['cover_image'],
+                             fields['cover_image_alt'], fields['read_time'], fields['category']))
+            await conn.executemany(
+                """
+                UPDATE blogs
+                SET title = $2, summary = $3, cover_image = $4, cover_image_alt = $5, read_time = $6,
+                    category = COALESCE(NULLIF(category, ''), $7)
+                WHERE id = $1
+                """,
+                rows
+            )
+            logger.info(f"Backfilled card fields for {len(rows)} blogs")
+
+        case_studies = await conn.fetch("SELECT id, preview FROM case_studies WHERE summary IS NULL")
+        if case_studies:
+            rows = []
+            for case_study in case_studies:
+                fields = compute_case_study_card_fields(case_study['preview'])
+                rows.append((case_study['id'], fields['title'], fields['summary'], fields['cover_image'], fields['cover_image_alt']))
+            await conn.executemany(
+                """
+                UPDATE case_studies
+                SET title = $2, summary = $3, cover_image = $4, cover_image_alt = $5
+                WHERE id = $1
+                """,
+                rows
+            )
+            logger.info(f"Backfilled card fields for {len(rows)} case studies")
+
+    except asyncpg.PostgresError as e:
+        logger.error(f"Error backfilling card fields: {e}")
+        raise
+
+async def backfill_pdf_download_rollups(conn):
+    """
+    Build the PDF download rollups for leads recorded before the rollup table existed.
+    Skipped once the table has rows; from then on every insert keeps it current.
+    """
+    try:
+        has_rollups = await conn.fetchval(
+            "SELECT EXISTS(SELECT 1 FROM pdf_download_daily) AND EXISTS(SELECT 1 FROM pdf_download_totals)"
+        )
+        has_downloads = await conn.fetchval("SELECT EXISTS(SELECT 1 FROM pdf_downloads)")
+        if has_downloads and not has_rollups:
+            rows = await rebuild_pdf_download_rollups(conn)
+            logger.info(f"Backfilled {rows} daily PDF download rollups")
+
+    except asyncpg.PostgresError as e:
+        logger.error(f"Error backfilling PDF download rollups: {e}")
+        raise
+
 async def initialize_database():
     """
     Initialize the database by running the SQL file.
     Creates tables if they don't exist.
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
+        conn = await asyncpg.connect(DATABASE_URL, server_settings=SESSION_SETTINGS)
+        await init_connection(conn)
         
         sql_file_path = os.path.join(os.path.dirname(__file__), 'init_db.sql')
         with open(sql_file_path, 'r') as f:
@@ -62,6 +129,9 @@ async def initialize_database():
 
             await ensure_admin_user(conn)
             logger.info("Admin user check completed")
+
+            await backfill_card_fields(conn)
+            await backfill_pdf_download_rollups(conn)
         
         await conn.close()
         
@@ -25,9 +25,17 @@ CREATE TABLE IF NOT EXISTS blogs (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+ALTER TABLE blogs ADD COLUMN IF NOT EXISTS title TEXT;
+ALTER TABLE blogs ADD COLUMN IF NOT EXISTS summary TEXT;
+ALTER TABLE blogs ADD COLUMN IF NOT EXISTS cover_image TEXT;
+ALTER TABLE blogs ADD COLUMN IF NOT EXISTS cover_image_alt TEXT;
+ALTER TABLE blogs ADD COLUMN IF NOT EXISTS read_time INTEGER;
+
 CREATE INDEX IF NOT EXISTS idx_blogs_status ON blogs(status) WHERE isDeleted = FALSE;
 CREATE INDEX IF NOT EXISTS idx_blogs_type ON blogs(type) WHERE isDeleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_blogs_type_created_at ON blogs(type, created_at DESC) WHERE isDeleted = FALSE;
 CREATE INDEX IF NOT EXISTS idx_blogs_date ON blogs(date DESC) WHERE isDeleted = FALSE;
+CREATE INDEX IF NOT EXISTS idx_blogs_created_at ON blogs(created_at DESC) WHERE isDeleted = FALSE;
 CREATE INDEX IF NOT EXISTS idx_blogs_slug ON blogs(slug) WHERE isDeleted = FALSE;
 CREATE INDEX IF NOT EXISTS idx_blogs_isDeleted ON blogs(isDeleted);
 CREATE INDEX IF NOT EXISTS idx_blogs_keyword ON blogs USING GIN(keyword);
@@ -53,6 +61,11 @@ CREATE TABLE IF NOT EXISTS case_studies (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+ALTER TABLE case_studies ADD COLUMN IF NOT EXISTS title TEXT;
+ALTER TABLE case_studies ADD COLUMN IF NOT EXISTS summary TEXT;
+ALTER TABLE case_studies ADD COLUMN IF NOT EXISTS cover_image TEXT;
+ALTER TABLE case_studies ADD COLUMN IF NOT EXISTS cover_image_alt TEXT;
+
 CREATE INDEX IF NOT EXISTS idx_case_studies_status ON case_studies(status) WHERE isDeleted = FALSE;
 CREATE INDEX IF NOT EXISTS idx_case_studies_type ON case_studies(type) WHERE isDeleted = FALSE;
 CREATE INDEX IF NOT EXISTS idx_case_studies_date ON case_studies(date DESC) WHERE isDeleted = FALSE;
@@ -63,6 +76,9 @@ CREATE INDEX IF NOT EXISTS idx_case_studies_preview ON case_studies USING GIN(pr
 CREATE INDEX IF NOT EXISTS idx_case_studies_case_study ON case_studies USING GIN(case_study);
 CREATE INDEX IF NOT EXISTS idx_case_studies_editors_choice ON case_studies(editors_choice) WHERE isDeleted = FALSE;
 CREATE INDEX IF NOT EXISTS idx_case_studies_category ON case_studies(category) WHERE isDeleted = FALSE;
+-- Portfolio ordering: editor's choice first, then newest, id as the keyset tiebreaker
+CREATE INDEX IF NOT EXISTS idx_case_studies_portfolio ON case_studies((COALESCE(editors_choice = 'Y', FALSE)) DESC, date DESC, id DESC)
+    WHERE isDeleted = FALSE AND status = 'published' AND type = 'CASE STUDY';
 
 CREATE TABLE IF NOT EXISTS pdf_downloads (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -76,4 +92,47 @@ CREATE TABLE IF NOT EXISTS pdf_downloads (
 );
 
 CREATE INDEX IF NOT EXISTS idx_pdf_downloads_email ON pdf_downloads(email);
-CREATE INDEX IF NOT EXISTS idx_pdf_downloads_timestamp ON pdf_downloads(timestamp);
+-- (timestamp, id) serves the keyset-paginated listing
+DROP INDEX IF EXISTS idx_pdf_downloads_timestamp;
+CREATE INDEX IF NOT EXISTS idx_pdf_downloads_timestamp_id ON pdf_downloads(timestamp, id);
+
+-- Downloads per day and PDF and per PDF overall, kept current by every lead insert; the KPI endpoints read only these
+CREATE TABLE IF NOT EXISTS pdf_download_daily (
+    day DATE NOT NULL,
+    pdf_link TEXT NOT NULL,
+    downloads INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, pdf_link)
+);
+
+CREATE TABLE IF NOT EXISTS pdf_download_totals (
+    pdf_link TEXT PRIMARY KEY,
+    downloads BIGINT NOT NULL DEFAULT 0
+);
+
+-- Hard deletes, recorded so incremental backups can replay them; a session with
+-- app.skip_tombstones = 'on' (a restore clearing a table) records nothing
+CREATE TABLE IF NOT EXISTS deleted_rows (
+    table_name TEXT NOT NULL,
+    row_id TEXT NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT (clock_timestamp() AT TIME ZONE 'UTC')
+);
+
+CREATE INDEX IF NOT EXISTS idx_deleted_rows_deleted_at ON deleted_rows(deleted_at);
+
+CREATE OR REPLACE FUNCTION record_deleted_row() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('app.skip_tombstones', true) IS DISTINCT FROM 'on' THEN
+        INSERT INTO deleted_rows (table_name, row_id) VALUES (TG_TABLE_NAME, OLD.id::text);
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS admin_users_deleted_rows ON admin_users;
+CREATE TRIGGER admin_users_deleted_rows AFTER DELETE ON admin_users FOR EACH ROW EXECUTE FUNCTION record_deleted_row();
+DROP TRIGGER IF EXISTS blogs_deleted_rows ON blogs;
+CREATE TRIGGER blogs_deleted_rows AFTER DELETE ON blogs FOR EACH ROW EXECUTE FUNCTION record_deleted_row();
+DROP TRIGGER IF EXISTS case_studies_deleted_rows ON case_studies;
+CREATE TRIGGER case_studies_deleted_rows AFTER DELETE ON case_studies FOR EACH ROW EXECUTE FUNCTION record_deleted_row();
+DROP TRIGGER IF EXISTS pdf_downloads_deleted_rows ON pdf_downloads;
+CREATE TRIGGER pdf_downloads_deleted_rows AFTER DELETE ON pdf_downloads FOR EACH ROW EXECUTE FUNCTION record_deleted_row();
@@ -0,0 +1,87 @@
+import gzip
+from typing import Dict, Iterable, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content encodings in order of preference; br variants are only produced when the brotli package is installed
+ENCODING_PREFERENCE = ("br", "gzip")
+SUPPORTED_ENCODINGS = ENCODING_PREFERENCE if brotli is not None else ("gzip",)
+SIDECAR_EXTENSIONS = {"br": ".br", "gzip": ".gz"}
+
+# File types worth compressing; images, fonts in woff/woff2 and PDFs are already compressed
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".mjs", ".html", ".htm", ".svg", ".json", ".txt", ".xml", ".map", ".ico", ".ttf", ".otf", ".eot"}
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """
+    Compress a body with one content encoding
+
+    Args:
+        data: Raw bytes
+        encoding: "gzip" or "br"
+        level: Compression level; defaults to the maximum for the encoding
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11 if level is None else level)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def compress_variants(data: bytes, levels: Optional[Dict[str, int]] = None) -> Dict[str, bytes]:
+    """
+    Compress a body with every supported encoding, keeping only variants smaller than the original
+
+    Args:
+        data: Raw bytes
+        levels: Optional per-encoding compression level
+
+    Returns:
+        Dictionary of encoding -> compressed bytes
+    """
+    variants = {}
+    for encoding in SUPPORTED_ENCODINGS:
+        compressed = compress(data, encoding, (levels or {}).get(encoding))
+        if len(compressed) < len(data):
+            variants[encoding] = compressed
+    return variants
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """
+    Pick the content encoding to send for an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw Accept-Encoding request header
+        available: Encodings a compressed variant exists for
+
+    Returns:
+        The preferred acceptable encoding, or None to send the identity body
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    available = set(available)
+    for encoding in ENCODING_PREFERENCE:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and quality > 0:
+            return encoding
+    return None
@@ -0,0 +1,117 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+from fastapi.responses import HTMLResponse
+from DATABASE_HANDLER.utils.compression import negotiate_encoding
+from DATABASE_HANDLER.utils.page_cache import RenderedPage
+
+# Let clients and proxies store responses but revalidate them on every use
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the values a response was derived from
+
+    Args:
+        *parts: Version inputs, e.g. request parameters plus max(updated_at) and row count
+
+    Returns:
+        Quoted weak ETag
+    """
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # TIMESTAMP columns come back naive; they are treated as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Get the ETag, Last-Modified and Cache-Control headers for a response
+
+    Args:
+        etag: Quoted ETag
+        last_modified: Time the underlying content last changed
+
+    Returns:
+        Header dictionary
+    """
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against the current validators
+    If-None-Match takes precedence; If-Modified-Since is only consulted when it is absent
+
+    Args:
+        request: Incoming request
+        etag: Current quoted ETag
+        last_modified: Time the underlying content last changed
+
+    Returns:
+        True when the client's copy is still current and a 304 can be sent
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = etag[2:] if etag.startswith("W/") else etag
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == current:
+                return True
+        return False
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """
+    Build an empty 304 response carrying the current validators
+    """
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+def page_response(request: Request, page: RenderedPage) -> Response:
+    """
+    Send a cached page, or a 304 when the client already has this version of it
+    The precompressed variant matching Accept-Encoding is sent as-is; each encoding gets its own ETag
+
+    Args:
+        request: Incoming request
+        page: Rendered page from the page cache
+
+    Returns:
+        304 response or HTMLResponse with ETag and Last-Modified set
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), page.encoded)
+    etag = page.etag if encoding is None else f'{page.etag[:-1]}-{encoding}"'
+    headers = validator_headers(etag, page.last_modified)
+    headers["Vary"] = "Accept-Encoding"
+
+    if is_not_modified(request, etag, page.last_modified):
+        return Response(status_code=304, headers=headers)
+    if encoding is None:
+        return HTMLResponse(content=page.body, headers=headers)
+    headers["Content-Encoding"] = encoding
+    return HTMLResponse(content=page.encoded[encoding], headers=headers)
@@ -1,31 +1,17 @@
 import asyncpg
-import os
-import json
-from dotenv import load_dotenv
 from datetime import datetime
 
-load_dotenv()
-
-DATABASE_URL = os.getenv("POSTGRES_CONNECTION_URL")
-
 def calculate_read_time(blog_content_json):
     """
     Calculate the estimated read time for a blog post.
     """
     text = ""
     
-    # The content can be a stringified JSON or a dict
-    if isinstance(blog_content_json, str):
-        try:
-            blog_content = json.loads(blog_content_json)
-        except json.JSONDecodeError:
-            blog_content = {}
-    else:
-        blog_content = blog_content_json
+    blog_content = blog_content_json or {}
 
     # Extract text from title and summary
-    text += blog_content.get('blogTitle', '') + " "
-    text += blog_content.get('blogSummary', '') + " "
+    text += (blog_content.get('blogTitle') or '') + " "
+    text += (blog_content.get('blogSummary') or '') + " "
     
     # Extract text from the main content blocks
     content_data = blog_content.get('blogcontent', {})
@@ -40,57 +26,106 @@ def calculate_read_time(blog_content_json):
     return max(1, read_time_minutes) # Ensure minimum 1 minute read time
 
 
-async def get_blog_data():
+def extract_blog_image(blog_content):
+    """
+    Extract the cover image URL from the blog content.
+    Checks the explicit image fields first, then the first block of type 'image',
+    at the top level and inside a nested 'blogcontent' object.
+    """
+    if not isinstance(blog_content, dict):
+        return None
+
+    for content in (blog_content, blog_content.get('blogcontent')):
+        if not isinstance(content, dict):
+            continue
+
+        if content.get('mainImageUrl'):
+            return content['mainImageUrl']
+
+        if content.get('blogTitleImage'):
+            return content['blogTitleImage']
+
+        if isinstance(content.get('blog_cover_image'), dict) and content['blog_cover_image'].get('url'):
+            return content['blog_cover_image']['url']
+
+        for block in content.get('blocks', []) or []:
+            if isinstance(block, dict) and block.get('type') == 'image' and block.get('data', {}).get('file', {}).get('url'):
+                return block['data']['file']['url']
+    return None
+
+
+def extract_blog_summary(blog_content):
+    """
+    Get the blog summary, falling back to the first paragraph of the content.
+    """
+    summary = blog_content.get('blogSummary', '')
+    if not summary:
+        content = blog_content.get('blogcontent', {})
+        if isinstance(content, dict) and 'content' in content:
+            content_items = content['content']
+            for item in content_items:
+                if item.get('type') == 'paragraph' and item.get('data', {}).get('content'):
+                    summary = item['data']['content']
+                    break
+        elif isinstance(content, str):
+            summary = content
+    return summary or ''
+
+
+def compute_blog_card_fields(blog_content_json):
+    """
+    Derive the denormalized card columns stored alongside blogContent.
+    Called on every write so listing queries never have to parse the full JSONB.
+    """
+    blog_content = blog_content_json or {}
+
+    return {
+        'title': blog_content.get('blogTitle'),
+        'summary': extract_blog_summary(blog_content),
+        'cover_image': extract_blog_image(blog_content),
+        'cover_image_alt': blog_content.get('mainImageAlt'),
+        'read_time': calculate_read_time(blog_content),
+        'category': blog_content.get('blogCategory') or blog_content.get('blogcategory')
+    }
+
+
+HOME_PAGE_BLOG_LIMIT = 3
+
+
+def process_blog_card(blog):
+    """
+    Convert a blog card row into the dictionary the card generators expect.
+    """
+    summary = blog['summary'] or ''
+    summary = summary[:150] + '...' if len(summary) > 150 else summary
+
+    return {
+        'id': blog['id'],
+        'title': blog['title'] or 'Untitled Blog',
+        'summary': summary,
+        'created_at': blog['created_at'].strftime('%B %d, %Y') if blog['created_at'] else '',
+        'slug': blog['slug'],
+        'category': blog['category'] or 'General',
+        'type': blog['type'],
+        'cover_image': blog['cover_image'],
+        'read_time': blog['read_time']
+    }
+
+
+async def get_blog_data(conn: asyncpg.Connection):
     """
     Fetch blog data from the database for different sections based on type.
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
-
         all_blogs_query = """
-            SELECT id, blogContent, date, created_at, slug, type
+            SELECT id, title, summary, cover_image, read_time, category, date, created_at, slug, type
             FROM blogs
             WHERE isdeleted = FALSE
             ORDER BY created_at DESC
         """
         all_blogs = await conn.fetch(all_blogs_query)
 
-        await conn.close()
-
-        processed_blogs = []
-        for blog in all_blogs:
-            blog_content = blog['blogcontent']
-            if isinstance(blog_content, str):
-                try:
-                    blog_content = json.loads(blog_content)
-                except json.JSONDecodeError:
-                    blog_content = {}
-            
-            summary = blog_content.get('blogSummary', '')
-            if not summary:
-                content = blog_content.get('blogcontent', {})
-                if isinstance(content, dict) and 'content' in content:
-                    content_items = content['content']
-                    for item in content_items:
-                        if item.get('type') == 'paragraph' and item.get('data', {}).get('content'):
-                            summary = item['data']['content']
-                            break
-                elif isinstance(content, str):
-                    summary = content
-            
-            summary = summary[:150] + '...' if len(summary) > 150 else summary
-
-            processed_blogs.append({
-                'id': blog['id'],
-                'title': blog_content.get('blogTitle', 'Untitled Blog'),
-                'summary': summary,
-                'created_at': blog['created_at'].strftime('%B %d, %Y') if blog['created_at'] else '',
-                'slug': blog['slug'],
-                'category': blog_content.get('blogCategory', 'General'),
-                'type': blog['type'],
-                'cover_image': extract_blog_image(blog_content),
-                'read_time': calculate_read_time(blog_content)
-            })
+        processed_blogs = [process_blog_card(blog) for blog in all_blogs]
 
         editors_choice_data = [b for b in processed_blogs if b['type'] == 'EDITORS_CHOICE']
         top_blog_data = [b for b in processed_blogs if b['type'] == 'BLOG_HERO']
@@ -109,24 +144,6 @@ async def get_blog_data():
         return [], [], [], None, []
 
 
-def extract_blog_image(blog_content):
-    """
-    Extract the cover image URL from the blog content.
-    The image is expected to be the first block of type 'image'.
-    """
-    if 'mainImageUrl' in blog_content and blog_content['mainImageUrl']:
-        return blog_content['mainImageUrl']
-    
-    if 'blog_cover_image' in blog_content and blog_content['blog_cover_image']:
-        return blog_content['blog_cover_image'].get('url')
-        
-    if 'blogcontent' in blog_content and 'blocks' in blog_content['blogcontent']:
-        for block in blog_content['blogcontent']['blocks']:
-            if block['type'] == 'image':
-                return block['data']['file']['url']
-    return None
-
-
 def generate_unified_blog_card_html(blog):
     """
     Generate HTML for a unified blog card design with image, date, title, summary, and read more link.
@@ -196,12 +213,32 @@ def get_blog_color(index):
     return colors[index % len(colors)]
 
 
-async def get_blogs_html():
+async def get_home_blog_data(conn: asyncpg.Connection, limit: int = HOME_PAGE_BLOG_LIMIT):
+    """
+    Fetch only the BLOG_HOME_PAGE blogs shown on the home page, newest first.
+    """
+    try:
+        query = """
+            SELECT id, title, summary, cover_image, read_time, category, date, created_at, slug, type
+            FROM blogs
+            WHERE isdeleted = FALSE AND type = 'BLOG_HOME_PAGE'
+            ORDER BY created_at DESC
+            LIMIT $1
+        """
+        home_blogs = await conn.fetch(query, limit)
+        return [process_blog_card(blog) for blog in home_blogs]
+
+    except Exception as e:
+        print(f"Error fetching home page blogs: {e}")
+        return []
+
+
+async def get_blogs_html(conn: asyncpg.Connection):
     """
     Generate the HTML content for the blogs_landing.html page with dynamic content
     for all three sections.
     """
-    editors_choice_data, latest_gossip_data, read_more_data, top_blog, blog_home_data = await get_blog_data()
+    editors_choice_data, latest_gossip_data, read_more_data, top_blog, blog_home_data = await get_blog_data(conn)
 
     # Generate HTML for Editor's Choice carousel
     editors_choice_html = ""
@@ -256,10 +293,14 @@ def generate_home_insight_card_html(blog, index):
 
 if __name__ == "__main__":
     import asyncio
+    from DATABASE_HANDLER.connection_pool import db_pool
     
     async def main():
-        editors_choice_html, latest_gossips_html, read_more_html, top_editors_choice_data, top_blog, editors_choice_mobile_html = await get_blogs_html()
-        home_insights_html = await get_home_insights_html(top_editors_choice_data)
+        await db_pool.initialize(min_size=1, max_size=1)
+        async with db_pool.connection() as conn:
+            editors_choice_html, latest_gossips_html, read_more_html, top_blog, editors_choice_mobile_html, blog_home_data = await get_blogs_html(conn)
+        await db_pool.close()
+        home_insights_html = await get_home_insights_html(blog_home_data)
         
         print("Generated Editor's Choice HTML:\n", editors_choice_html)
         print("Generated Editor's Choice Mobile HTML:\n", editors_choice_mobile_html)
@@ -1,6 +1,8 @@
 import re
-import json
 from html import unescape
+from typing import List, Optional, Tuple
+import asyncpg
+from DATABASE_HANDLER.utils.pagination import SORT_COLUMNS, keyset_query, fetch_page_with_total, split_page
 
 
 CATEGORY_DISPLAY_MAPPING = {
@@ -18,6 +20,11 @@ CATEGORY_DISPLAY_MAPPING = {
     "website_development": "Website Development",
 }
 
+# Portfolio ordering: editor's choice first, then newest; matches idx_case_studies_portfolio
+PORTFOLIO_RANK = "COALESCE(editors_choice = 'Y', FALSE)"
+PORTFOLIO_COLUMNS = ["slug", "title", "summary", "cover_image", "cover_image_alt", "category", "updated_at",
+                     "preview->'projectSnapshots' AS project_snapshots"]
+
 
 def get_display_category(category):
     if not category:
@@ -52,32 +59,54 @@ def clean_html(html_text):
     return text.strip()
 
 
+def compute_case_study_card_fields(preview_json):
+    """
+    Derive the denormalized card columns stored alongside the case study preview
+    Called on every write so listing queries never have to parse the preview JSONB
+    
+    Args:
+        preview_json: Preview data as a dictionary
+        
+    Returns:
+        dict: title, summary (plain text), cover_image and cover_image_alt
+    """
+    preview = preview_json or {}
+    
+    return {
+        'title': preview.get('blogTitle'),
+        'summary': clean_html(preview.get('text', '')),
+        'cover_image': preview.get('imageUrl'),
+        'cover_image_alt': preview.get('imageAlt')
+    }
+
+
+def parse_project_snapshots(project_snapshots):
+    """
+    Normalize the projectSnapshots value selected out of the preview JSONB into a list
+    """
+    return project_snapshots if isinstance(project_snapshots, list) else []
+
+
 def generate_case_study_card(case_study_data, index):
     """
     Generate HTML card for a case study
     
     Args:
-        case_study_data: Dictionary containing case study information with 'slug', 'preview', and 'category'
+        case_study_data: Dictionary with 'slug', 'category', the denormalized card columns
+            ('title', 'summary', 'cover_image', 'cover_image_alt') and 'project_snapshots'
         index: Position index to determine light/dark theme
         
     Returns:
         str: HTML string for the case study card
     """
     slug = case_study_data.get('slug', '')
-    preview = case_study_data.get('preview', {})
     raw_category = case_study_data.get('category', '')
     
-    if isinstance(preview, str):
-        try:
-            preview = json.loads(preview)
-        except:
-            preview = {}
-    
-    image_url = preview.get('imageUrl', '/images/Frame1.jpg')
-    image_alt = preview.get('imageAlt', 'Case Study')
-    blog_title = preview.get('blogTitle', 'Untitled Case Study')
-    text = clean_html(preview.get('text', ''))
-    project_snapshots = preview.get('projectSnapshots', [])
+    image_url = case_study_data.get('cover_image') or '/images/Frame1.jpg'
+    image_alt = case_study_data.get('cover_image_alt') or 'Case Study'
+    blog_title = case_study_data.get('title') or 'Untitled Case Study'
+    text = case_study_data.get('summary') or ''
+    project_snapshots = parse_project_snapshots(case_study_data.get('project_snapshots'))
     
     display_category = get_display_category(raw_category)
     category_badge_html = f'<span class="case-study-badge">{display_category}</span>' if display_category else ''
@@ -153,18 +182,9 @@ def generate_home_case_study_html(case_study):
         return "", "", ""
 
     slug = case_study.get('slug')
-    preview = case_study.get('preview', {})
-    if isinstance(preview, str):
-        try:
-            preview = json.loads(preview)
-        except (json.JSONDecodeError, TypeError):
-            preview = {}
-
-    image_url = preview.get('imageUrl', '/images/Man-with-bulb.svg')
-
-    title = preview.get('blogTitle', 'Discover Our Latest Success Story')
-    
-    summary_points = preview.get('projectSnapshots', [])
+    image_url = case_study.get('cover_image') or '/images/Man-with-bulb.svg'
+    title = case_study.get('title') or 'Discover Our Latest Success Story'
+    summary_points = parse_project_snapshots(case_study.get('project_snapshots'))
     
     title_html = f'<h2>{title}</h2>'
     
@@ -189,7 +209,7 @@ async def get_case_study_for_home(conn):
         A dictionary representing the case study, or None if no case study is found.
     """
     query = """
-        SELECT slug, preview
+        SELECT slug, title, cover_image, preview->'projectSnapshots' AS project_snapshots
         FROM case_studies
         WHERE isdeleted = FALSE
             AND status = 'published'
@@ -200,4 +220,34 @@ async def get_case_study_for_home(conn):
         LIMIT 1
     """
     case_study = await conn.fetchrow(query)
-    return case_study
\ No newline at end of file
+    return case_study
+
+
+async def fetch_portfolio_page(conn: asyncpg.Connection, category: Optional[str], per_page: int,
+                               cursor: Optional[str] = None, page: int = 1) -> Tuple[List[asyncpg.Record], int, Optional[str]]:
+    """
+    Fetch one page of published case studies for the portfolio, keyed on (editor's choice, date, id)
+
+    Args:
+        conn: An asyncpg database connection object.
+        category: Category name to filter by (case-insensitive), or None for every category
+        per_page: Page size
+        cursor: next_cursor of the previous page; without one, page n is reached by skipping rows
+        page: Page number, only used when there is no cursor
+
+    Returns:
+        Tuple of (case study rows, total published case studies in the filter, cursor for the next page or None)
+    """
+    conditions = ["isdeleted = FALSE", "status = 'published'", "type = 'CASE STUDY'"]
+    params = []
+    if category:
+        params.append(category)
+        conditions.append(f"LOWER(category) = LOWER(${len(params)})")
+
+    query, query_params = keyset_query(
+        "case_studies", PORTFOLIO_COLUMNS, conditions, params, "date", True, cursor, per_page,
+        sort_columns={"date": SORT_COLUMNS["date"]}, rank=PORTFOLIO_RANK, offset=(page - 1) * per_page
+    )
+    records, total = await fetch_page_with_total(conn, "case_studies", conditions, params, query, query_params, "date", True, ranked=True)
+    case_studies, next_cursor = split_page(records, "date", per_page, ranked=True)
+    return case_studies, total, next_cursor
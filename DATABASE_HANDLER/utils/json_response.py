@@ -0,0 +1,97 @@
+import functools
+import inspect
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import UUID
+
+import asyncpg
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """
+    Convert the types neither serializer handles natively
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, asyncpg.Record):
+        return dict(value)
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize a response body; datetimes, dates and UUIDs are written in ISO / canonical form
+
+    Args:
+        content: JSON-compatible value, possibly containing datetimes, UUIDs, asyncpg records or pydantic models
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson (stdlib json when it is not installed)
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route that turns an endpoint's return value straight into a FastJSONResponse
+
+    FastAPI otherwise runs every return value through jsonable_encoder before the response class
+    sees it, which walks the whole document in Python. Endpoints returning a Response are left
+    alone; headers and status set on an injected `response: Response` parameter are carried over.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, self._wrap(endpoint, kwargs.get("status_code")), **kwargs)
+
+    @staticmethod
+    def _wrap(endpoint: Callable[..., Any], status_code: Any) -> Callable[..., Any]:
+        is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            if is_coroutine:
+                content = await endpoint(*args, **kwargs)
+            else:
+                content = await run_in_threadpool(endpoint, *args, **kwargs)
+            if isinstance(content, Response):
+                return content
+
+            sub_response = next((value for value in kwargs.values() if isinstance(value, Response)), None)
+            response = FastJSONResponse(content, status_code=status_code or 200)
+            if sub_response is not None:
+                if sub_response.status_code:
+                    response.status_code = sub_response.status_code
+                response.raw_headers.extend(sub_response.headers.raw)
+            return response
+
+        return wrapper
@@ -0,0 +1,267 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import asyncpg
+from config import config
+from DATABASE_HANDLER.connection_pool import db_pool
+from DATABASE_HANDLER.utils.pagination import count_cache
+from DATABASE_HANDLER.utils.pdf_download_rollups import (
+    CREATE_STAGING_TABLE_QUERY, RECORD_PDF_DOWNLOAD_QUERY, RECORD_STAGED_PDF_DOWNLOADS_QUERY, STAGING_TABLE
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows; the spool is then not guarded against a second process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LEAD_COLUMNS = ("id", "timestamp", "first_name", "last_name", "email", "company_name", "mobile_number", "pdf_link")
+
+
+class LeadIngestionBuffer:
+    """
+    Acknowledge PDF download leads right away and write them to pdf_downloads in batches
+
+    A submission is appended to a local spool file and fsynced before it is acknowledged, then held
+    in memory until batch_size leads are waiting, flush_interval seconds pass or the app shuts down.
+    A batch is COPYed into a temp staging table and moved into pdf_downloads, rollups included, in
+    one transaction, and only then dropped from the spool. Leads a crash leaves in the spool are
+    replayed on the next start; their ids make the replay idempotent.
+
+    The same email and pdf_link submitted again within dedupe_window seconds is coalesced into the
+    first submission. Before start(), after stop(), or when another process holds the spool, leads
+    are inserted directly.
+    """
+
+    def __init__(self, spool_path: str, batch_size: int, flush_interval: float, dedupe_window: float):
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dedupe_window = dedupe_window
+        self._pending: List[Dict[str, Any]] = []
+        self._recent: Dict[Tuple[str, str], float] = {}
+        self._spool = None
+        self._lock_file = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _dedupe_key(email: Optional[str], pdf_link: Optional[str]) -> Tuple[str, str]:
+        return (email or "").strip().lower(), pdf_link or ""
+
+    def _is_duplicate(self, key: Tuple[str, str]) -> bool:
+        return self._recent.get(key, 0) > time.monotonic()
+
+    def _remember(self, key: Tuple[str, str]):
+        self._recent[key] = time.monotonic() + self.dedupe_window
+
+    async def submit(self, first_name: str, last_name: Optional[str], email: str, company_name: Optional[str],
+                     mobile_number: Optional[str], pdf_link: str) -> bool:
+        """
+        Accept a lead
+
+        Returns:
+            True if the lead was recorded, False if it was coalesced into a recent identical submission
+        """
+        key = self._dedupe_key(email, pdf_link)
+        lead = {
+            "id": str(uuid.uuid4()),
+            # UTC, like the column default under the pool's UTC session, which the direct insert falls back to
+            "timestamp": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "company_name": company_name,
+            "mobile_number": mobile_number,
+            "pdf_link": pdf_link,
+        }
+
+        if self._spool is not None:
+            try:
+                async with self._lock:
+                    if self._is_duplicate(key):
+                        return False
+                    await self._append(lead)
+                    self._pending.append(lead)
+                    self._remember(key)
+                if len(self._pending) >= self.batch_size:
+                    self._wakeup.set()
+                return True
+            except OSError as e:
+                logger.error(f"Lead spool write failed, inserting directly: {e}")
+
+        if self._is_duplicate(key):
+            return False
+        await self._insert_directly(lead)
+        self._remember(key)
+        return True
+
+    async def _append(self, lead: Dict[str, Any]):
+        self._spool.write((json.dumps(lead, separators=(",", ":")) + "\n").encode("utf-8"))
+        self._spool.flush()
+        await asyncio.to_thread(os.fsync, self._spool.fileno())
+
+    async def _insert_directly(self, lead: Dict[str, Any]):
+        async with db_pool.connection() as conn:
+            await conn.execute(RECORD_PDF_DOWNLOAD_QUERY, *(lead[column] for column in LEAD_COLUMNS[2:]))
+        count_cache.invalidate("pdf_downloads")
+
+    @staticmethod
+    def _record(lead: Dict[str, Any]) -> tuple:
+        return (uuid.UUID(lead["id"]), datetime.fromisoformat(lead["timestamp"]),
+                *(lead[column] for column in LEAD_COLUMNS[2:]))
+
+    async def _copy(self, leads: List[Dict[str, Any]]) -> int:
+        async with db_pool.connection(transaction=True) as conn:
+            await conn.execute(CREATE_STAGING_TABLE_QUERY)
+            await conn.copy_records_to_table(STAGING_TABLE, records=[self._record(lead) for lead in leads], columns=LEAD_COLUMNS)
+            return await conn.fetchval(RECORD_STAGED_PDF_DOWNLOADS_QUERY)
+
+    async def flush(self) -> int:
+        """
+        Write the waiting leads to pdf_downloads
+
+        On a database error the leads stay pending and spooled for the next flush. A lead the
+        database rejects outright (e.g. a value too long for its column) is logged and dropped so
+        it cannot hold back the rest.
+
+        Returns:
+            Number of leads inserted
+        """
+        if self._spool is None:
+            return 0
+
+        async with self._flush_lock:
+            batch = list(self._pending)
+            if not batch:
+                return 0
+
+            try:
+                try:
+                    inserted = await self._copy(batch)
+                except asyncpg.DataError:
+                    inserted = 0
+                    for lead in batch:
+                        try:
+                            inserted += await self._copy([lead])
+                        except asyncpg.DataError as e:
+                            logger.error(f"Dropping lead rejected by the database ({e}): {json.dumps(lead)}")
+            except Exception as e:
+                logger.error(f"Flushing {len(batch)} leads failed; they stay spooled for the next attempt: {e}")
+                return 0
+
+            async with self._lock:
+                del self._pending[:len(batch)]
+                await asyncio.to_thread(self._rewrite_spool)
+                now = time.monotonic()
+                self._recent = {key: expires for key, expires in self._recent.items() if expires > now}
+
+            count_cache.invalidate("pdf_downloads")
+            return inserted
+
+    def _rewrite_spool(self):
+        """
+        Shrink the spool to the leads still pending; runs with the buffer lock held
+        """
+        if not self._pending:
+            self._spool.truncate(0)
+            os.fsync(self._spool.fileno())
+            return
+
+        temp_path = self.spool_path + ".tmp"
+        with open(temp_path, "wb") as temp:
+            for lead in self._pending:
+                temp.write((json.dumps(lead, separators=(",", ":")) + "\n").encode("utf-8"))
+            temp.flush()
+            os.fsync(temp.fileno())
+        os.replace(temp_path, self.spool_path)
+        self._spool.close()
+        self._spool = open(self.spool_path, "ab")
+
+    def _read_spool(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.spool_path):
+            return []
+
+        leads = []
+        with open(self.spool_path, "rb") as spool:
+            for number, line in enumerate(spool, start=1):
+                try:
+                    leads.append(json.loads(line))
+                except ValueError:
+                    # A crash mid-append leaves at most a torn last line, which was never acknowledged
+                    logger.warning(f"Skipping unreadable line {number} of lead spool {self.spool_path}")
+        return leads
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def start(self):
+        """
+        Open the spool, replay leads a previous run left in it, and start the background flusher
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.spool_path)), exist_ok=True)
+        lock_file = open(self.spool_path + ".lock", "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                logger.warning(f"Lead spool {self.spool_path} is held by another process; leads are inserted directly")
+                return
+        self._lock_file = lock_file
+
+        self._lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._pending = self._read_spool()
+        for lead in self._pending:
+            self._remember(self._dedupe_key(lead["email"], lead["pdf_link"]))
+        self._spool = open(self.spool_path, "ab")
+
+        if self._pending:
+            logger.info(f"Replaying {len(self._pending)} spooled leads from {self.spool_path}")
+            await self.flush()
+        self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the flusher and flush what is left; leads that still cannot be written stay spooled
+        """
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        if self._spool is None:
+            return
+
+        await self.flush()
+        if self._pending:
+            logger.warning(f"{len(self._pending)} leads could not be flushed; they stay in {self.spool_path} for the next start")
+
+        self._spool.close()
+        self._spool = None
+        self._lock_file.close()
+        self._lock_file = None
+
+
+lead_buffer = LeadIngestionBuffer(
+    config.LEAD_SPOOL_PATH,
+    config.LEAD_BATCH_SIZE,
+    config.LEAD_FLUSH_INTERVAL,
+    config.LEAD_DEDUPE_WINDOW
+)
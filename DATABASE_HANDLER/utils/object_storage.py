@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, BinaryIO, Callable, List, Optional
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+from minio import Minio
+from minio.error import S3Error
+from config import config
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectStorage:
+    """
+    Async access to the object storage bucket
+
+    The minio SDK is synchronous, so every call runs on a dedicated pool of max_workers threads
+    and the event loop keeps serving pages while a listing or upload waits on the network. A burst
+    of uploads queues for this pool rather than crowding out the default executor that
+    asyncio.to_thread and file uploads share.
+
+    Uploads are streamed from their file in part_size parts, one part in memory at a time.
+    """
+
+    def __init__(self, client: Minio, bucket_name: str, public_endpoint: str, max_workers: int, part_size: int):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.public_endpoint = public_endpoint
+        self.max_workers = max_workers
+        self.part_size = part_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="object-storage")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    def public_url(self, object_name: str) -> str:
+        return f"{self.public_endpoint}/{self.bucket_name}/{object_name}"
+
+    async def ensure_bucket(self):
+        """
+        Create the bucket if it does not exist yet
+        """
+        def ensure():
+            if not any(bucket.name == self.bucket_name for bucket in self.client.list_buckets()):
+                self.client.make_bucket(self.bucket_name)
+
+        await self._run(ensure)
+
+    async def list_objects(self) -> List[Any]:
+        """
+        List the bucket; the listing is paged by the SDK, so it is read in full on the pool
+        """
+        return await self._run(lambda: list(self.client.list_objects(self.bucket_name)))
+
+    async def object_exists(self, object_name: str) -> bool:
+        try:
+            await self._run(self.client.stat_object, self.bucket_name, object_name)
+            return True
+        except S3Error as e:
+            if e.code == 'NoSuchKey':
+                return False
+            raise
+
+    async def put_object(self, object_name: str, data: BinaryIO, length: int, content_type: str) -> Any:
+        """
+        Upload length bytes read from data; anything larger than part_size goes up as a multipart upload
+        """
+        # Parts go up one after another: the SDK reads ahead one part per parallel upload, and
+        # uploads already run side by side on the pool
+        return await self._run(
+            self.client.put_object,
+            bucket_name=self.bucket_name,
+            object_name=object_name,
+            data=data,
+            length=length,
+            content_type=content_type,
+            part_size=self.part_size,
+            num_parallel_uploads=1
+        )
+
+    async def remove_object(self, object_name: str):
+        await self._run(self.client.remove_object, bucket_name=self.bucket_name, object_name=object_name)
+
+    def close(self):
+        """
+        Wait for calls in flight and stop the pool
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+MINIO_PUBLIC_ENDPOINT = os.getenv("MINIO_PUBLIC_ENDPOINT")
+_parsed_url = urlparse(MINIO_PUBLIC_ENDPOINT)
+
+object_storage = ObjectStorage(
+    Minio(
+        endpoint=_parsed_url.netloc,
+        access_key=os.getenv("MINIO_ACCESS_KEY"),
+        secret_key=os.getenv("MINIO_SECRET_KEY"),
+        secure=_parsed_url.scheme == 'https'
+    ),
+    os.getenv("MINIO_BUCKET_NAME"),
+    MINIO_PUBLIC_ENDPOINT,
+    config.OBJECT_STORAGE_WORKERS,
+    config.OBJECT_STORAGE_PART_SIZE
+)
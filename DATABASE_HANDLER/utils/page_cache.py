@@ -0,0 +1,268 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from config import config
+from DATABASE_HANDLER.utils.compression import compress_variants
+
+logger = logging.getLogger(__name__)
+
+BLOG_PAGES = "blog"
+CASE_STUDY_PAGES = "case_study"
+HOME_PAGE = "home"
+BLOGS_LANDING_PAGE = "blogs_landing"
+PORTFOLIO_PAGES = "portfolio"
+
+
+# Dynamic pages are compressed once per render, so favour speed over the last few percent
+RENDERED_PAGE_COMPRESSION_LEVELS = {"gzip": 6, "br": 5}
+
+
+class RenderedPage:
+    """
+    A rendered HTML page, encoded and compressed once, with the validators sent alongside it
+
+    The ETag is a hash of the body, so a re-render that produces the same HTML keeps its ETag.
+    """
+
+    __slots__ = ("body", "encoded", "etag", "last_modified")
+
+    def __init__(self, html: str, last_modified: Optional[datetime] = None):
+        self.body = html.encode("utf-8")
+        self.encoded = compress_variants(self.body, RENDERED_PAGE_COMPRESSION_LEVELS)
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self.last_modified = (last_modified or datetime.now(timezone.utc)).replace(microsecond=0)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(variant) for variant in self.encoded.values())
+
+    @property
+    def html(self) -> str:
+        return self.body.decode("utf-8")
+
+
+class PageCache:
+    """
+    In-process LRU cache for rendered HTML pages, bounded by total size in bytes
+
+    Entries are keyed by (namespace, key). An optional version (e.g. the row's updated_at)
+    is stored alongside the HTML; a lookup with a different version counts as a miss.
+
+    get_or_render() adds stale-while-revalidate and request coalescing on top: each namespace
+    has a (ttl, stale window) policy, concurrent misses share one in-flight render, and an entry
+    past its ttl but inside the stale window is served as-is while one background task refreshes it.
+    """
+
+    def __init__(self, max_bytes: int, policies: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.max_bytes = max_bytes
+        self.policies = policies or {}
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, RenderedPage, int, float]]" = OrderedDict()
+        self._size = 0
+        self._inflight: Dict[Tuple[str, Hashable], Tuple[Any, asyncio.Task]] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, namespace: str, key: Hashable, version: Any = None) -> Optional[RenderedPage]:
+        """
+        Look up a cached page
+
+        Args:
+            namespace: Page family, e.g. BLOG_PAGES
+            key: Identifier within the namespace, e.g. the slug
+            version: Version the caller expects; a stored entry with another version is ignored
+
+        Returns:
+            Cached page or None on a miss
+        """
+        entry = self._entries.get((namespace, key))
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end((namespace, key))
+        self.hits += 1
+        return entry[1]
+
+    def set(self, namespace: str, key: Hashable, page: RenderedPage, version: Any = None):
+        """
+        Store a rendered page, evicting least recently used entries to stay within max_bytes
+
+        Args:
+            namespace: Page family, e.g. BLOG_PAGES
+            key: Identifier within the namespace, e.g. the slug
+            page: Rendered page
+            version: Version the HTML was rendered from
+        """
+        size = page.size
+        if size > self.max_bytes:
+            return
+
+        self._discard((namespace, key))
+        self._entries[(namespace, key)] = (version, page, size, time.monotonic())
+        self._size += size
+
+        while self._size > self.max_bytes:
+            _, (_, _, evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            self.evictions += 1
+
+    async def get_or_render(
+        self,
+        namespace: str,
+        key: Hashable,
+        render: Callable[[], Awaitable[str]],
+        version: Any = None
+    ) -> RenderedPage:
+        """
+        Return a cached page, rendering it at most once per key no matter how many requests miss together
+
+        A fresh entry is returned directly. An entry past the namespace ttl but inside its stale window
+        is returned as well, and a single background render replaces it. Anything older, or a miss,
+        waits on the in-flight render for the key, starting one if none is running. The render must
+        acquire its own database connection since a background refresh outlives the request.
+
+        Args:
+            namespace: Page family, e.g. BLOG_PAGES; selects the (ttl, stale window) policy
+            key: Identifier within the namespace, e.g. the slug
+            render: Coroutine function producing the page HTML; exceptions propagate to every waiter
+            version: Version the caller expects; a stored entry with another version is ignored
+
+        Returns:
+            Rendered page
+        """
+        entry_key = (namespace, key)
+        entry = self._entries.get(entry_key)
+        if entry is not None and entry[0] == version:
+            ttl, stale = self.policies.get(namespace, (None, 0))
+            age = time.monotonic() - entry[3]
+            if ttl is None or age <= ttl:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return entry[1]
+            if age <= ttl + stale:
+                self._entries.move_to_end(entry_key)
+                self.stale_hits += 1
+                if entry_key not in self._inflight:
+                    self.refreshes += 1
+                    self._start_render(entry_key, render, version).add_done_callback(self._refresh_done)
+                return entry[1]
+
+        self.misses += 1
+        inflight = self._inflight.get(entry_key)
+        if inflight is not None and inflight[0] == version:
+            self.coalesced += 1
+            task = inflight[1]
+        else:
+            task = self._start_render(entry_key, render, version)
+        return await asyncio.shield(task)
+
+    def invalidate(self, namespace: str, key: Optional[Hashable] = None) -> int:
+        """
+        Drop cached pages
+
+        Args:
+            namespace: Page family to invalidate
+            key: Single entry to drop; the whole namespace is dropped when omitted
+
+        Returns:
+            Number of entries removed
+        """
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        if key is not None:
+            self._inflight.pop((namespace, key), None)
+            removed = 1 if self._discard((namespace, key)) else 0
+        else:
+            for entry_key in [entry_key for entry_key in self._inflight if entry_key[0] == namespace]:
+                del self._inflight[entry_key]
+            stale_keys = [entry_key for entry_key in self._entries if entry_key[0] == namespace]
+            for entry_key in stale_keys:
+                self._discard(entry_key)
+            removed = len(stale_keys)
+
+        self.invalidations += removed
+        return removed
+
+    def clear(self):
+        """
+        Drop every cached page
+        """
+        self.invalidations += len(self._entries)
+        self._epoch += 1
+        self._inflight.clear()
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dictionary with entry count, size, hit/stale/miss/eviction counters and hit ratio
+        """
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "inflight": len(self._inflight),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+        }
+
+    def _start_render(self, entry_key: Tuple[str, Hashable], render: Callable[[], Awaitable[str]], version: Any) -> "asyncio.Task[RenderedPage]":
+        generation = (self._epoch, self._generations.get(entry_key[0], 0))
+        task = asyncio.ensure_future(self._render(entry_key, render, version, generation))
+        self._inflight[entry_key] = (version, task)
+        return task
+
+    async def _render(self, entry_key: Tuple[str, Hashable], render: Callable[[], Awaitable[str]], version: Any, generation: Tuple[int, int]) -> RenderedPage:
+        try:
+            html = await render()
+            page = await asyncio.to_thread(RenderedPage, html)
+            # An invalidation while rendering means the HTML may predate the write; hand it to the
+            # waiters but don't store it
+            if generation == (self._epoch, self._generations.get(entry_key[0], 0)):
+                self.set(entry_key[0], entry_key[1], page, version)
+            return page
+        finally:
+            inflight = self._inflight.get(entry_key)
+            if inflight is not None and inflight[1] is asyncio.current_task():
+                del self._inflight[entry_key]
+
+    def _refresh_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.refresh_failures += 1
+            logger.warning(f"Background page refresh failed, keeping the stale copy: {type(error).__name__}: {error}")
+
+    def _discard(self, entry_key: Tuple[str, Hashable]) -> bool:
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return False
+        self._size -= entry[2]
+        return True
+
+
+page_cache = PageCache(max_bytes=config.PAGE_CACHE_MAX_BYTES, policies=config.PAGE_CACHE_POLICIES)
+
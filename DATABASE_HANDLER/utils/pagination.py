@@ -0,0 +1,349 @@
+import base64
+import binascii
+import json
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from uuid import UUID
+import asyncpg
+from fastapi import HTTPException
+from config import config
+from DATABASE_HANDLER.connection_pool import db_pool
+from DATABASE_HANDLER.utils.json_response import dumps
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Rows fetched per round trip when an export streams through a server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+# Columns a listing can be sorted by, with the parser that restores a cursor value
+SORT_COLUMNS: Dict[str, Callable[[str], Any]] = {
+    "date": datetime.fromisoformat,
+    "created_at": datetime.fromisoformat,
+    "updated_at": datetime.fromisoformat,
+    "title": str,
+    "status": str,
+    "type": str,
+    "category": str,
+    "editors_choice": str,
+}
+
+# Values of the deleted= filter; "false" keeps the queries on the isDeleted = FALSE partial indexes
+DELETED_STATES = ("false", "true", "all")
+
+
+def parse_fields(fields: Optional[str], available: Sequence[str], default: Sequence[str]) -> List[str]:
+    """
+    Resolve a fields= projection
+
+    Args:
+        fields: Comma-separated field names, "*" for every field, or None for the default set
+        available: Fields the endpoint can return
+        default: Fields returned when no projection is requested
+
+    Returns:
+        Requested field names in order, without duplicates
+
+    Raises:
+        HTTPException: 400 if a field is not available
+    """
+    if not fields:
+        return list(default)
+    if fields.strip() == "*":
+        return list(available)
+
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def build_filters(equals: Dict[str, Any], deleted: str = "false", search: Optional[str] = None) -> Tuple[List[str], List[Any]]:
+    """
+    Build the WHERE conditions for a listing
+
+    Args:
+        equals: Column -> value equality filters; None values are skipped
+        deleted: "false" (default), "true" or "all"
+        search: Case-insensitive substring match on the title column
+
+    Returns:
+        Tuple of (conditions, params); params are numbered from $1
+    """
+    if deleted not in DELETED_STATES:
+        raise HTTPException(status_code=400, detail=f"deleted must be one of: {', '.join(DELETED_STATES)}")
+
+    conditions = []
+    params = []
+    if deleted != "all":
+        conditions.append(f"isdeleted = {deleted.upper()}")
+    for column, value in equals.items():
+        if value is None:
+            continue
+        params.append(value)
+        conditions.append(f"{column} = ${len(params)}")
+    if search:
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+        conditions.append(f"title ILIKE ${len(params)}")
+    return conditions, params
+
+
+def where_clause(conditions: List[str]) -> str:
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the position after a row as an opaque cursor
+
+    Args:
+        *values: The row's sort key values in order, its id last
+    """
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values[:-1]] + [str(values[-1])],
+        separators=(",", ":")
+    ).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[Any], Any]]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor from the previous page
+        parsers: One parser per sort key value, in cursor order; the trailing id is parsed as a UUID
+
+    Returns:
+        The sort key values followed by the row id
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was built for another ordering
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        *values, row_id = json.loads(payload)
+        if len(values) != len(parsers):
+            raise ValueError("cursor does not match the ordering")
+        return [None if value is None else parse(value) for parse, value in zip(parsers, values)] + [UUID(row_id)]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _parse_rank(value: Any) -> bool:
+    if not isinstance(value, bool):
+        raise TypeError("rank must be a boolean")
+    return value
+
+
+def keyset_order(sort: str, descending: bool, rank: Optional[str] = None) -> str:
+    """
+    ORDER BY list for a keyset listing: ([rank,] sort, id)
+    """
+    direction = "DESC" if descending else "ASC"
+    order_by = f"{sort} {direction}, id {direction}"
+    if rank:
+        order_by = f"{rank} DESC, {order_by}"
+    return order_by
+
+
+def keyset_query(table: str, columns: Sequence[str], conditions: List[str], params: List[Any], sort: str,
+                 descending: bool, cursor: Optional[str], limit: Optional[int],
+                 sort_columns: Dict[str, Callable[[str], Any]] = SORT_COLUMNS, rank: Optional[str] = None,
+                 offset: int = 0) -> Tuple[str, List[Any]]:
+    """
+    Build a keyset-paginated listing query ordered by ([rank,] sort, id)
+
+    NULLs sort the way the single-column indexes store them (first when descending, last when
+    ascending), so the ORDER BY can be served by idx_*_date / idx_*_created_at.
+    One row past the limit is fetched so the caller can tell whether another page exists.
+
+    Args:
+        table: Table name
+        columns: Columns to select; id and the sort column are added if missing
+        conditions: Filter conditions from build_filters
+        params: Parameters for the conditions
+        sort: Sort column, a key of sort_columns
+        descending: Sort direction
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Page size, or None for every matching row (exports)
+        sort_columns: Columns the caller may sort by, with the parser that restores a cursor value
+        rank: Boolean SQL expression that is never NULL; rows where it is true come first,
+            e.g. editor's choice on the portfolio. Selected as "ranked"
+        offset: Rows to skip when there is no cursor, for clients jumping straight to page n
+
+    Returns:
+        Tuple of (query, params)
+    """
+    if sort not in sort_columns:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(sort_columns)}")
+
+    columns = list(dict.fromkeys([*columns, "id", sort]))
+    if rank:
+        columns.append(f"{rank} AS ranked")
+    conditions = list(conditions)
+    params = list(params)
+    if cursor:
+        parsers = [sort_columns[sort]]
+        if rank:
+            parsers.insert(0, _parse_rank)
+        *rank_value, sort_value, row_id = decode_cursor(cursor, parsers)
+        comparison = "<" if descending else ">"
+        if sort_value is None:
+            params.append(row_id)
+            condition = f"({sort} IS NULL AND id {comparison} ${len(params)})"
+            if descending:
+                condition += f" OR {sort} IS NOT NULL"
+        elif descending:
+            # Every key descends and the NULLs are already behind the cursor, so a single row
+            # comparison covers the rank too and lets the index scan start at the cursor
+            keys = [rank, sort, "id"] if rank else [sort, "id"]
+            params.extend([*rank_value, sort_value, row_id])
+            placeholders = [f"${number}" for number in range(len(params) - len(keys) + 1, len(params) + 1)]
+            condition = f"({', '.join(keys)}) < ({', '.join(placeholders)})"
+        else:
+            params.extend([sort_value, row_id])
+            condition = f"({sort}, id) > (${len(params) - 1}, ${len(params)}) OR {sort} IS NULL"
+        if rank and (sort_value is None or not descending):
+            params.append(rank_value[0])
+            condition = f"{rank} < ${len(params)} OR ({rank} = ${len(params)} AND ({condition}))"
+        conditions.append(f"({condition})")
+
+    query = f"""
+        SELECT {', '.join(columns)}
+        FROM {table}
+        {where_clause(conditions)}
+        ORDER BY {keyset_order(sort, descending, rank)}
+    """
+    if limit is not None:
+        params.append(limit + 1)
+        query += f"LIMIT ${len(params)}\n"
+    if offset and not cursor:
+        params.append(offset)
+        query += f"OFFSET ${len(params)}\n"
+    return query, params
+
+
+def split_page(records: List[asyncpg.Record], sort: str, limit: int, ranked: bool = False) -> Tuple[List[asyncpg.Record], Optional[str]]:
+    """
+    Trim the extra row fetched by keyset_query and build the cursor for the next page
+
+    Args:
+        records: Rows fetched by keyset_query
+        sort: Sort column the query was built with
+        limit: Page size
+        ranked: Whether the query was built with a rank expression
+
+    Returns:
+        Tuple of (page rows, next cursor or None on the last page)
+    """
+    if len(records) <= limit:
+        return records, None
+    last = records[limit - 1]
+    if ranked:
+        return records[:limit], encode_cursor(last["ranked"], last[sort], last["id"])
+    return records[:limit], encode_cursor(last[sort], last["id"])
+
+
+class CountCache:
+    """
+    Short-lived cache of listing totals, so paging through a listing does not re-count it on every request
+
+    Entries are keyed by (table, filter) and expire after ttl seconds; writes to a table drop its
+    entries through invalidate(), the ttl only bounds how stale a total can get otherwise.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, Hashable], Tuple[int, float]] = {}
+
+    def get(self, table: str, key: Hashable) -> Optional[int]:
+        entry = self._entries.get((table, key))
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, table: str, key: Hashable, total: int):
+        self._entries[(table, key)] = (total, time.monotonic() + self.ttl)
+
+    def invalidate(self, table: str):
+        """
+        Drop every cached total for a table
+        """
+        for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == table]:
+            del self._entries[entry_key]
+
+
+count_cache = CountCache(config.COUNT_CACHE_TTL)
+
+
+async def fetch_page_with_total(conn: asyncpg.Connection, table: str, conditions: List[str], params: List[Any],
+                                query: str, query_params: List[Any], sort: str, descending: bool,
+                                ranked: bool = False) -> Tuple[List[asyncpg.Record], int]:
+    """
+    Fetch a page built by keyset_query along with the size of the whole filtered set
+
+    The total comes from count_cache when it is warm. Otherwise the count and the page are fetched
+    in one round trip, the page joined laterally onto the count so an empty page still returns the total.
+    A join does not keep the order of its inputs, so the rows are ordered again on the keyset columns.
+
+    Args:
+        conn: Database connection
+        table: Table name
+        conditions: Filter conditions the page query was built from, without the cursor
+        params: Parameters for the conditions; they are the leading parameters of query_params
+        query: Page query from keyset_query
+        query_params: Parameters for the page query
+        sort: Sort column the query was built with
+        descending: Sort direction the query was built with
+        ranked: Whether the query was built with a rank expression
+
+    Returns:
+        Tuple of (page rows, total)
+    """
+    key = (tuple(conditions), tuple(params))
+    total = count_cache.get(table, key)
+    if total is not None:
+        return await conn.fetch(query, *query_params), total
+
+    records = await conn.fetch(
+        f"""
+        SELECT counted.total, page.*
+        FROM (SELECT COUNT(*) AS total FROM {table} {where_clause(conditions)}) AS counted
+        LEFT JOIN LATERAL ({query}) AS page ON TRUE
+        ORDER BY {keyset_order(sort, descending, "ranked" if ranked else None)}
+        """,
+        *query_params
+    )
+    total = records[0]["total"]
+    count_cache.set(table, key, total)
+    return [record for record in records if record["id"] is not None], total
+
+
+async def stream_ndjson(query: str, params: Sequence[Any], format_row: Callable[[asyncpg.Record], Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """
+    Stream a query as newline-delimited JSON through a server-side cursor
+
+    Runs on its own pooled connection inside a read-only transaction, since request-scoped
+    connections are released before a streaming body is sent. Memory stays bounded by
+    EXPORT_BATCH_SIZE rows however large the result is.
+
+    Args:
+        query: Listing query
+        params: Query parameters
+        format_row: Turns a row into the JSON object written for it
+
+    Yields:
+        Chunks of NDJSON, one batch of rows at a time
+    """
+    async with db_pool.connection() as conn:
+        async with conn.transaction(readonly=True):
+            cursor = await conn.cursor(query, *params)
+            while True:
+                records = await cursor.fetch(EXPORT_BATCH_SIZE)
+                if not records:
+                    break
+                yield b"".join(dumps(format_row(record)) + b"\n" for record in records)
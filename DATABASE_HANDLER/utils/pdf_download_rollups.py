@@ -0,0 +1,157 @@
+from datetime import date
+from typing import Any, Dict
+import asyncpg
+
+# Records a lead and bumps its day's and its PDF's rollups in one statement, so they can never drift apart
+RECORD_PDF_DOWNLOAD_QUERY = """
+    WITH lead AS (
+        INSERT INTO pdf_downloads (first_name, last_name, email, company_name, mobile_number, pdf_link)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        RETURNING timestamp, COALESCE(pdf_link, '') AS pdf_link
+    ), daily AS (
+        INSERT INTO pdf_download_daily (day, pdf_link, downloads)
+        SELECT timestamp::date, pdf_link, 1 FROM lead
+        ON CONFLICT (day, pdf_link) DO UPDATE SET downloads = pdf_download_daily.downloads + EXCLUDED.downloads
+    )
+    INSERT INTO pdf_download_totals (pdf_link, downloads)
+    SELECT pdf_link, 1 FROM lead
+    ON CONFLICT (pdf_link) DO UPDATE SET downloads = pdf_download_totals.downloads + EXCLUDED.downloads
+"""
+
+# Moves a batch of leads COPYed into pdf_downloads_staging into pdf_downloads and rolls up the rows
+# actually inserted; leads whose id is already stored (a spool replayed after a crash) are skipped
+STAGING_TABLE = "pdf_downloads_staging"
+CREATE_STAGING_TABLE_QUERY = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (LIKE pdf_downloads INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+"""
+RECORD_STAGED_PDF_DOWNLOADS_QUERY = f"""
+    WITH lead AS (
+        INSERT INTO pdf_downloads (id, timestamp, first_name, last_name, email, company_name, mobile_number, pdf_link)
+        SELECT id, timestamp, first_name, last_name, email, company_name, mobile_number, pdf_link FROM {STAGING_TABLE}
+        ON CONFLICT (id) DO NOTHING
+        RETURNING timestamp, COALESCE(pdf_link, '') AS pdf_link
+    ), daily AS (
+        INSERT INTO pdf_download_daily (day, pdf_link, downloads)
+        SELECT timestamp::date, pdf_link, COUNT(*) FROM lead GROUP BY 1, 2
+        ON CONFLICT (day, pdf_link) DO UPDATE SET downloads = pdf_download_daily.downloads + EXCLUDED.downloads
+    ), totals AS (
+        INSERT INTO pdf_download_totals (pdf_link, downloads)
+        SELECT pdf_link, COUNT(*) FROM lead GROUP BY 1
+        ON CONFLICT (pdf_link) DO UPDATE SET downloads = pdf_download_totals.downloads + EXCLUDED.downloads
+    )
+    SELECT COUNT(*) FROM lead
+"""
+
+
+async def rebuild_pdf_download_rollups(conn: asyncpg.Connection) -> int:
+    """
+    Recompute pdf_download_daily and pdf_download_totals from pdf_downloads
+
+    Only needed when leads are written without RECORD_PDF_DOWNLOAD_QUERY, e.g. by a restore.
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        Number of (day, pdf_link) rollup rows written
+    """
+    async with conn.transaction():
+        await conn.execute("LOCK TABLE pdf_download_daily, pdf_download_totals IN EXCLUSIVE MODE")
+        await conn.execute("DELETE FROM pdf_download_daily")
+        await conn.execute("DELETE FROM pdf_download_totals")
+        status = await conn.execute(
+            """
+            INSERT INTO pdf_download_daily (day, pdf_link, downloads)
+            SELECT timestamp::date, COALESCE(pdf_link, ''), COUNT(*)
+            FROM pdf_downloads
+            WHERE timestamp IS NOT NULL
+            GROUP BY 1, 2
+            """
+        )
+        await conn.execute(
+            """
+            INSERT INTO pdf_download_totals (pdf_link, downloads)
+            SELECT pdf_link, SUM(downloads) FROM pdf_download_daily GROUP BY pdf_link
+            """
+        )
+    return int(status.split()[-1])
+
+
+async def fetch_pdf_download_kpis(conn: asyncpg.Connection) -> Dict[str, Any]:
+    """
+    Read the dashboard KPIs from the rollups in one round trip
+
+    The month comes from at most a month of daily rows, the all-time figures from one row per PDF,
+    so the cost does not grow with the lead history.
+
+    Returns:
+        Dictionary with total_downloads_this_month, most_downloaded_pdf and total_downloads
+    """
+    record = await conn.fetchrow(
+        """
+        SELECT
+            (
+                SELECT COALESCE(SUM(downloads), 0)
+                FROM pdf_download_daily
+                WHERE day >= date_trunc('month', CURRENT_DATE)
+            ) AS total_downloads_this_month,
+            COALESCE(SUM(downloads), 0)::bigint AS total_downloads,
+            (
+                SELECT pdf_link
+                FROM pdf_download_totals
+                ORDER BY downloads DESC, pdf_link
+                LIMIT 1
+            ) AS most_downloaded_pdf
+        FROM pdf_download_totals
+        """
+    )
+    return {
+        "total_downloads_this_month": record['total_downloads_this_month'],
+        "most_downloaded_pdf": record['most_downloaded_pdf'] or "-",
+        "total_downloads": record['total_downloads'],
+    }
+
+
+async def fetch_pdf_download_range(conn: asyncpg.Connection, start: date, end: date, top: int) -> Dict[str, Any]:
+    """
+    Read download KPIs for a date range from the daily rollups
+
+    Args:
+        conn: Database connection
+        start: First day of the range, inclusive
+        end: Last day of the range, inclusive
+        top: Number of PDFs to return in top_pdfs
+
+    Returns:
+        Dictionary with the range total, the most downloaded PDF, a per-day series with
+        zero-filled gaps and the top PDFs by downloads
+    """
+    daily = await conn.fetch(
+        """
+        SELECT days.day::date AS day, COALESCE(SUM(rollup.downloads), 0) AS downloads
+        FROM generate_series($1::date, $2::date, INTERVAL '1 day') AS days(day)
+        LEFT JOIN pdf_download_daily AS rollup ON rollup.day = days.day::date
+        GROUP BY days.day
+        ORDER BY days.day
+        """,
+        start, end
+    )
+    top_pdfs = await conn.fetch(
+        """
+        SELECT pdf_link, SUM(downloads) AS downloads
+        FROM pdf_download_daily
+        WHERE day BETWEEN $1 AND $2
+        GROUP BY pdf_link
+        ORDER BY downloads DESC, pdf_link
+        LIMIT $3
+        """,
+        start, end, top
+    )
+    return {
+        "start": start,
+        "end": end,
+        "total_downloads": sum(record['downloads'] for record in daily),
+        "most_downloaded_pdf": top_pdfs[0]['pdf_link'] if top_pdfs else "-",
+        "daily": [dict(record) for record in daily],
+        "top_pdfs": [dict(record) for record in top_pdfs],
+    }
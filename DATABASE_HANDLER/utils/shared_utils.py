@@ -1,16 +1,15 @@
 from typing import Dict, Any, List, Optional, Union, Tuple, Callable
 import asyncpg
 import re
-import json
 from fastapi import HTTPException
+from DATABASE_HANDLER.connection_pool import db_pool
 
 
-async def execute_query(database_url: str, query: str, *args, fetch_one: bool = False, fetch_all: bool = True) -> Optional[Union[asyncpg.Record, List[asyncpg.Record]]]:
+async def execute_query(query: str, *args, fetch_one: bool = False, fetch_all: bool = True) -> Optional[Union[asyncpg.Record, List[asyncpg.Record]]]:
     """
-    Execute a database query with automatic connection handling
+    Execute a database query on a connection borrowed from the shared pool
     
     Args:
-        database_url: PostgreSQL connection URL
         query: SQL query string
         *args: Query parameters
         fetch_one: Return single row
@@ -19,20 +18,18 @@ async def execute_query(database_url: str, query: str, *args, fetch_one: bool =
     Returns:
         Query results or None
     """
-    conn = await asyncpg.connect(database_url)
     try:
-        if fetch_one:
-            result = await conn.fetchrow(query, *args)
-        elif fetch_all:
-            result = await conn.fetch(query, *args)
-        else:
-            await conn.execute(query, *args)
-            result = None
+        async with db_pool.connection() as conn:
+            if fetch_one:
+                result = await conn.fetchrow(query, *args)
+            elif fetch_all:
+                result = await conn.fetch(query, *args)
+            else:
+                await conn.execute(query, *args)
+                result = None
         return result
     except asyncpg.PostgresError as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-    finally:
-        await conn.close()
 
 
 def generate_slug(title: str) -> str:
@@ -128,10 +125,7 @@ def build_dynamic_update_query(table: str, data: Dict[str, Any], id_field: str =
     for key, value in data.items():
         if value is not None:
             update_fields.append(f"{key} = ${param_count}")
-            if isinstance(value, dict):
-                update_values.append(json.dumps(value))
-            else:
-                update_values.append(value)
+            update_values.append(value)
             param_count += 1
     
     if not update_fields:
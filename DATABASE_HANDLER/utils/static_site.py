@@ -0,0 +1,234 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import quote
+from config import config
+from DATABASE_HANDLER.utils.page_cache import page_cache, RenderedPage, BLOG_PAGES, CASE_STUDY_PAGES, HOME_PAGE, BLOGS_LANDING_PAGE, PORTFOLIO_PAGES
+
+
+SITEMAP = "sitemap"
+
+# Dependency state kept next to the pages so incremental regeneration can tell what a write changed
+STATE_FILE = ".state.json"
+
+
+def artifact_path(namespace: str, key: Hashable) -> str:
+    """
+    Get the file a pre-rendered page is stored in, relative to the output directory
+    The layout mirrors the public URLs so the directory can also be served by a plain web server
+
+    Args:
+        namespace: Page family, e.g. BLOG_PAGES
+        key: Page cache key within the namespace (slug, category or None)
+
+    Returns:
+        Relative file path
+    """
+    if namespace == HOME_PAGE:
+        return "index.html"
+    if namespace == BLOGS_LANDING_PAGE:
+        return "blogs.html"
+    if namespace == BLOG_PAGES:
+        return f"blog/{quote(key, safe='')}.html"
+    if namespace == CASE_STUDY_PAGES:
+        return f"case-study/{quote(key, safe='')}.html"
+    if namespace == PORTFOLIO_PAGES:
+        return "case-studies.html" if not key else f"case-studies/{quote(key, safe='')}.html"
+    if namespace == SITEMAP:
+        return "sitemap.xml"
+    raise ValueError(f"Unknown page namespace: {namespace}")
+
+
+class StaticSite:
+    """
+    Pages pre-rendered to disk by generate_static_site.py, served without touching the database
+
+    Each file is loaded into a RenderedPage (encoded and compressed) the first time it is served and
+    kept in memory until its mtime changes, so a hit costs one stat. A missing file is a miss and the
+    caller falls back to live rendering.
+    """
+
+    def __init__(self, directory: str, enabled: bool = False):
+        self.directory = directory
+        self.enabled = enabled
+        self._loaded: Dict[str, Tuple[int, RenderedPage]] = {}
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.regenerations = 0
+        self.artifacts_touched = 0
+
+    def path(self, namespace: str, key: Hashable) -> str:
+        return os.path.join(self.directory, artifact_path(namespace, key))
+
+    def generation(self, namespace: str) -> int:
+        """
+        Get the namespace's change counter; a build snapshots it before reading from the database
+        """
+        return self._generations.get(namespace, 0)
+
+    def mark_changed(self, namespace: str):
+        """
+        Record that a write changed the namespace, so a build that read the database earlier does not
+        overwrite its pages
+        """
+        self._generations[namespace] = self.generation(namespace) + 1
+
+    async def get(self, namespace: str, key: Hashable) -> Optional[RenderedPage]:
+        """
+        Look up a pre-rendered page
+
+        Args:
+            namespace: Page family, e.g. BLOG_PAGES
+            key: Identifier within the namespace
+
+        Returns:
+            The page, or None when it has not been pre-rendered
+        """
+        path = self.path(namespace, key)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._loaded.pop(path, None)
+            self.misses += 1
+            return None
+
+        loaded = self._loaded.get(path)
+        if loaded is None or loaded[0] != mtime:
+            page = await asyncio.to_thread(self._load, path, mtime)
+            if page is None:
+                self.misses += 1
+                return None
+            loaded = (mtime, page)
+            self._loaded[path] = loaded
+        self.hits += 1
+        return loaded[1]
+
+    def write(self, namespace: str, key: Hashable, html: str, generation: Optional[int] = None, only_if_changed: bool = False) -> bool:
+        """
+        Store a pre-rendered page, replacing the previous file atomically
+
+        Args:
+            namespace: Page family
+            key: Identifier within the namespace
+            html: Rendered page
+            generation: Namespace generation the page was rendered at; if the namespace has changed
+                since, the page may predate the write and is not stored
+            only_if_changed: Leave the file alone when it already holds this HTML
+
+        Returns:
+            True if the file was written
+        """
+        if generation is not None and generation != self.generation(namespace):
+            return False
+        path = self.path(namespace, key)
+        if only_if_changed:
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    if file.read() == html:
+                        return False
+            except FileNotFoundError:
+                pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(html)
+        os.replace(temp_path, path)
+        return True
+
+    def remove(self, namespace: str, key: Optional[Hashable] = None) -> int:
+        """
+        Delete pre-rendered pages so they are rendered live until the next build
+
+        Args:
+            namespace: Page family
+            key: Single page to delete; every page in the namespace is deleted when omitted
+
+        Returns:
+            Number of files removed
+        """
+        self.mark_changed(namespace)
+        if key is not None or namespace in (HOME_PAGE, BLOGS_LANDING_PAGE, SITEMAP):
+            paths = [self.path(namespace, key)]
+        else:
+            paths = []
+            if namespace == PORTFOLIO_PAGES:
+                paths.append(self.path(namespace, None))
+            directory = os.path.dirname(self.path(namespace, "_"))
+            if os.path.isdir(directory):
+                paths.extend(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".html"))
+
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            self._loaded.pop(path, None)
+        return removed
+
+    def read_state(self) -> Dict[str, Any]:
+        """
+        Load the dependency state written by the last build or regeneration; empty if there is none
+        """
+        try:
+            with open(os.path.join(self.directory, STATE_FILE), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def write_state(self, state: Dict[str, Any]):
+        """
+        Store the dependency state atomically
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, STATE_FILE)
+        with open(f"{path}.{os.getpid()}.tmp", "w", encoding="utf-8") as file:
+            json.dump(state, file, default=str)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "loaded": len(self._loaded),
+            "hits": self.hits,
+            "misses": self.misses,
+            "regenerations": self.regenerations,
+            "artifacts_touched": self.artifacts_touched
+        }
+
+    @staticmethod
+    def _load(path: str, mtime: int) -> Optional[RenderedPage]:
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                html = file.read()
+        except FileNotFoundError:
+            return None
+        return RenderedPage(html, datetime.fromtimestamp(mtime / 1e9, timezone.utc))
+
+
+static_site = StaticSite(config.STATIC_SITE_DIR, enabled=config.STATIC_SITE_SERVE)
+
+
+async def get_page(namespace: str, key: Hashable, render: Callable[[], Awaitable[str]]) -> RenderedPage:
+    """
+    Get a page from the pre-rendered site when serving from it, otherwise from the page cache
+
+    Args:
+        namespace: Page family, e.g. BLOG_PAGES
+        key: Identifier within the namespace
+        render: Live renderer used on a miss
+
+    Returns:
+        Rendered page
+    """
+    if static_site.enabled:
+        page = await static_site.get(namespace, key)
+        if page is not None:
+            return page
+    return await page_cache.get_or_render(namespace, key, render)
+
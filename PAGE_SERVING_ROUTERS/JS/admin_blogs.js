@@ -889,7 +889,8 @@ let currentPage = 1;
 let totalPages = 1;
 let searchTimeout = null;
 const blogsPerPage = 8;
-let allFetchedBlogs = [];
+// pageCursors[n] is the cursor that loads page n + 1; page 1 has none
+let pageCursors = [null];
 let blogTypeCounts = {};
 let blogTypeLimits = {};
 
@@ -905,22 +906,9 @@ async function fetchBlogs() {
     paginationControls.classList.add('hidden');
 
     try {
-        console.log('📡 Fetching blogs from /api/blogs?include_deleted=false...');
-        const response_blogs = await authenticatedFetch('/api/blogs?include_deleted=false');
-        const result_blogs = await response_blogs.json();
-
-        blogsLoading.classList.add('hidden');
-        
-        let blogs = [];
-        if (result_blogs.status === 'success' && Array.isArray(result_blogs.blogs)) {
-            blogs = result_blogs.blogs;
-        }
-
-        allFetchedBlogs = [...blogs];
-        console.log(`✓ Stored ${allFetchedBlogs.length} items in allFetchedBlogs array`);
-        
         await fetchBlogTypeCounts();
-        applyFiltersAndRender(1);
+        await applyFiltersAndRender(1);
+        blogsLoading.classList.add('hidden');
     } catch (error) {
         console.error('✗ Error fetching blogs:', error);
         blogsLoading.classList.add('hidden');
@@ -968,55 +956,65 @@ function updateBlogTypeCounters() {
     }
 }
 
-function applyFiltersAndRender(page = 1) {
+function buildBlogListUrl(cursor) {
     const filterTitleInput = document.getElementById('filterTitle');
-    const filterContentTypeInput = document.getElementById('filterContentType');
-    
-    const filterTitleValue = filterTitleInput ? filterTitleInput.value.trim().toLowerCase() : '';
-    const filterContentTypeValue = filterContentTypeInput ? filterContentTypeInput.value : 'ALL';
-
-    const filteredBlogs = allFetchedBlogs.filter(blog => {
-        if (!blog) return false;
+    const filterTitleValue = filterTitleInput ? filterTitleInput.value.trim() : '';
 
-        const title = (blog.blogContent.blogTitle || '').toLowerCase();
-        const type = blog.type || 'BLOG';
-
-        const titleMatch = !filterTitleValue || title.includes(filterTitleValue);
-        
-        let filterMatch = true;
-        if(editorsChoiceFilter) {
-            filterMatch = blog.type === 'EDITORS_CHOICE';
-        } else if (blogHeroFilter) {
-            filterMatch = blog.type === 'BLOG_HERO';
-        } else if (blogHomePageFilter) {
-            filterMatch = blog.type === 'BLOG_HOME_PAGE';
-        }
-
-        return titleMatch && filterMatch;
-    });
+    const params = new URLSearchParams({ limit: blogsPerPage });
+    if (filterTitleValue) {
+        params.set('q', filterTitleValue);
+    }
+    if (editorsChoiceFilter) {
+        params.set('type', 'EDITORS_CHOICE');
+    } else if (blogHeroFilter) {
+        params.set('type', 'BLOG_HERO');
+    } else if (blogHomePageFilter) {
+        params.set('type', 'BLOG_HOME_PAGE');
+    }
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    return `/api/blogs?${params.toString()}`;
+}
 
-    console.log(`✅ Filtered result: ${filteredBlogs.length} blogs from ${allFetchedBlogs.length} total`);
+async function applyFiltersAndRender(page = 1) {
+    if (page === 1) {
+        pageCursors = [null];
+    }
 
     const noBlogsFound = document.getElementById('noBlogsFound');
     const blogsList = document.getElementById('blogsList');
     const paginationControls = document.getElementById('paginationControls');
 
-    if (filteredBlogs.length > 0) {
+    let result = {};
+    try {
+        const url = buildBlogListUrl(pageCursors[page - 1]);
+        console.log(`📡 Fetching blogs from ${url}...`);
+        const response = await authenticatedFetch(url);
+        result = await response.json();
+    } catch (error) {
+        console.error('✗ Error fetching blogs:', error);
+        blogsList.innerHTML = `<div class="text-center py-8"><p class="text-white/60">Error loading blogs. Please try again later.</p></div>`;
+        return;
+    }
+
+    const blogs = result.status === 'success' && Array.isArray(result.blogs) ? result.blogs : [];
+    pageCursors[page] = result.next_cursor || null;
+
+    console.log(`✅ Loaded ${blogs.length} blogs of ${result.total || 0} matching`);
+
+    if (blogs.length > 0) {
         noBlogsFound.classList.add('hidden');
         blogsList.classList.remove('hidden');
 
-        totalPages = Math.ceil(filteredBlogs.length / blogsPerPage);
+        totalPages = Math.max(1, Math.ceil((result.total || 0) / blogsPerPage));
         currentPage = page;
-        const startIndex = (page - 1) * blogsPerPage;
-        const endIndex = startIndex + blogsPerPage;
-        const paginatedBlogs = filteredBlogs.slice(startIndex, endIndex);
 
         console.log(`📄 Pagination info:`);
         console.log(`  - Current page: ${currentPage} of ${totalPages}`);
-        console.log(`  - Showing blogs ${startIndex + 1}-${Math.min(endIndex, filteredBlogs.length)} of ${filteredBlogs.length}`);
-        console.log(`  - Displaying ${paginatedBlogs.length} blogs on this page`);
+        console.log(`  - Displaying ${blogs.length} blogs on this page`);
 
-        displayBlogs(paginatedBlogs);
+        displayBlogs(blogs);
 
         if (totalPages > 1) {
             updatePaginationControls();
@@ -1066,8 +1064,8 @@ function displayBlogs(blogs) {
         const title = blogData.blogTitle || blog.title || 'Untitled';
         const date = blogData.blogDate || blog.date || new Date().toISOString();
         const status = blog.status || 'draft';
-        const mainImageUrl = blogData.mainImageUrl || '';
-        const mainImageAlt = blogData.mainImageAlt || title;
+        const mainImageUrl = blogData.mainImageUrl || blog.cover_image || '';
+        const mainImageAlt = blogData.mainImageAlt || blog.cover_image_alt || title;
         const type = blog.type || 'BLOG';
         const slug = blog.slug || '';
         const editorsChoice = blog.editors_choice || 'N';
@@ -1175,7 +1173,17 @@ async function editBlog(blogId) {
         return;
     }
 
-    const blog = allFetchedBlogs.find(b => b.id === blogId);
+    let blog = null;
+    try {
+        const response = await authenticatedFetch(`/api/blogs/${encodeURIComponent(blogId)}`);
+        if (response.ok) {
+            const result = await response.json();
+            blog = result.blog;
+        }
+    } catch (error) {
+        console.error('✗ Error fetching blog:', error);
+    }
+
     if (blog) {
         console.log('✓ Found blog to edit:', blog);
         isEditing = true;
@@ -1198,7 +1206,7 @@ async function editBlog(blogId) {
         
         isEditing = false;
     } else {
-        showModal('Error', 'Blog not found in the list. Please refresh.', 'error');
+        showModal('Error', 'Blog not found. Please refresh.', 'error');
     }
 }
 
@@ -1719,7 +1727,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
     if (nextPage) {
         nextPage.addEventListener('click', () => {
-            if (currentPage < totalPages) {
+            if (currentPage < totalPages && pageCursors[currentPage]) {
                 applyFiltersAndRender(currentPage + 1);
             }
         });
@@ -1511,7 +1511,8 @@ let currentPage = 1;
 let totalPages = 1;
 let searchTimeout = null;
 const blogsPerPage = 8;
-let allFetchedBlogs = [];
+// pageCursors[n] is the cursor that loads page n + 1; page 1 has none
+let pageCursors = [null];
 
 async function fetchBlogs() {
     const blogsLoading = document.getElementById('blogsLoading');
@@ -1525,23 +1526,8 @@ async function fetchBlogs() {
     paginationControls.classList.add('hidden');
 
     try {
-        console.log('📡 Fetching case studies from /api/case-studies...');
-        const response_blogs = await fetch('/api/case-studies', {
-            credentials: 'include'
-        });
-        const result_blogs = await response_blogs.json();
-
+        await applyFiltersAndRender(1);
         blogsLoading.classList.add('hidden');
-        
-        let blogs = [];
-        if (result_blogs.status === 'success' && Array.isArray(result_blogs.case_studies)) {
-            blogs = result_blogs.case_studies;
-        }
-
-        allFetchedBlogs = [...blogs];
-        console.log(`✓ Stored ${allFetchedBlogs.length} items in allFetchedBlogs array`);
-        
-        applyFiltersAndRender(1);
     } catch (error) {
         console.error('✗ Error fetching case studies:', error);
         blogsLoading.classList.add('hidden');
@@ -1549,12 +1535,12 @@ async function fetchBlogs() {
     }
 }
 
-function applyFiltersAndRender(page = 1) {
+function buildCaseStudyListUrl(cursor) {
     const filterTitleInput = document.getElementById('filterTitle');
     const filterContentTypeInput = document.getElementById('filterContentType');
     const filterEditorsChoiceInput = document.getElementById('filterEditorsChoice');
-    
-    const filterTitleValue = filterTitleInput ? filterTitleInput.value.trim().toLowerCase() : '';
+
+    const filterTitleValue = filterTitleInput ? filterTitleInput.value.trim() : '';
     const filterContentTypeValue = filterContentTypeInput ? filterContentTypeInput.value : 'ALL';
     const filterEditorsChoiceValue = filterEditorsChoiceInput ? filterEditorsChoiceInput.checked : false;
 
@@ -1562,65 +1548,63 @@ function applyFiltersAndRender(page = 1) {
     console.log(`  - Title filter: "${filterTitleValue}" (${filterTitleValue ? 'ACTIVE' : 'INACTIVE'})`);
     console.log(`  - Type filter: "${filterContentTypeValue}"`);
     console.log(`  - Editor's Choice filter: ${filterEditorsChoiceValue ? 'ACTIVE' : 'INACTIVE'}`);
-    console.log(`  - Total blogs before filtering: ${allFetchedBlogs.length}`);
-
-    const filteredBlogs = allFetchedBlogs.filter(blog => {
-        if (!blog) {
-            console.warn('⚠️ Null blog encountered in filter');
-            return false;
-        }
-
-        let blogData = {};
-        try {
-            if (typeof blog.blog === 'string') {
-                blogData = JSON.parse(blog.blog);
-            } else if (typeof blog.blog === 'object' && blog.blog !== null) {
-                blogData = blog.blog;
-            }
-        } catch (e) {
-            console.error('Failed to parse blog.blog in filter:', e);
-            blogData = {};
-        }
-
-        const title = (blogData.blogTitle || blog.title || '').toLowerCase();
-        const type = blog.type || 'BLOG';
-        const editorsChoice = blog.editors_choice || 'N';
-
-        const titleMatch = !filterTitleValue || title.includes(filterTitleValue);
-        const typeMatch = filterContentTypeValue === 'ALL' || type === filterContentTypeValue;
-        const editorsChoiceMatch = !filterEditorsChoiceValue || editorsChoice === 'Y';
-
-        const matches = titleMatch && typeMatch && editorsChoiceMatch;
 
-        if (filterTitleValue || filterContentTypeValue !== 'ALL' || filterEditorsChoiceValue) {
-            console.log(`  Blog "${title}": titleMatch=${titleMatch}, typeMatch=${typeMatch}, editorsChoiceMatch=${editorsChoiceMatch}, result=${matches}`);
-        }
-
-        return matches;
-    });
+    const params = new URLSearchParams({ limit: blogsPerPage });
+    if (filterTitleValue) {
+        params.set('q', filterTitleValue);
+    }
+    if (filterContentTypeValue !== 'ALL') {
+        params.set('type', filterContentTypeValue);
+    }
+    if (filterEditorsChoiceValue) {
+        params.set('editors_choice', 'Y');
+    }
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    return `/api/case-studies?${params.toString()}`;
+}
 
-    console.log(`✅ Filtered result: ${filteredBlogs.length} blogs from ${allFetchedBlogs.length} total`);
+async function applyFiltersAndRender(page = 1) {
+    if (page === 1) {
+        pageCursors = [null];
+    }
 
     const noBlogsFound = document.getElementById('noBlogsFound');
     const blogsList = document.getElementById('blogsList');
     const paginationControls = document.getElementById('paginationControls');
 
-    if (filteredBlogs.length > 0) {
+    let result = {};
+    try {
+        const url = buildCaseStudyListUrl(pageCursors[page - 1]);
+        console.log(`📡 Fetching case studies from ${url}...`);
+        const response = await fetch(url, {
+            credentials: 'include'
+        });
+        result = await response.json();
+    } catch (error) {
+        console.error('✗ Error fetching case studies:', error);
+        blogsList.innerHTML = `<div class="text-center py-8"><p class="text-white/60">Error loading case studies. Please try again later.</p></div>`;
+        return;
+    }
+
+    const blogs = result.status === 'success' && Array.isArray(result.case_studies) ? result.case_studies : [];
+    pageCursors[page] = result.next_cursor || null;
+
+    console.log(`✅ Loaded ${blogs.length} case studies of ${result.total || 0} matching`);
+
+    if (blogs.length > 0) {
         noBlogsFound.classList.add('hidden');
         blogsList.classList.remove('hidden');
 
-        totalPages = Math.ceil(filteredBlogs.length / blogsPerPage);
+        totalPages = Math.max(1, Math.ceil((result.total || 0) / blogsPerPage));
         currentPage = page;
-        const startIndex = (page - 1) * blogsPerPage;
-        const endIndex = startIndex + blogsPerPage;
-        const paginatedBlogs = filteredBlogs.slice(startIndex, endIndex);
 
         console.log(`📄 Pagination info:`);
         console.log(`  - Current page: ${currentPage} of ${totalPages}`);
-        console.log(`  - Showing blogs ${startIndex + 1}-${Math.min(endIndex, filteredBlogs.length)} of ${filteredBlogs.length}`);
-        console.log(`  - Displaying ${paginatedBlogs.length} blogs on this page`);
+        console.log(`  - Displaying ${blogs.length} case studies on this page`);
 
-        displayBlogs(paginatedBlogs);
+        displayBlogs(blogs);
 
         if (totalPages > 1) {
             updatePaginationControls();
@@ -1827,7 +1811,17 @@ async function editBlog(blogId) {
         return;
     }
 
-    const blog = allFetchedBlogs.find(b => b.id === blogId);
+    let blog = null;
+    try {
+        const response = await authenticatedFetch(`/api/case-studies/${encodeURIComponent(blogId)}`);
+        if (response.ok) {
+            const result = await response.json();
+            blog = result.case_study;
+        }
+    } catch (error) {
+        console.error('✗ Error fetching case study:', error);
+    }
+
     if (blog) {
         console.log('✓ Found case study to edit:', blog);
         isEditing = true;
@@ -1850,7 +1844,7 @@ async function editBlog(blogId) {
         
         isEditing = false;
     } else {
-        showModal('Error', 'Case Study not found in the list. Please refresh.', 'error');
+        showModal('Error', 'Case Study not found. Please refresh.', 'error');
     }
 }
 
@@ -2447,7 +2441,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
     if (nextPage) {
         nextPage.addEventListener('click', () => {
-            if (currentPage < totalPages) {
+            if (currentPage < totalPages && pageCursors[currentPage]) {
                 applyFiltersAndRender(currentPage + 1);
             }
         });
@@ -2659,8 +2653,8 @@ document.addEventListener('DOMContentLoaded', function () {
                         successCount++;
                     } else {
                         errorCount++;
-                        errorMessages.push(result.message || `Failed to upload ${file.name}`);
-                        console.error(`Failed to upload ${file.name}:`, result.message);
+                        errorMessages.push(result.message || result.detail || `Failed to upload ${file.name}`);
+                        console.error(`Failed to upload ${file.name}:`, result.message || result.detail);
                     }
                 } catch (error) {
                     errorCount++;
@@ -1,4 +1,4 @@
-import { showLoading, verifyAuth, handleLogout } from './shared/auth-utils.js';
+import { showLoading, verifyAuth, handleLogout, authenticatedFetch } from './shared/auth-utils.js';
 
 (async function initAuth() {
     showLoading(true);
@@ -20,20 +20,29 @@ function initPage() {
     const monthlyDownloadsEl = document.getElementById('kpi-monthly-downloads');
     const mostDownloadedEl = document.getElementById('kpi-most-downloaded');
     const totalDownloadsEl = document.getElementById('kpi-total-downloads');
+    const exportCsvBtn = document.getElementById('export-csv-btn');
 
     let currentPage = 1;
     const rowsPerPage = 10;
+    // pageCursors[n] is the cursor that loads page n + 1; page 1 has none
+    let pageCursors = [null];
 
     async function fetchPdfDownloads(page = 1) {
         loadingOverlay.style.display = 'flex';
         try {
-            const response = await fetch(`/api/pdf-downloads?page=${page}&per_page=${rowsPerPage}`);
+            const params = new URLSearchParams({ page, per_page: rowsPerPage });
+            if (pageCursors[page - 1]) {
+                params.set('cursor', pageCursors[page - 1]);
+            }
+            const response = await fetch(`/api/pdf-downloads?${params}`);
             if (!response.ok) {
                 throw new Error('Failed to fetch PDF downloads');
             }
             const data = await response.json();
+            pageCursors[data.page] = data.next_cursor || null;
+            currentPage = data.page;
             renderTable(data.pdf_downloads);
-            updatePagination(data.page, data.total_pages);
+            updatePagination(data.page, data.total_pages, data.has_next);
         } catch (error) {
             console.error('Error fetching PDF downloads:', error);
             showToast('Failed to load data. Please try again.', 'error');
@@ -103,12 +112,12 @@ function initPage() {
         });
     }
 
-    function updatePagination(page, totalPages) {
+    function updatePagination(page, totalPages, hasNext) {
         currentPage = page;
         pageInfo.textContent = `Page ${page} of ${totalPages}`;
 
         prevPageBtn.disabled = page <= 1;
-        nextPageBtn.disabled = page >= totalPages;
+        nextPageBtn.disabled = !hasNext;
     }
 
     prevPageBtn.addEventListener('click', () => {
@@ -121,6 +130,27 @@ function initPage() {
         fetchPdfDownloads(currentPage + 1);
     });
 
+    exportCsvBtn.addEventListener('click', async () => {
+        exportCsvBtn.disabled = true;
+        try {
+            const response = await authenticatedFetch('/api/pdf-downloads/export?format=csv&gzip=true');
+            if (!response.ok) {
+                throw new Error('Failed to export PDF downloads');
+            }
+            const url = URL.createObjectURL(await response.blob());
+            const link = document.createElement('a');
+            link.href = url;
+            link.download = 'pdf_downloads.csv.gz';
+            link.click();
+            URL.revokeObjectURL(url);
+        } catch (error) {
+            console.error('Error exporting PDF downloads:', error);
+            showToast('Export failed. Please try again.', 'error');
+        } finally {
+            exportCsvBtn.disabled = false;
+        }
+    });
+
     function showToast(message, type = 'info') {
         const toast = document.getElementById('toast');
         toast.textContent = message;
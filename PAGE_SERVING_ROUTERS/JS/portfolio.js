@@ -2,6 +2,8 @@ let currentPage = 1;
 let totalPages = 1;
 const perPage = 4;
 let currentCategory = '';
+// pageCursors[n] is the cursor that loads page n + 1; pages without one are fetched by number
+let pageCursors = [null];
 
 const CATEGORY_DISPLAY_MAPPING = {
     "linkedin-branding": "LinkedIn Branding",
@@ -167,11 +169,15 @@ async function loadPage(page) {
         if (currentCategory) {
             url += `&category=${encodeURIComponent(currentCategory)}`;
         }
+        if (pageCursors[page - 1]) {
+            url += `&cursor=${encodeURIComponent(pageCursors[page - 1])}`;
+        }
         
         const response = await fetch(url);
         const data = await response.json();
         
         if (data.status === 'success') {
+            pageCursors[data.page] = data.next_cursor || null;
             currentPage = data.page;
             totalPages = data.total_pages;
             
@@ -232,6 +238,12 @@ document.addEventListener('DOMContentLoaded', function () {
         totalPagesElement.remove();
     }
     
+    const nextCursorElement = document.getElementById('nextCursor');
+    if (nextCursorElement) {
+        pageCursors[1] = nextCursorElement.textContent || null;
+        nextCursorElement.remove();
+    }
+    
     const currentCategoryElement = document.getElementById('currentCategory');
     if (currentCategoryElement) {
         currentCategory = currentCategoryElement.textContent || '';
@@ -1,17 +1,17 @@
-from fastapi import APIRouter, Path, Request, HTTPException, Depends, Query
-from fastapi.responses import HTMLResponse
-from typing import Union, Optional
+from fastapi import APIRouter, Path, Request, HTTPException
+from typing import Union
 from uuid import UUID
-import json
 import asyncpg
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-DATABASE_URL = os.getenv("POSTGRES_CONNECTION_URL")
+from DATABASE_HANDLER.connection_pool import db_pool
+from DATABASE_HANDLER.utils.page_cache import BLOG_PAGES
+from DATABASE_HANDLER.utils.static_site import get_page
+from DATABASE_HANDLER.utils.conditional_requests import page_response
+from PAGE_SERVING_ROUTERS.asset_manifest import rewrite_asset_urls
 
 router = APIRouter()
 
+RELATED_BLOG_CARDS_LIMIT = 10
+
 
 async def getHeader():
     return """
@@ -855,17 +855,16 @@ async def get_faq_section():
 async def get_cards(other_blogs: list):
     """
     Generate cards for other blogs.
+    Expects rows shaped like the output of fetch_related_blog_cards.
     """
     print(f"Generating cards for {len(other_blogs)} other blogs.")
 
     cards_html = []
-    for blog in other_blogs[:10]:
-        blog_content = json.loads(blog['blogcontent']) if isinstance(blog['blogcontent'], str) else blog['blogcontent']
-        
-        image_url = blog_content.get('mainImageUrl', 'https://picsum.photos/seed/default/800/400')
-        image_alt = blog_content.get('mainImageAlt', 'Blog Image')
-        title = blog_content.get('blogTitle', 'Untitled')
-        summary = blog_content.get('blogSummary', '')
+    for blog in other_blogs[:RELATED_BLOG_CARDS_LIMIT]:
+        image_url = blog['cover_image'] or 'https://picsum.photos/seed/default/800/400'
+        image_alt = blog['cover_image_alt'] or 'Blog Image'
+        title = blog['title'] or 'Untitled'
+        summary = blog['summary'] or ''
         author = "Suflex Media"
         date = blog['created_at'].strftime('%b %d, %Y') if blog['created_at'] else ''
 
@@ -2704,64 +2703,50 @@ async def create_blog_html(data: dict, other_blogs: list = []) -> str:
     html = html.replace("[[[title]]]", f"{blog_title} | Suflex Media Blog")
     html = html.replace("[[[meta_description]]]", meta_description)
 
-    return html
+    return rewrite_asset_urls(html)
 
 
-async def get_admin_user(request: Request) -> Optional[dict]:
-    hashed_email = request.cookies.get("hashed_email")
-    hashed_password = request.cookies.get("hashed_password")
-
-    if not hashed_email or not hashed_password:
-        return None
+async def fetch_related_blog_cards(conn: asyncpg.Connection, exclude_slug: str, limit: int = RELATED_BLOG_CARDS_LIMIT) -> list:
+    """
+    Fetch only the fields needed to render related-blog cards
 
-    try:
-        conn = await asyncpg.connect(DATABASE_URL)
-        user = await conn.fetchrow(
-            "SELECT * FROM admin_users WHERE email = $1 AND password = $2 AND active = TRUE",
-            hashed_email,
-            hashed_password
-        )
-        await conn.close()
-        return user
-    except Exception:
-        return None
+    Args:
+        conn: Database connection
+        exclude_slug: Slug of the blog being rendered, left out of the results
+        limit: Maximum number of cards to return
 
-@router.get("/blog/{slug}")
-async def get_blog(slug: str, preview: bool = Query(False), admin_user: Optional[dict] = Depends(get_admin_user)):
+    Returns:
+        Most recent non-deleted blogs as records with slug, created_at, title, summary, cover_image and cover_image_alt
     """
-    Render a blog post page by its slug
-    Fetches blog data from database and renders it as HTML
-    Admins can preview draft posts by adding `?preview=true` to the URL
+    return await conn.fetch(
+        """
+        SELECT slug, created_at, title, summary, cover_image, cover_image_alt
+        FROM blogs
+        WHERE isDeleted = FALSE AND slug IS DISTINCT FROM $1
+        ORDER BY created_at DESC
+        LIMIT $2
+        """,
+        exclude_slug,
+        limit
+    )
+
+
+async def render_blog_page(slug: str) -> str:
     """
-    print("=" * 80)
-    print(f"[DEBUG] Blog endpoint called with slug: {slug}")
-    print("=" * 80)
-    
-    try:
-        print(f"[DEBUG] Attempting to connect to database...")
-        conn = await asyncpg.connect(DATABASE_URL)
-        print(f"[DEBUG] Database connection established")
-        
-        print(f"[DEBUG] Querying for all blogs")
-        all_blogs = await conn.fetch(
+    Fetch a blog by slug and render its page
+    Runs on its own pooled connection so the page cache can call it from a background refresh
+    """
+    async with db_pool.connection() as conn:
+        print(f"[DEBUG] Querying blog by slug")
+        blog_record = await conn.fetchrow(
             """
-            SELECT id, blogContent, status, date, slug, isDeleted, created_at
+            SELECT id, blogContent, status, date, slug, isDeleted, created_at, updated_at
             FROM blogs
-            WHERE isDeleted = FALSE
-            ORDER BY created_at DESC
-            """
+            WHERE slug = $1 AND isDeleted = FALSE
+            LIMIT 1
+            """,
+            slug
         )
-        
-        await conn.close()
-        print(f"[DEBUG] Database connection closed")
-        
-        blog_record = None
-        other_blogs = []
-        for blog in all_blogs:
-            if blog['slug'] == slug:
-                blog_record = blog
-            else:
-                other_blogs.append(blog)
 
         if not blog_record:
             print(f"[DEBUG] Blog not found for slug: {slug}")
@@ -2769,36 +2754,56 @@ async def get_blog(slug: str, preview: bool = Query(False), admin_user: Optional
         
         print(f"[DEBUG] Blog found - Status: {blog_record['status']}")
         
-        blog_content_raw = blog_record.get('blogcontent')
-        blog_data = {}
-        if blog_content_raw:
-            if isinstance(blog_content_raw, str):
-                try:
-                    blog_data = json.loads(blog_content_raw)
-                except json.JSONDecodeError:
-                    print(f"[ERROR] Failed to decode blogContent for blog {slug}: {blog_content_raw}")
-            elif isinstance(blog_content_raw, dict):
-                blog_data = blog_content_raw
-            else:
-                print(f"[ERROR] blogContent has unexpected type {type(blog_content_raw)} for blog {slug}: {blog_content_raw}")
-        
-        # Process and enrich the current blog's data for rendering
-        blog_data['slug'] = blog_record['slug']
-        
-        # Use the 'date' column for the blog post date, fallback to 'created_at'
-        display_date = blog_record.get('date') or blog_record.get('created_at')
-        if display_date:
-            # Format the date for display in the hero section
-            blog_data['blogDate'] = display_date.strftime('%B %d, %Y')
+        other_blogs = await fetch_related_blog_cards(conn, slug)
+    
+    return await render_blog_record(blog_record, other_blogs)
 
-        print(f"[DEBUG] Rendering blog HTML...")
-        
-        html_content = await create_blog_html(blog_data, other_blogs)
-        html_content = html_content.replace('[[[title]]]', blog_data.get('blogTitle', 'Blog Post'))
-        print(f"[DEBUG] HTML generated successfully, length: {len(html_content)}")
-        print("=" * 80)
-        
-        return HTMLResponse(html_content)
+
+async def render_blog_record(blog_record, other_blogs: list) -> str:
+    """
+    Render a blog page from its row and the related-blog cards, without touching the database
+    Used by render_blog_page and by the static site generator, which fetches rows in bulk
+    """
+    slug = blog_record['slug']
+    blog_content_raw = blog_record.get('blogcontent')
+    blog_data = {}
+    if blog_content_raw:
+        if isinstance(blog_content_raw, dict):
+            blog_data = blog_content_raw
+        else:
+            print(f"[ERROR] blogContent has unexpected type {type(blog_content_raw)} for blog {slug}: {blog_content_raw}")
+    
+    # Process and enrich the current blog's data for rendering
+    blog_data['slug'] = blog_record['slug']
+    
+    # Use the 'date' column for the blog post date, fallback to 'created_at'
+    display_date = blog_record.get('date') or blog_record.get('created_at')
+    if display_date:
+        # Format the date for display in the hero section
+        blog_data['blogDate'] = display_date.strftime('%B %d, %Y')
+
+    print(f"[DEBUG] Rendering blog HTML...")
+    
+    html_content = await create_blog_html(blog_data, other_blogs)
+    html_content = html_content.replace('[[[title]]]', blog_data.get('blogTitle', 'Blog Post'))
+    print(f"[DEBUG] HTML generated successfully, length: {len(html_content)}")
+    return html_content
+
+
+@router.get("/blog/{slug}")
+async def get_blog(request: Request, slug: str):
+    """
+    Render a blog post page by its slug
+    Fetches blog data from database and renders it as HTML
+    Holds no connection of its own: render_blog_page borrows one on a cache miss
+    """
+    print("=" * 80)
+    print(f"[DEBUG] Blog endpoint called with slug: {slug}")
+    print("=" * 80)
+    
+    try:
+        page = await get_page(BLOG_PAGES, slug, lambda: render_blog_page(slug))
+        return page_response(request, page)
         
     except HTTPException:
         print(f"[DEBUG] HTTPException raised")
@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import HTMLResponse
 from typing import Dict, Any
 from DATABASE_HANDLER.auth import require_admin_with_redirect
+from PAGE_SERVING_ROUTERS.template_store import template_store
 
 router = APIRouter()
 
+template_store.register("admin_blogs", "PAGE_SERVING_ROUTERS/PAGES/admin_blogs.html")
+
 @router.get("/admin/blogs")
 async def get_admin_blogs_page(request: Request, current_user: Dict[str, Any] = Depends(require_admin_with_redirect)):
     """
     Serve the admin blogs management page
     """
-    return FileResponse("PAGE_SERVING_ROUTERS/PAGES/admin_blogs.html")
\ No newline at end of file
+    return HTMLResponse(content=template_store.render("admin_blogs"))
\ No newline at end of file
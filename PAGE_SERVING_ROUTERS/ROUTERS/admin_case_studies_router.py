@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import HTMLResponse
 from typing import Dict, Any
 from DATABASE_HANDLER.auth import require_admin_with_redirect
+from PAGE_SERVING_ROUTERS.template_store import template_store
 
 router = APIRouter()
 
+template_store.register("admin_case_studies", "PAGE_SERVING_ROUTERS/PAGES/admin_case_studies.html")
+
 @router.get("/admin/case-studies")
 async def get_admin_case_studies_page(request: Request, current_user: Dict[str, Any] = Depends(require_admin_with_redirect)):
     """
     Serve the admin case studies management page
     """
-    return FileResponse("PAGE_SERVING_ROUTERS/PAGES/admin_case_studies.html")
\ No newline at end of file
+    return HTMLResponse(content=template_store.render("admin_case_studies"))
\ No newline at end of file
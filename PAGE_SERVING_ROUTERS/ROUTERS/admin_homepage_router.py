@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import HTMLResponse
 from typing import Dict, Any
 from DATABASE_HANDLER.auth import require_admin_with_redirect
+from PAGE_SERVING_ROUTERS.template_store import template_store
 
 router = APIRouter()
 
+template_store.register("admin_homepage", "PAGE_SERVING_ROUTERS/PAGES/admin_homepage.html")
+
 @router.get("/admin")
 async def get_admin_homepage(request: Request, current_user: Dict[str, Any] = Depends(require_admin_with_redirect)):
-    return FileResponse("PAGE_SERVING_ROUTERS/PAGES/admin_homepage.html")
\ No newline at end of file
+    return HTMLResponse(content=template_store.render("admin_homepage"))
\ No newline at end of file
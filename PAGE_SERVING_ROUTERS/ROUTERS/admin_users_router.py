@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import HTMLResponse
 from typing import Dict, Any
 from DATABASE_HANDLER.auth import require_admin_with_redirect
+from PAGE_SERVING_ROUTERS.template_store import template_store
 
 router = APIRouter()
 
+template_store.register("admin_users", "PAGE_SERVING_ROUTERS/PAGES/admin_users.html")
+
 @router.get("/admin/users")
 async def get_admin_users_page(request: Request, current_user: Dict[str, Any] = Depends(require_admin_with_redirect)):
     """
     Serve the admin users management page
     """
-    return FileResponse("PAGE_SERVING_ROUTERS/PAGES/admin_users.html")
\ No newline at end of file
+    return HTMLResponse(content=template_store.render("admin_users"))
\ No newline at end of file
@@ -1,21 +1,34 @@
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
-import os
-import re
 from dotenv import load_dotenv
+from DATABASE_HANDLER.connection_pool import db_pool
 from DATABASE_HANDLER.utils import get_blogs_html
+from DATABASE_HANDLER.utils.page_cache import BLOGS_LANDING_PAGE
+from DATABASE_HANDLER.utils.static_site import get_page
+from DATABASE_HANDLER.utils.conditional_requests import page_response
+from PAGE_SERVING_ROUTERS.template_store import template_store
 
 load_dotenv()
 
 router = APIRouter()
 
-@router.get("/blogs", response_class=HTMLResponse)
-async def get_blogs(request: Request):
-    editors_choice_html, latest_gossips_html, read_more_html, top_blog, editors_choice_mobile_html, _ = await get_blogs_html()
+template_store.register(
+    "blogs_landing",
+    "PAGE_SERVING_ROUTERS/PAGES/blogs_landing.html",
+    patterns={
+        r'\s*<section class="hero-section">.*?</section>': "hero_section",
+        r'<div class="editors-choice-right" id="editors-choice-grid">(?P<slot>.*?)</div>': "editors_choice",
+        r'<div class="blogs-grid" id="latest-gossip-grid">(?P<slot>)</div>': "latest_gossip",
+        r'<div class="blogs-grid" id="read-more-grid">(?P<slot>)</div>': "read_more",
+        r'<div class="blogs-grid" id="mobile-editors-choice-grid">(?P<slot>)</div>': "mobile_editors_choice",
+    }
+)
 
-    with open("PAGE_SERVING_ROUTERS/PAGES/blogs_landing.html", "r", encoding="utf-8") as file:
-        html_content = file.read()
+async def render_blogs_landing_page() -> str:
+    async with db_pool.connection() as conn:
+        editors_choice_html, latest_gossips_html, read_more_html, top_blog, editors_choice_mobile_html, _ = await get_blogs_html(conn)
 
+    dynamic_hero_section = None
     if top_blog:
         dynamic_hero_section = f"""<section class="hero-section">
             <div class="hero-image-container">
@@ -31,31 +44,18 @@ async def get_blogs(request: Request):
                 <a href="/blog/{top_blog.get('slug', '#')}" class="hero-read-more">Read More &rarr;</a>
             </div>
         </section>"""
-        html_content = re.sub(
-            r'\s*<section class="hero-section">.*?</section>',
-            dynamic_hero_section,
-            html_content,
-            count=1,
-            flags=re.DOTALL
-        )
-
-    html_content = re.sub(
-        r'(<div class="editors-choice-right" id="editors-choice-grid">)(.*?)(</div>)',
-        f'\\1{editors_choice_html}\\3',
-        html_content,
-        flags=re.DOTALL
-    )
-    html_content = html_content.replace(
-        '<div class="blogs-grid" id="latest-gossip-grid"></div>',
-        f'<div class="blogs-grid" id="latest-gossip-grid">{latest_gossips_html}</div>'
-    )
-    html_content = html_content.replace(
-        '<div class="blogs-grid" id="read-more-grid"></div>',
-        f'<div class="blogs-grid" id="read-more-grid">{read_more_html}</div>'
-    )
-    html_content = html_content.replace(
-        '<div class="blogs-grid" id="mobile-editors-choice-grid"></div>',
-        f'<div class="blogs-grid" id="mobile-editors-choice-grid">{editors_choice_mobile_html}</div>'
+
+    return template_store.render(
+        "blogs_landing",
+        hero_section=dynamic_hero_section,
+        editors_choice=editors_choice_html,
+        latest_gossip=latest_gossips_html,
+        read_more=read_more_html,
+        mobile_editors_choice=editors_choice_mobile_html
     )
 
-    return HTMLResponse(content=html_content)
\ No newline at end of file
+
+@router.get("/blogs", response_class=HTMLResponse)
+async def get_blogs(request: Request):
+    page = await get_page(BLOGS_LANDING_PAGE, "/blogs", render_blogs_landing_page)
+    return page_response(request, page)
\ No newline at end of file
@@ -1,20 +1,22 @@
 import asyncpg
-import json
-import os
 import re
 from datetime import datetime
 import httpx
 from fastapi.responses import StreamingResponse
 from typing import Optional, Dict, Any
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from dotenv import load_dotenv
 import sys
+from DATABASE_HANDLER.connection_pool import db_pool
+from DATABASE_HANDLER.utils.page_cache import CASE_STUDY_PAGES
+from DATABASE_HANDLER.utils.static_site import get_page
+from DATABASE_HANDLER.utils.conditional_requests import page_response
+from PAGE_SERVING_ROUTERS.asset_manifest import rewrite_asset_urls
 
 load_dotenv()
 
 router = APIRouter()
-DATABASE_URL = os.getenv("POSTGRES_CONNECTION_URL")
 
 MAGAZINE_IFRAME_CONTENT = """<!DOCTYPE html>
 <html lang="en">
@@ -1577,16 +1579,6 @@ def strip_html_tags(html_content: str) -> str:
     return clean_text.strip()
 
 
-def parse_blog_json(blog_json_str: str) -> Dict[str, Any]:
-    """
-    Parse the blog JSON string into a dictionary
-    """
-    try:
-        return json.loads(blog_json_str)
-    except (json.JSONDecodeError, TypeError):
-        return {}
-
-
 def format_date(date_str: str) -> tuple[str, str]:
     """
     Format date string to human-readable format and ISO format
@@ -2038,14 +2030,12 @@ def assemble_case_study_html(case_study_data: Dict[str, Any]) -> str:
     """
     Main orchestrator function that assembles all HTML sections into complete page
     """
-    blog_json_str = case_study_data.get('blog', '{}')
-    blog_data = parse_blog_json(blog_json_str)
+    blog_data = case_study_data.get('blog') or {}
     case_study_date = case_study_data.get('date', '')
     pdf_url = case_study_data.get('pdf_url')
     category = case_study_data.get('category', '')
     
-    preview_json_str = case_study_data.get('preview', '{}')
-    preview_data = parse_blog_json(preview_json_str)
+    preview_data = case_study_data.get('preview') or {}
     
     html_parts = [
         generate_head_section(blog_data, case_study_date),
@@ -2061,16 +2051,31 @@ def assemble_case_study_html(case_study_data: Dict[str, Any]) -> str:
         generate_footer_section(blog_data)
     ]
     
-    return ''.join(html_parts)
+    return rewrite_asset_urls(''.join(html_parts))
+
+
+async def render_case_study_page(slug: str) -> str:
+    """
+    Fetch a published case study by slug and assemble its page
+    Runs on its own pooled connection so the page cache can call it from a background refresh
+    """
+    async with db_pool.connection() as conn:
+        case_study_data = await fetch_case_study(conn, slug, by_slug=True)
+    
+    if not case_study_data:
+        raise HTTPException(status_code=404, detail="Case study not found")
+    
+    if case_study_data.get('status') != 'published':
+        raise HTTPException(status_code=404, detail="Case study not available")
+    
+    return assemble_case_study_html(case_study_data)
 
 
-async def fetch_case_study(identifier: str, by_slug: bool = True) -> Optional[Dict[str, Any]]:
+async def fetch_case_study(conn: asyncpg.Connection, identifier: str, by_slug: bool = True) -> Optional[Dict[str, Any]]:
     """
     Fetch case study from database by ID or slug
     """
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
-        
         if by_slug:
             query = """
                 SELECT id, slug, case_study, status, type, date, keyword, preview, category,
@@ -2089,26 +2094,9 @@ async def fetch_case_study(identifier: str, by_slug: bool = True) -> Optional[Di
             """
         
         case_study = await conn.fetchrow(query, identifier)
-        await conn.close()
         
         if case_study:
-            return {
-                "id": str(case_study['id']),
-                "slug": case_study['slug'],
-                "blog": case_study['case_study'],
-                "status": case_study['status'],
-                "type": case_study['type'],
-                "date": case_study['date'].isoformat() if case_study['date'] else None,
-                "keyword": case_study['keyword'],
-                "category": case_study['category'],
-                "preview": case_study['preview'],
-                "editors_choice": case_study['editors_choice'],
-                "redirect_url": case_study['redirect_url'],
-                "pdf_url": case_study['pdf_url'],
-                "isdeleted": case_study['isdeleted'],
-                "created_at": case_study['created_at'].isoformat() if case_study['created_at'] else None,
-                "updated_at": case_study['updated_at'].isoformat() if case_study['updated_at'] else None
-            }
+            return case_study_from_record(case_study)
         
         return None
         
@@ -2118,29 +2106,46 @@ async def fetch_case_study(identifier: str, by_slug: bool = True) -> Optional[Di
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
+def case_study_from_record(case_study) -> Dict[str, Any]:
+    """
+    Convert a case_studies row into the dictionary assemble_case_study_html expects
+    """
+    return {
+        "id": str(case_study['id']),
+        "slug": case_study['slug'],
+        "blog": case_study['case_study'],
+        "status": case_study['status'],
+        "type": case_study['type'],
+        "date": case_study['date'].isoformat() if case_study['date'] else None,
+        "keyword": case_study['keyword'],
+        "category": case_study['category'],
+        "preview": case_study['preview'],
+        "editors_choice": case_study['editors_choice'],
+        "redirect_url": case_study['redirect_url'],
+        "pdf_url": case_study['pdf_url'],
+        "isdeleted": case_study['isdeleted'],
+        "created_at": case_study['created_at'].isoformat() if case_study['created_at'] else None,
+        "updated_at": case_study['updated_at'].isoformat() if case_study['updated_at'] else None
+    }
+
+
 @router.get("/case-study/{slug}", response_class=HTMLResponse)
-async def get_case_study_by_slug(slug: str):
+async def get_case_study_by_slug(request: Request, slug: str):
     """
     FastAPI route handler to serve case study by slug
     """
-    case_study_data = await fetch_case_study(slug, by_slug=True)
-    
-    if not case_study_data:
-        raise HTTPException(status_code=404, detail="Case study not found")
-    
-    if case_study_data.get('status') != 'published':
-        raise HTTPException(status_code=404, detail="Case study not available")
-    
-    html_content = assemble_case_study_html(case_study_data)
-    return HTMLResponse(content=html_content, status_code=200)
+    page = await get_page(CASE_STUDY_PAGES, slug, lambda: render_case_study_page(slug))
+    return page_response(request, page)
 
 
 @router.get("/case-study/id/{case_study_id}", response_class=HTMLResponse)
-async def get_case_study_by_id(case_study_id: str):
+async def get_case_study_by_id(request: Request, case_study_id: str):
     """
     FastAPI route handler to serve case study by ID
+    The connection is released before get_page, whose renderer borrows one of its own on a miss
     """
-    case_study_data = await fetch_case_study(case_study_id, by_slug=False)
+    async with db_pool.connection() as conn:
+        case_study_data = await fetch_case_study(conn, case_study_id, by_slug=False)
     
     if not case_study_data:
         raise HTTPException(status_code=404, detail="Case study not found")
@@ -2148,8 +2153,9 @@ async def get_case_study_by_id(case_study_id: str):
     if case_study_data.get('status') != 'published':
         raise HTTPException(status_code=404, detail="Case study not available")
     
-    html_content = assemble_case_study_html(case_study_data)
-    return HTMLResponse(content=html_content, status_code=200)
+    slug = case_study_data['slug']
+    page = await get_page(CASE_STUDY_PAGES, slug, lambda: render_case_study_page(slug))
+    return page_response(request, page)
 
 @router.get("/download_proxy")
 async def download_proxy(pdf: str, filename: str = "document.pdf"):
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import HTMLResponse
+from PAGE_SERVING_ROUTERS.template_store import template_store
 
 router = APIRouter()
 
+template_store.register("404", "PAGE_SERVING_ROUTERS/PAGES/404.html")
+
 @router.get("/404")
 async def get_404():
-    return FileResponse("PAGE_SERVING_ROUTERS/PAGES/404.html")
\ No newline at end of file
+    return HTMLResponse(content=template_store.render("404"))
\ No newline at end of file
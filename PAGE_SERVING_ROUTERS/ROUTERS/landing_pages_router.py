@@ -2,21 +2,32 @@ from fastapi import APIRouter
 from fastapi.responses import HTMLResponse
 from dotenv import load_dotenv
 import os
+from PAGE_SERVING_ROUTERS.template_store import template_store
     
 load_dotenv(override=True)
 
 router = APIRouter(prefix="/lp", tags=["Landing Pages"])
 
+template_store.register(
+    "linkedin_v1",
+    "PAGE_SERVING_ROUTERS/PAGES/linkedin_v1.html",
+    markers={"[[[linkedin_v1_url]]]": "linkedin_v1_url"},
+    constants={"linkedin_v1_url": os.getenv("LINKEDIN_V1_URL", "https://calendly.com/suflex-media/linkedin-strategy-call")}
+)
+
+template_store.register(
+    "book_v1",
+    "PAGE_SERVING_ROUTERS/PAGES/book_v1.html",
+    markers={"[[[book_v1_url]]]": "book_v1_url"},
+    constants={"book_v1_url": os.getenv("BOOK_V1_URL", "https://calendly.com/sahil-suflexmedia/30min")}
+)
+
 
 @router.get("/linkedin-v1")
 async def get_linkedin_v1_page():
-    data = open("PAGE_SERVING_ROUTERS/PAGES/linkedin_v1.html", "r", encoding="utf-8").read()
-    data = data.replace("[[[linkedin_v1_url]]]", os.getenv("LINKEDIN_V1_URL", "https://calendly.com/suflex-media/linkedin-strategy-call"))
-    return HTMLResponse(content=data)
+    return HTMLResponse(content=template_store.render("linkedin_v1"))
 
 
 @router.get("/book-v1")
 async def get_book_v1_page():
-    data = open("PAGE_SERVING_ROUTERS/PAGES/book_v1.html", "r", encoding="utf-8").read()
-    data = data.replace("[[[book_v1_url]]]", os.getenv("BOOK_V1_URL", "https://calendly.com/sahil-suflexmedia/30min"))
-    return HTMLResponse(content=data)
+    return HTMLResponse(content=template_store.render("book_v1"))
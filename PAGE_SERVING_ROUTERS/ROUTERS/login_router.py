@@ -1,8 +1,11 @@
 from fastapi import APIRouter
-from fastapi.responses import FileResponse
+from fastapi.responses import HTMLResponse
+from PAGE_SERVING_ROUTERS.template_store import template_store
 
 router = APIRouter()
 
+template_store.register("login", "PAGE_SERVING_ROUTERS/PAGES/login.html")
+
 @router.get("/login")
 async def get_login():
-    return FileResponse("PAGE_SERVING_ROUTERS/PAGES/login.html")
\ No newline at end of file
+    return HTMLResponse(content=template_store.render("login"))
\ No newline at end of file
@@ -5,6 +5,10 @@ SEO Router - Serves robots.txt and sitemap.xml for search engine optimization.
 from fastapi import APIRouter
 from fastapi.responses import PlainTextResponse, Response
 from datetime import datetime
+from xml.sax.saxutils import escape
+
+from DATABASE_HANDLER.connection_pool import db_pool
+from DATABASE_HANDLER.utils.static_site import get_page, SITEMAP
 
 router = APIRouter()
 
@@ -46,11 +50,10 @@ Sitemap: https://suflexmedia.com/sitemap.xml
     return PlainTextResponse(content=robots_content, media_type="text/plain")
 
 
-@router.get("/sitemap.xml")
-async def serve_sitemap_xml():
+async def render_sitemap() -> str:
     """
-    Dynamically generate sitemap.xml with all public pages.
-    Includes static pages, service pages, and should eventually include blog posts.
+    Build sitemap.xml with all public pages, published blog posts and published case studies
+    Runs on its own pooled connection so the static site generator can pre-render it
     """
     base_url = "https://suflexmedia.com"
     current_date = datetime.now().strftime("%Y-%m-%d")
@@ -78,18 +81,49 @@ async def serve_sitemap_xml():
         {"loc": "/privacy-policy", "priority": "0.3", "changefreq": "yearly"},
     ]
     
+    async with db_pool.connection() as conn:
+        blogs = await conn.fetch(
+            """
+            SELECT slug, updated_at FROM blogs
+            WHERE isdeleted = FALSE AND status = 'published' AND slug IS NOT NULL
+            ORDER BY created_at DESC
+            """
+        )
+        case_studies = await conn.fetch(
+            """
+            SELECT slug, updated_at FROM case_studies
+            WHERE isdeleted = FALSE AND status = 'published' AND slug IS NOT NULL
+            ORDER BY date DESC
+            """
+        )
+    
+    for blog in blogs:
+        pages.append({"loc": f"/blog/{blog['slug']}", "priority": "0.6", "changefreq": "monthly", "lastmod": blog['updated_at']})
+    for case_study in case_studies:
+        pages.append({"loc": f"/case-study/{case_study['slug']}", "priority": "0.6", "changefreq": "monthly", "lastmod": case_study['updated_at']})
+    
     # Build XML sitemap
     xml_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
     xml_content += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
     
     for page in pages:
+        lastmod = page['lastmod'].strftime("%Y-%m-%d") if page.get('lastmod') else current_date
         xml_content += "  <url>\n"
-        xml_content += f"    <loc>{base_url}{page['loc']}</loc>\n"
-        xml_content += f"    <lastmod>{current_date}</lastmod>\n"
+        xml_content += f"    <loc>{base_url}{escape(page['loc'])}</loc>\n"
+        xml_content += f"    <lastmod>{lastmod}</lastmod>\n"
         xml_content += f"    <changefreq>{page['changefreq']}</changefreq>\n"
         xml_content += f"    <priority>{page['priority']}</priority>\n"
         xml_content += "  </url>\n"
     
     xml_content += "</urlset>"
     
-    return Response(content=xml_content, media_type="application/xml")
+    return xml_content
+
+
+@router.get("/sitemap.xml")
+async def serve_sitemap_xml():
+    """
+    Serve sitemap.xml, from the pre-rendered site when available, otherwise from the page cache
+    """
+    page = await get_page(SITEMAP, None, render_sitemap)
+    return Response(content=page.body, media_type="application/xml")
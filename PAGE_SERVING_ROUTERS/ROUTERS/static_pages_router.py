@@ -1,16 +1,19 @@
-from fastapi import APIRouter, Query
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import HTMLResponse
 from typing import Dict, Optional
-import asyncpg
+import asyncio
 import os
-import json
 
-from DATABASE_HANDLER.utils.generate_blog_sections import get_blogs_html, get_home_insights_html
-from DATABASE_HANDLER.utils.generate_case_study_sections import generate_case_studies_html, get_case_study_for_home, generate_home_case_study_html
+from DATABASE_HANDLER.connection_pool import db_pool
+from DATABASE_HANDLER.utils.generate_blog_sections import get_home_blog_data, get_home_insights_html
+from DATABASE_HANDLER.utils.page_cache import HOME_PAGE, PORTFOLIO_PAGES
+from DATABASE_HANDLER.utils.static_site import get_page
+from DATABASE_HANDLER.utils.conditional_requests import page_response
+from DATABASE_HANDLER.utils.generate_case_study_sections import generate_case_studies_html, get_case_study_for_home, generate_home_case_study_html, fetch_portfolio_page
+from PAGE_SERVING_ROUTERS.template_store import template_store
 from config import config
 
 router = APIRouter()
-DATABASE_URL = os.getenv("POSTGRES_CONNECTION_URL")
 
 STATIC_PAGES: Dict[str, str] = {
     "/about": "PAGE_SERVING_ROUTERS/PAGES/about_us.html",
@@ -24,16 +27,19 @@ STATIC_PAGES: Dict[str, str] = {
 def create_page_route(route_path: str, html_file: str):
     """
     Factory function to create a static page route handler
+    The page goes through the template store so its asset URLs are rewritten to the fingerprinted copies
     
     Args:
         route_path: The URL path for the route
         html_file: The file path to the HTML file to serve
         
     Returns:
-        Async function that returns FileResponse
+        Async function that returns HTMLResponse
     """
+    template_store.register(route_path, html_file)
+
     async def page_handler():
-        return FileResponse(html_file)
+        return HTMLResponse(content=template_store.render(route_path))
     return page_handler
 
 
@@ -53,163 +59,125 @@ CATEGORY_MAPPING = {
     "website-development": "Website Development",
 }
 
+template_store.register(
+    "portfolio",
+    "PAGE_SERVING_ROUTERS/PAGES/portfolio.html",
+    markers={
+        '<!-- CASE STUDIES WILL BE INSERTED HERE DYNAMICALLY -->': "case_studies",
+        '<!-- PAGINATION WILL BE GENERATED DYNAMICALLY -->': "pagination",
+        '<!-- CATEGORY FILTER WILL BE INSERTED HERE -->': "category_filter",
+    }
+)
+
+template_store.register(
+    "home",
+    "PAGE_SERVING_ROUTERS/PAGES/home.html",
+    markers={
+        '<!-- TOP EDITOR\'S CHOICE BLOGS WILL BE INSERTED HERE DYNAMICALLY -->': "editors_choice",
+        '<!-- CASE STUDY TITLE WILL BE INSERTED HERE DYNAMICALLY -->': "case_study_title",
+        '<!-- CASE STUDY SUMMARY WILL BE INSERTED HERE DYNAMICALLY -->': "case_study_summary",
+        '<!-- READ MORE BUTTON WILL BE INSERTED HERE DYNAMICALLY -->': "read_more_button",
+        '[[[imageURL]]]': "image_url",
+        '[[[base_calendly_url]]]': "base_calendly_url",
+    },
+    constants={
+        "base_calendly_url": os.getenv("BASE_CALENDLY_URL", "https://calendly.com/suflex-media/discovery-call?hide_gdpr_banner=1"),
+    }
+)
+
+async def render_portfolio_page(category: Optional[str]) -> str:
+    """
+    Render the portfolio page with the first page of published case studies
+    Runs on its own pooled connection so the page cache can call it from a background refresh
+    """
+    per_page = 4
+    
+    mapped_category = CATEGORY_MAPPING.get(category) if category else None
+    
+    async with db_pool.connection() as conn:
+        case_studies, total_count, next_cursor = await fetch_portfolio_page(conn, mapped_category, per_page)
+        
+    case_studies_list = [
+        {**dict(record), 'category': record['category'] if record['category'] else ''}
+        for record in case_studies
+    ]
+    
+    case_studies_html = generate_case_studies_html(case_studies_list)
+    
+    total_pages = (total_count + per_page - 1) // per_page
+    
+    category_value = category if category else ''
+    return template_store.render(
+        "portfolio",
+        case_studies=case_studies_html,
+        pagination=(
+            f'<span style="display:none" id="totalPages">{total_pages}</span>'
+            f'<span style="display:none" id="nextCursor">{next_cursor or ""}</span>'
+        ),
+        category_filter=f'<span style="display:none" id="currentCategory">{category_value}</span>'
+    )
+
+
 @router.get("/case-studies", response_class=HTMLResponse)
-async def get_portfolio_page(category: Optional[str] = Query(None, description="Filter case studies by category")):
+async def get_portfolio_page(request: Request, category: Optional[str] = Query(None, description="Filter case studies by category")):
     """
     Serve portfolio page with dynamically fetched case studies
-    Optionally filters by category when provided
+    Optionally filters by category when provided; unknown categories get the unfiltered page,
+    so arbitrary ?category= values cannot fill the page cache
     """
+    category = category if CATEGORY_MAPPING.get(category) else None
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
-        
-        per_page = 4
-        
-        mapped_category = CATEGORY_MAPPING.get(category) if category else None
-        
-        if mapped_category:
-            query = """
-                SELECT slug, preview, category
-                FROM case_studies
-                WHERE isdeleted = FALSE
-                    AND status = 'published'
-                    AND type = 'CASE STUDY'
-                    AND LOWER(category) = LOWER($2)
-                ORDER BY
-                    CASE WHEN editors_choice = 'Y' THEN 0 ELSE 1 END,
-                    date DESC
-                LIMIT $1
-            """
-            case_studies = await conn.fetch(query, per_page, mapped_category)
-            
-            count_query = """
-                SELECT COUNT(*)
-                FROM case_studies
-                WHERE isdeleted = FALSE
-                    AND status = 'published'
-                    AND type = 'CASE STUDY'
-                    AND LOWER(category) = LOWER($1)
-            """
-            total_count = await conn.fetchval(count_query, mapped_category)
-        else:
-            query = """
-                SELECT slug, preview, category
-                FROM case_studies
-                WHERE isdeleted = FALSE
-                    AND status = 'published'
-                    AND type = 'CASE STUDY'
-                ORDER BY
-                    CASE WHEN editors_choice = 'Y' THEN 0 ELSE 1 END,
-                    date DESC
-                LIMIT $1
-            """
-            case_studies = await conn.fetch(query, per_page)
-            
-            count_query = """
-                SELECT COUNT(*)
-                FROM case_studies
-                WHERE isdeleted = FALSE
-                    AND status = 'published'
-                    AND type = 'CASE STUDY'
-            """
-            total_count = await conn.fetchval(count_query)
-        
-        await conn.close()
-        
-        case_studies_list = []
-        for record in case_studies:
-            preview = record['preview']
-            if isinstance(preview, str):
-                try:
-                    preview = json.loads(preview)
-                except:
-                    preview = {}
-            
-            case_studies_list.append({
-                'slug': record['slug'],
-                'preview': preview,
-                'category': record['category'] if record['category'] else ''
-            })
-        
-        case_studies_html = generate_case_studies_html(case_studies_list)
-        
-        total_pages = (total_count + per_page - 1) // per_page
-        
-        with open("PAGE_SERVING_ROUTERS/PAGES/portfolio.html", "r", encoding="utf-8") as file:
-            html_content = file.read()
-        
-        html_content = html_content.replace(
-            '<!-- CASE STUDIES WILL BE INSERTED HERE DYNAMICALLY -->',
-            case_studies_html
-        )
-        
-        html_content = html_content.replace(
-            '<!-- PAGINATION WILL BE GENERATED DYNAMICALLY -->',
-            f'<span style="display:none" id="totalPages">{total_pages}</span>'
-        )
-        
-        category_value = category if category else ''
-        html_content = html_content.replace(
-            '<!-- CATEGORY FILTER WILL BE INSERTED HERE -->',
-            f'<span style="display:none" id="currentCategory">{category_value}</span>'
-        )
-        
-        return HTMLResponse(content=html_content)
-        
+        page = await get_page(PORTFOLIO_PAGES, category, lambda: render_portfolio_page(category))
+        return page_response(request, page)
     except Exception as e:
         print(f"Error loading portfolio page: {e}")
-        return FileResponse("PAGE_SERVING_ROUTERS/PAGES/portfolio.html")
+        return HTMLResponse(content=template_store.render("portfolio"))
 
-@router.get("/", response_class=HTMLResponse)
-async def get_homepage():
-    conn = None
-    try:
-        conn = await asyncpg.connect(DATABASE_URL)
-        _, _, _, _, _, blog_home_data = await get_blogs_html()
-        home_insights_html = await get_home_insights_html(blog_home_data)
+async def fetch_home_page_data():
+    """
+    Fetch the home page blogs and featured case study concurrently, each on its own pooled connection
+    
+    Returns:
+        Tuple of (home page blog cards, featured case study record or None)
+    """
+    async def home_blogs():
+        async with db_pool.connection() as conn:
+            return await get_home_blog_data(conn)
 
-        latest_case_study = await get_case_study_for_home(conn)
-        case_study_title_html, case_study_summary_html, read_more_button_html, image_url = generate_home_case_study_html(latest_case_study)
+    async def home_case_study():
+        async with db_pool.connection() as conn:
+            return await get_case_study_for_home(conn)
 
-        with open("PAGE_SERVING_ROUTERS/PAGES/home.html", "r", encoding="utf-8") as file:
-            html_content = file.read()
-        
-        html_content = html_content.replace(
-            '<!-- TOP EDITOR\'S CHOICE BLOGS WILL BE INSERTED HERE DYNAMICALLY -->',
-            home_insights_html
-        )
-        
-        html_content = html_content.replace(
-            '<!-- CASE STUDY TITLE WILL BE INSERTED HERE DYNAMICALLY -->',
-            case_study_title_html
-        )
-        
-        html_content = html_content.replace(
-            '<!-- CASE STUDY SUMMARY WILL BE INSERTED HERE DYNAMICALLY -->',
-            case_study_summary_html
-        )
+    return await asyncio.gather(home_blogs(), home_case_study())
+
+
+async def render_home_page() -> str:
+    """
+    Render the home page from the home page blogs and the featured case study
+    """
+    blog_home_data, latest_case_study = await fetch_home_page_data()
+    home_insights_html = await get_home_insights_html(blog_home_data)
+
+    case_study_title_html, case_study_summary_html, read_more_button_html, image_url = generate_home_case_study_html(latest_case_study)
+
+    return template_store.render(
+        "home",
+        editors_choice=home_insights_html,
+        case_study_title=case_study_title_html,
+        case_study_summary=case_study_summary_html,
+        read_more_button=read_more_button_html,
+        image_url=image_url
+    )
 
-        html_content = html_content.replace(
-            '<!-- READ MORE BUTTON WILL BE INSERTED HERE DYNAMICALLY -->',
-            read_more_button_html
-        )
-        html_content = html_content.replace(
-            '[[[imageURL]]]',
-            image_url
-        )
-        
-        base_calendly_url = os.getenv("BASE_CALENDLY_URL", "https://calendly.com/suflex-media/discovery-call?hide_gdpr_banner=1")
-        html_content = html_content.replace(
-            '[[[base_calendly_url]]]',
-            base_calendly_url
-        )
 
-        return HTMLResponse(content=html_content)
+@router.get("/", response_class=HTMLResponse)
+async def get_homepage(request: Request):
+    try:
+        page = await get_page(HOME_PAGE, "/", render_home_page)
+        return page_response(request, page)
     except Exception as e:
         print(f"Error loading homepage: {e}")
-        return FileResponse("PAGE_SERVING_ROUTERS/PAGES/home.html")
-    finally:
-        if conn:
-            await conn.close()
+        return HTMLResponse(content=template_store.render("home"))
 
 
 CALENDLY_URL_MAPPING = {
@@ -229,16 +197,14 @@ CALENDLY_URL_DEFAULTS = {
 
 
 def create_service_page_route(route_path: str, html_file: str):
+    constants = {}
+    env_var_name = CALENDLY_URL_MAPPING.get(route_path)
+    if env_var_name:
+        constants["calendly_url"] = os.getenv(env_var_name, CALENDLY_URL_DEFAULTS.get(env_var_name, ""))
+    template_store.register(route_path, html_file, markers={"[[[calendly_url]]]": "calendly_url"}, constants=constants)
+    
     async def service_page_handler():
-        with open(html_file, "r", encoding="utf-8") as file:
-            html_content = file.read()
-        
-        env_var_name = CALENDLY_URL_MAPPING.get(route_path)
-        if env_var_name:
-            calendly_url = os.getenv(env_var_name, CALENDLY_URL_DEFAULTS.get(env_var_name, ""))
-            html_content = html_content.replace("[[[calendly_url]]]", calendly_url)
-        
-        return HTMLResponse(content=html_content)
+        return HTMLResponse(content=template_store.render(route_path))
     return service_page_handler
 
 
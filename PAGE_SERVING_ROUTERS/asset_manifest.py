@@ -0,0 +1,116 @@
+import json
+import os
+import re
+from typing import Dict
+
+# URL prefix -> directory for every static mount whose files are fingerprinted
+ASSET_DIRECTORIES = {
+    "/css/": "PAGE_SERVING_ROUTERS/CSS",
+    "/js/": "PAGE_SERVING_ROUTERS/JS",
+    "/images/": "PAGE_SERVING_ROUTERS/IMAGES",
+    "/icons/": "PAGE_SERVING_ROUTERS/ICONS",
+    "/fonts/": "PAGE_SERVING_ROUTERS/FONTS",
+}
+MANIFEST_PATH = "PAGE_SERVING_ROUTERS/asset_manifest.json"
+
+# Absolute asset paths inside quotes (file names may contain spaces) or inside an unquoted CSS url(...).
+# Query strings and fragments are left untouched after the path.
+_PREFIXES = "|".join(re.escape(prefix[1:-1]) for prefix in ASSET_DIRECTORIES)
+ASSET_URL_PATTERN = re.compile(
+    rf"""(?<=["'])/(?:{_PREFIXES})/[^"'?#<>]+|(?<=url\()/(?:{_PREFIXES})/[^"'()?#\s]+"""
+)
+
+
+class AssetManifest:
+    """
+    Maps asset URLs to their content-hashed copies written by fingerprint_static_assets.py
+
+    The manifest file is re-read only when its mtime changes. Without a manifest (local development)
+    every URL maps to itself, so pages render with the plain file names.
+    """
+
+    def __init__(self, path: str = MANIFEST_PATH):
+        self.path = path
+        self.version = 0
+        self._assets: Dict[str, str] = {}
+        self._fingerprinted: frozenset = frozenset()
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        if mtime == self.version:
+            return
+
+        assets = {}
+        retired = {}
+        if mtime:
+            with open(self.path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+            assets = manifest.get("assets", {})
+            # Copies from earlier builds that are kept for pages still linking them
+            retired = manifest.get("retired", {})
+        self._assets = assets
+        self._fingerprinted = frozenset(assets.values()) | frozenset(retired)
+        self.version = mtime
+
+    def current_version(self) -> int:
+        """
+        Get the manifest version (its mtime), reloading it if the file changed
+        """
+        self._refresh()
+        return self.version
+
+    def asset_url(self, path: str) -> str:
+        """
+        Get the fingerprinted URL for an asset
+
+        Args:
+            path: Asset URL, e.g. /css/home.css
+
+        Returns:
+            The hashed URL, or the path unchanged if it is not in the manifest
+        """
+        self._refresh()
+        return self._assets.get(path, path)
+
+    def is_fingerprinted(self, path: str) -> bool:
+        """
+        Check whether a request path is a content-hashed asset that can be cached forever
+        """
+        self._refresh()
+        return path in self._fingerprinted
+
+    def rewrite(self, html: str) -> str:
+        """
+        Rewrite every absolute asset reference in a document through the manifest
+
+        Args:
+            html: HTML, CSS or JS source
+
+        Returns:
+            Source with known asset URLs replaced by their hashed copies
+        """
+        self._refresh()
+        if not self._assets:
+            return html
+        assets = self._assets
+        return ASSET_URL_PATTERN.sub(lambda match: assets.get(match.group(0), match.group(0)), html)
+
+
+asset_manifest = AssetManifest()
+
+
+def asset_url(path: str) -> str:
+    """
+    Get the fingerprinted URL for an asset
+    """
+    return asset_manifest.asset_url(path)
+
+
+def rewrite_asset_urls(html: str) -> str:
+    """
+    Rewrite absolute asset references in rendered HTML through the manifest
+    """
+    return asset_manifest.rewrite(html)
@@ -0,0 +1,58 @@
+import os
+import stat
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from DATABASE_HANDLER.utils.compression import COMPRESSIBLE_EXTENSIONS, SIDECAR_EXTENSIONS, negotiate_encoding
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the .br / .gz sidecars written by compress_static_assets.py
+
+    When the client accepts an encoding and a sidecar with the same mtime as the original exists,
+    the sidecar is streamed from disk with Content-Encoding set, so no compression happens per request.
+    A sidecar whose mtime differs (the original was edited after the build) is ignored.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if not isinstance(response, FileResponse) or response.status_code != 200:
+            return response
+
+        if os.path.splitext(response.path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return response
+        response.headers["Vary"] = "Accept-Encoding"
+
+        request_headers = Headers(scope=scope)
+        sidecars = await anyio.to_thread.run_sync(self._find_sidecars, response.path, response.stat_result)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"), sidecars)
+        if encoding is None:
+            return response
+
+        sidecar_path, sidecar_stat = sidecars[encoding]
+        compressed = FileResponse(
+            sidecar_path,
+            stat_result=sidecar_stat,
+            media_type=response.media_type,
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+        )
+        if self.is_not_modified(compressed.headers, request_headers):
+            return NotModifiedResponse(compressed.headers)
+        return compressed
+
+    @staticmethod
+    def _find_sidecars(full_path: str, original_stat: os.stat_result) -> dict:
+        sidecars = {}
+        for encoding, extension in SIDECAR_EXTENSIONS.items():
+            try:
+                sidecar_stat = os.stat(full_path + extension)
+            except OSError:
+                continue
+            if stat.S_ISREG(sidecar_stat.st_mode) and sidecar_stat.st_mtime_ns == original_stat.st_mtime_ns:
+                sidecars[encoding] = (full_path + extension, sidecar_stat)
+        return sidecars
@@ -0,0 +1,409 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import config
+from DATABASE_HANDLER.connection_pool import db_pool
+from DATABASE_HANDLER.utils.page_cache import page_cache, BLOG_PAGES, CASE_STUDY_PAGES, HOME_PAGE, BLOGS_LANDING_PAGE, PORTFOLIO_PAGES
+from DATABASE_HANDLER.utils.pagination import count_cache
+from DATABASE_HANDLER.utils.static_site import StaticSite, SITEMAP, static_site
+from PAGE_SERVING_ROUTERS.ROUTERS.Blog_Creator_router import RELATED_BLOG_CARDS_LIMIT, fetch_related_blog_cards, render_blog_record
+from PAGE_SERVING_ROUTERS.ROUTERS.case_study_router import assemble_case_study_html, case_study_from_record
+from PAGE_SERVING_ROUTERS.ROUTERS.blogs_router import render_blogs_landing_page
+from PAGE_SERVING_ROUTERS.ROUTERS.static_pages_router import CATEGORY_MAPPING, render_home_page, render_portfolio_page
+from PAGE_SERVING_ROUTERS.ROUTERS.seo_router import render_sitemap
+
+logger = logging.getLogger(__name__)
+
+# Items per task sent to a worker process; large enough that pickling and the per-task event loop are noise.
+# Batches no bigger than one chunk are rendered in-process instead of starting a pool.
+RENDER_CHUNK_SIZE = 25
+
+BLOG_NAMESPACES = (BLOG_PAGES, HOME_PAGE, BLOGS_LANDING_PAGE, SITEMAP)
+CASE_STUDY_NAMESPACES = (CASE_STUDY_PAGES, HOME_PAGE, PORTFOLIO_PAGES, SITEMAP)
+
+PUBLISHED_BLOGS_QUERY = """
+    SELECT id, blogContent, status, date, slug, isDeleted, created_at, updated_at
+    FROM blogs
+    WHERE isDeleted = FALSE AND status = 'published' AND slug IS NOT NULL
+"""
+PUBLISHED_CASE_STUDIES_QUERY = """
+    SELECT id, slug, case_study, status, type, date, keyword, preview, category,
+           editors_choice, redirect_url, pdf_url, isdeleted, created_at, updated_at
+    FROM case_studies
+    WHERE isdeleted = FALSE AND status = 'published' AND slug IS NOT NULL
+"""
+
+# Incremental regenerations read and rewrite the dependency state, so they run one at a time
+_regeneration_lock = asyncio.Lock()
+
+
+def _render_blog_chunk(chunk: List[Tuple[dict, List[dict]]]) -> List[Tuple[str, str]]:
+    # Runs in a worker process; create_blog_html is a coroutine but does no I/O
+    async def render_all():
+        return [(blog['slug'], await render_blog_record(blog, related)) for blog, related in chunk]
+    return asyncio.run(render_all())
+
+
+def _render_case_study_chunk(chunk: List[dict]) -> List[Tuple[str, str]]:
+    # Runs in a worker process
+    return [(case_study['slug'], assemble_case_study_html(case_study)) for case_study in chunk]
+
+
+def _chunks(items: list, size: int = RENDER_CHUNK_SIZE) -> List[list]:
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+async def render_item_pages(
+    blog_jobs: List[Tuple[dict, List[dict]]],
+    case_studies: List[dict],
+    workers: Optional[int] = None
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Render blog and case study pages, in a process pool when there is more than one chunk of them
+
+    Args:
+        blog_jobs: (blog row, related cards) pairs
+        case_studies: Case study dictionaries from case_study_from_record
+        workers: Worker processes; defaults to the CPU count
+
+    Returns:
+        Tuple of ([(slug, html)] for blogs, [(slug, html)] for case studies)
+    """
+    if len(blog_jobs) + len(case_studies) <= RENDER_CHUNK_SIZE:
+        blog_pages = [(blog['slug'], await render_blog_record(blog, related)) for blog, related in blog_jobs]
+        case_study_pages = await asyncio.to_thread(_render_case_study_chunk, case_studies)
+        return blog_pages, case_study_pages
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        blog_results = asyncio.gather(*(loop.run_in_executor(executor, _render_blog_chunk, chunk) for chunk in _chunks(blog_jobs)))
+        case_study_results = asyncio.gather(*(loop.run_in_executor(executor, _render_case_study_chunk, chunk) for chunk in _chunks(case_studies)))
+        blog_chunks, case_study_chunks = await asyncio.gather(blog_results, case_study_results)
+    return [page for chunk in blog_chunks for page in chunk], [page for chunk in case_study_chunks for page in chunk]
+
+
+async def fetch_related_cards(conn) -> List[dict]:
+    """
+    Fetch the related-card rows shared by all blog pages, with one spare to cover the page itself
+    """
+    return [dict(card) for card in await fetch_related_blog_cards(conn, None, RELATED_BLOG_CARDS_LIMIT + 1)]
+
+
+def related_cards_for(slug: str, cards: List[dict]) -> List[dict]:
+    """
+    Pick the related-blog cards a blog page shows: the most recent blogs other than itself
+    """
+    return [card for card in cards if card['slug'] != slug][:RELATED_BLOG_CARDS_LIMIT]
+
+
+def _cards_state(cards: List[dict]) -> List[dict]:
+    # JSON round trip so cards compare equal to the copy read back from the state file
+    return json.loads(json.dumps(cards, default=str))
+
+
+def portfolio_keys(categories: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """
+    Get the /case-studies variants that list case studies in the given categories
+    The unfiltered listing is always included
+    """
+    names = {category.lower() for category in categories if category}
+    return [None] + [key for key, name in CATEGORY_MAPPING.items() if name.lower() in names]
+
+
+def listing_pages(namespaces: Iterable[str], categories: Optional[Iterable[Optional[str]]] = None) -> List[Tuple[str, Optional[str], Callable[[], Awaitable[str]]]]:
+    """
+    Get (namespace, key, render) for listing pages and the sitemap, each rendered on a pooled connection
+
+    Args:
+        namespaces: Which of HOME_PAGE, BLOGS_LANDING_PAGE, PORTFOLIO_PAGES and SITEMAP to include
+        categories: Limit the /case-studies variants to these case study categories; all when omitted
+    """
+    pages = []
+    if HOME_PAGE in namespaces:
+        pages.append((HOME_PAGE, "/", render_home_page))
+    if BLOGS_LANDING_PAGE in namespaces:
+        pages.append((BLOGS_LANDING_PAGE, "/blogs", render_blogs_landing_page))
+    if SITEMAP in namespaces:
+        pages.append((SITEMAP, None, render_sitemap))
+    if PORTFOLIO_PAGES in namespaces:
+        keys = [None] + list(CATEGORY_MAPPING) if categories is None else portfolio_keys(categories)
+        for key in keys:
+            pages.append((PORTFOLIO_PAGES, key, lambda key=key: render_portfolio_page(key)))
+    return pages
+
+
+async def render_listings(listings: List[Tuple[str, Optional[str], Callable[[], Awaitable[str]]]]) -> List[Tuple[str, Optional[str], str]]:
+    html = await asyncio.gather(*(render() for _, _, render in listings))
+    return [(namespace, key, page) for (namespace, key, _), page in zip(listings, html)]
+
+
+def _write_pages(site: StaticSite, pages: List[Tuple[str, Optional[str], str]], generations: Dict[str, int], only_if_changed: bool = False) -> List[Tuple[str, Optional[str]]]:
+    written = []
+    for namespace, key, html in pages:
+        if site.write(namespace, key, html, generation=generations[namespace], only_if_changed=only_if_changed):
+            written.append((namespace, key))
+    return written
+
+
+def _remove_orphans(site: StaticSite, namespace: str, slugs: Iterable[str]) -> int:
+    # Item pages whose blog or case study is no longer published (deleted, unpublished or renamed)
+    current = {os.path.normpath(site.path(namespace, slug)) for slug in slugs}
+    directory = os.path.dirname(site.path(namespace, "_"))
+    if not os.path.isdir(directory):
+        return 0
+    orphans = [
+        os.path.normpath(os.path.join(directory, name)) for name in os.listdir(directory)
+        if name.endswith(".html") and os.path.normpath(os.path.join(directory, name)) not in current
+    ]
+    for path in orphans:
+        os.remove(path)
+    return len(orphans)
+
+
+async def generate_static_site(site: StaticSite = static_site, workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Pre-render every published page to the static site directory
+
+    Blog and case study pages are rendered in a process pool from rows fetched in bulk; the listing
+    pages and sitemap are rendered here on pooled connections in the meantime. Pages that are no
+    longer published are removed afterwards. Requires an initialized db_pool.
+
+    Args:
+        site: Output store
+        workers: Worker processes; defaults to the CPU count
+
+    Returns:
+        Dictionary with the number of pages written per namespace, pages removed and elapsed milliseconds
+    """
+    started = time.perf_counter()
+    namespaces = (BLOG_PAGES, CASE_STUDY_PAGES, HOME_PAGE, BLOGS_LANDING_PAGE, PORTFOLIO_PAGES, SITEMAP)
+    generations = {namespace: site.generation(namespace) for namespace in namespaces}
+
+    async with db_pool.connection() as conn:
+        blogs = [dict(blog) for blog in await conn.fetch(PUBLISHED_BLOGS_QUERY)]
+        cards = await fetch_related_cards(conn)
+        case_studies = [case_study_from_record(case_study) for case_study in await conn.fetch(PUBLISHED_CASE_STUDIES_QUERY)]
+
+    blog_jobs = [(blog, related_cards_for(blog['slug'], cards)) for blog in blogs]
+    (blog_pages, case_study_pages), pages = await asyncio.gather(
+        render_item_pages(blog_jobs, case_studies, workers),
+        render_listings(listing_pages(namespaces))
+    )
+    pages += [(BLOG_PAGES, slug, html) for slug, html in blog_pages]
+    pages += [(CASE_STUDY_PAGES, slug, html) for slug, html in case_study_pages]
+
+    def write_all():
+        # A write during the build has already regenerated its namespaces from newer data; pages, orphan
+        # pruning and dependency state for those namespaces are left as the regeneration made them
+        written = _write_pages(site, pages, generations)
+        unchanged = {namespace for namespace in namespaces if site.generation(namespace) == generations[namespace]}
+        removed = 0
+        if BLOG_PAGES in unchanged:
+            removed += _remove_orphans(site, BLOG_PAGES, [blog['slug'] for blog in blogs])
+        if CASE_STUDY_PAGES in unchanged:
+            removed += _remove_orphans(site, CASE_STUDY_PAGES, [case_study['slug'] for case_study in case_studies])
+        if len(unchanged) == len(namespaces):
+            site.write_state({
+                "related_cards": _cards_state(cards),
+                "case_study_categories": {case_study['slug']: case_study['category'] for case_study in case_studies}
+            })
+        return written, removed
+
+    async with _regeneration_lock:
+        written, removed = await asyncio.to_thread(write_all)
+
+    summary = {namespace: 0 for namespace in namespaces}
+    for namespace, _ in written:
+        summary[namespace] += 1
+    summary["removed"] = removed
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+    logger.info(f"Static site generated in {summary['elapsed_ms']} ms: {summary}")
+    return summary
+
+
+async def regenerate_blog_artifacts(site: StaticSite, slugs: Iterable[Optional[str]], workers: Optional[int] = None) -> int:
+    """
+    Regenerate only the pre-rendered artifacts a blog write can have changed
+
+    Those are the written blog's own page, the pages whose related-cards section changed (compared
+    against the card list recorded at the last regeneration), /, /blogs and sitemap.xml. Listings are
+    re-rendered but only rewritten when their HTML changed. Pages of blogs that are no longer published
+    are removed.
+
+    Args:
+        site: Pre-rendered site
+        slugs: Slugs of the written blog (old and new slug on a rename)
+        workers: Worker processes used when many blog pages are affected
+
+    Returns:
+        Number of artifacts written or removed
+    """
+    async with _regeneration_lock:
+        for namespace in BLOG_NAMESPACES:
+            site.mark_changed(namespace)
+        generations = {namespace: site.generation(namespace) for namespace in BLOG_NAMESPACES}
+        state = await asyncio.to_thread(site.read_state)
+        async with db_pool.connection() as conn:
+            published = {row['slug'] for row in await conn.fetch("SELECT slug FROM blogs WHERE isDeleted = FALSE AND status = 'published' AND slug IS NOT NULL")}
+            cards = await fetch_related_cards(conn)
+
+            old_cards, new_cards = state.get("related_cards"), _cards_state(cards)
+            if old_cards is None:
+                affected = set(published)
+            else:
+                affected = {slug for slug in slugs if slug in published}
+                if old_cards != new_cards:
+                    affected |= {slug for slug in published if related_cards_for(slug, old_cards) != related_cards_for(slug, new_cards)}
+            blogs = [dict(blog) for blog in await conn.fetch(PUBLISHED_BLOGS_QUERY + " AND slug = ANY($1::text[])", list(affected))]
+
+        blog_jobs = [(blog, related_cards_for(blog['slug'], cards)) for blog in blogs]
+        (blog_pages, _), pages = await asyncio.gather(
+            render_item_pages(blog_jobs, [], workers),
+            render_listings(listing_pages((HOME_PAGE, BLOGS_LANDING_PAGE, SITEMAP)))
+        )
+        pages += [(BLOG_PAGES, slug, html) for slug, html in blog_pages]
+
+        def write_all():
+            written = _write_pages(site, pages, generations, only_if_changed=True)
+            removed = _remove_orphans(site, BLOG_PAGES, published)
+            state["related_cards"] = new_cards
+            site.write_state(state)
+            return len(written) + removed
+
+        return await asyncio.to_thread(write_all)
+
+
+async def regenerate_case_study_artifacts(site: StaticSite, slugs: Iterable[Optional[str]], workers: Optional[int] = None) -> int:
+    """
+    Regenerate only the pre-rendered artifacts a case study write can have changed
+
+    Those are the case study's own page, / (featured case study), /case-studies plus the category
+    variants for its old and new category, and sitemap.xml. Listings are re-rendered but only rewritten
+    when their HTML changed. Pages of case studies that are no longer published are removed.
+
+    Args:
+        site: Pre-rendered site
+        slugs: Slugs of the written case study (old and new slug on a rename)
+        workers: Worker processes used when many case study pages are affected
+
+    Returns:
+        Number of artifacts written or removed
+    """
+    slugs = [slug for slug in slugs if slug]
+
+    async with _regeneration_lock:
+        for namespace in CASE_STUDY_NAMESPACES:
+            site.mark_changed(namespace)
+        generations = {namespace: site.generation(namespace) for namespace in CASE_STUDY_NAMESPACES}
+        state = await asyncio.to_thread(site.read_state)
+        async with db_pool.connection() as conn:
+            categories = {
+                row['slug']: row['category'] for row in await conn.fetch(
+                    "SELECT slug, category FROM case_studies WHERE isdeleted = FALSE AND status = 'published' AND slug IS NOT NULL"
+                )
+            }
+            case_studies = [
+                case_study_from_record(case_study) for case_study in
+                await conn.fetch(PUBLISHED_CASE_STUDIES_QUERY + " AND slug = ANY($1::text[])", slugs)
+            ]
+
+        old_categories = state.get("case_study_categories")
+        if old_categories is None:
+            affected_categories = None
+        else:
+            affected_categories = {old_categories.get(slug) for slug in slugs} | {categories.get(slug) for slug in slugs}
+
+        (_, case_study_pages), pages = await asyncio.gather(
+            render_item_pages([], case_studies, workers),
+            render_listings(listing_pages((HOME_PAGE, PORTFOLIO_PAGES, SITEMAP), affected_categories))
+        )
+        pages += [(CASE_STUDY_PAGES, slug, html) for slug, html in case_study_pages]
+
+        def write_all():
+            written = _write_pages(site, pages, generations, only_if_changed=True)
+            removed = _remove_orphans(site, CASE_STUDY_PAGES, categories)
+            state["case_study_categories"] = categories
+            site.write_state(state)
+            return len(written) + removed
+
+        return await asyncio.to_thread(write_all)
+
+
+async def _refresh(kind: str, regenerate: Callable[..., Awaitable[int]], slugs: Tuple[Optional[str], ...], fallback: Callable[[], Any]) -> int:
+    if not static_site.enabled:
+        fallback()
+        return 0
+    try:
+        touched = await regenerate(static_site, slugs, config.STATIC_SITE_WORKERS)
+    except Exception as e:
+        logger.error(f"Incremental regeneration after a {kind} write failed, dropping the affected pre-rendered pages: {e}")
+        fallback()
+        return 0
+
+    static_site.regenerations += 1
+    static_site.artifacts_touched += touched
+    logger.info(f"Regenerated {touched} pre-rendered artifacts after a {kind} write ({', '.join(slug for slug in slugs if slug)})")
+    return touched
+
+
+async def refresh_blog_pages(*slugs: Optional[str]) -> int:
+    """
+    Background job run after a blog write commits
+
+    Drops the page-cache entries that render blog data and, when serving the pre-rendered site,
+    regenerates the artifacts that depend on the write. Without a pre-rendered site, or if
+    regeneration fails, the affected files are deleted so they are rendered live.
+
+    Args:
+        *slugs: Slugs of the blog that changed (old and new slug on a rename)
+
+    Returns:
+        Number of artifacts written or removed
+    """
+    # Each blog page embeds cards for the most recent other blogs, so the whole namespace is dropped
+    for namespace in (BLOG_PAGES, HOME_PAGE, BLOGS_LANDING_PAGE, SITEMAP):
+        page_cache.invalidate(namespace)
+
+    def fallback():
+        for namespace in BLOG_NAMESPACES:
+            static_site.remove(namespace)
+
+    return await _refresh("blog", regenerate_blog_artifacts, slugs, fallback)
+
+
+async def refresh_case_study_pages(*slugs: Optional[str]) -> int:
+    """
+    Background job run after a case study write commits
+
+    Drops the case study's page-cache entries, every listing that renders case studies and the cached
+    portfolio totals and, when serving the pre-rendered site, regenerates the artifacts that depend on
+    the write. Without a pre-rendered site, or if regeneration fails, the affected files are deleted so
+    they are rendered live.
+
+    Args:
+        *slugs: Slugs of the case studies that changed (old and new slug on a rename)
+
+    Returns:
+        Number of artifacts written or removed
+    """
+    for slug in slugs:
+        if slug:
+            page_cache.invalidate(CASE_STUDY_PAGES, slug)
+    page_cache.invalidate(HOME_PAGE)
+    page_cache.invalidate(PORTFOLIO_PAGES)
+    page_cache.invalidate(SITEMAP)
+    count_cache.invalidate("case_studies")
+
+    def fallback():
+        for slug in slugs:
+            if slug:
+                static_site.remove(CASE_STUDY_PAGES, slug)
+        for namespace in (HOME_PAGE, PORTFOLIO_PAGES, SITEMAP):
+            static_site.remove(namespace)
+
+    return await _refresh("case study", regenerate_case_study_artifacts, slugs, fallback)
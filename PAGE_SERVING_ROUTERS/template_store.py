@@ -0,0 +1,150 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from PAGE_SERVING_ROUTERS.asset_manifest import asset_manifest
+
+
+class PageTemplate:
+    """
+    A page split at its placeholder markers into literal segments and named slots
+
+    Rendering joins the literals with the slot values, so a request costs one join
+    instead of a full-document str.replace / re.sub per placeholder.
+    """
+
+    def __init__(self, literals: List[str], slots: List[str], defaults: List[str]):
+        self.literals = literals
+        self.slots = slots
+        self.defaults = defaults
+
+    def render(self, **values: str) -> str:
+        """
+        Render the page
+
+        Args:
+            **values: Slot values; a slot without a value keeps the original template text
+
+        Returns:
+            Rendered HTML
+        """
+        parts = [self.literals[0]]
+        for slot, default, literal in zip(self.slots, self.defaults, self.literals[1:]):
+            value = values.get(slot)
+            parts.append(default if value is None else value)
+            parts.append(literal)
+        return "".join(parts)
+
+
+class TemplateStore:
+    """
+    In-memory store of precompiled PAGES/*.html templates
+
+    Each registered page is read and split once, and re-read only when the file's mtime or the
+    asset manifest changes. Values that never change at runtime (e.g. Calendly URLs from the
+    environment) and fingerprinted asset URLs are baked into the literal segments at compile time.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, dict] = {}
+        self._compiled: Dict[str, Tuple[Tuple[int, int], PageTemplate]] = {}
+
+    def register(
+        self,
+        name: str,
+        path: str,
+        markers: Optional[Dict[str, str]] = None,
+        patterns: Optional[Dict[str, str]] = None,
+        constants: Optional[Dict[str, str]] = None
+    ):
+        """
+        Register a page template and compile it
+
+        Args:
+            name: Name used to render the template
+            path: Path to the HTML file
+            markers: Literal placeholder text -> slot name; every occurrence becomes a slot
+            patterns: Regex (DOTALL) -> slot name; the first match becomes a slot. If the regex has a
+                group named "slot" only that group is replaced, otherwise the whole match is
+            constants: Slot name -> value baked into the template at compile time
+        """
+        self._specs[name] = {
+            "path": path,
+            "markers": markers or {},
+            "patterns": {re.compile(pattern, re.DOTALL): slot for pattern, slot in (patterns or {}).items()},
+            "constants": constants or {}
+        }
+        self._compiled.pop(name, None)
+        self.get(name)
+
+    def get(self, name: str) -> PageTemplate:
+        """
+        Get the compiled template, recompiling it if the file changed on disk
+
+        Args:
+            name: Registered template name
+
+        Returns:
+            Compiled PageTemplate
+        """
+        spec = self._specs[name]
+        version = (os.stat(spec["path"]).st_mtime_ns, asset_manifest.current_version())
+
+        compiled = self._compiled.get(name)
+        if compiled is None or compiled[0] != version:
+            with open(spec["path"], "r", encoding="utf-8") as file:
+                html = asset_manifest.rewrite(file.read())
+            compiled = (version, self._compile(html, spec))
+            self._compiled[name] = compiled
+        return compiled[1]
+
+    def render(self, name: str, **values: str) -> str:
+        """
+        Render a registered template
+
+        Args:
+            name: Registered template name
+            **values: Slot values
+
+        Returns:
+            Rendered HTML
+        """
+        return self.get(name).render(**values)
+
+    def _compile(self, html: str, spec: dict) -> PageTemplate:
+        spans = []
+        for marker, slot in spec["markers"].items():
+            start = html.find(marker)
+            while start != -1:
+                spans.append((start, start + len(marker), slot))
+                start = html.find(marker, start + len(marker))
+
+        for pattern, slot in spec["patterns"].items():
+            match = pattern.search(html)
+            if match:
+                group = "slot" if "slot" in pattern.groupindex else 0
+                spans.append((match.start(group), match.end(group), slot))
+
+        spans.sort()
+        constants = spec["constants"]
+        literals = [""]
+        slots = []
+        defaults = []
+        position = 0
+        for start, end, slot in spans:
+            if start < position:
+                raise ValueError(f"Overlapping placeholders in {spec['path']} at offset {start}")
+            literals[-1] += html[position:start]
+            if slot in constants:
+                literals[-1] += constants[slot]
+            else:
+                slots.append(slot)
+                defaults.append(html[start:end])
+                literals.append("")
+            position = end
+        literals[-1] += html[position:]
+
+        return PageTemplate(literals, slots, defaults)
+
+
+template_store = TemplateStore()
@@ -1,8 +1,8 @@
+import asyncio
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import HTMLResponse
 from fastapi.exceptions import HTTPException
 import uvicorn
 from contextlib import asynccontextmanager
@@ -10,6 +10,12 @@ from contextlib import asynccontextmanager
 from config import config
 from DATABASE_HANDLER import initialize_database
 from DATABASE_HANDLER.connection_pool import db_pool
+from DATABASE_HANDLER.utils.lead_ingestion import lead_buffer
+from DATABASE_HANDLER.utils.object_storage import object_storage
+from PAGE_SERVING_ROUTERS.static_files import PrecompressedStaticFiles
+from PAGE_SERVING_ROUTERS.asset_manifest import asset_manifest
+from PAGE_SERVING_ROUTERS.template_store import template_store
+from PAGE_SERVING_ROUTERS.static_site_generator import generate_static_site
 from PAGE_SERVING_ROUTERS.ROUTERS.static_pages_router import router as static_pages_router
 from PAGE_SERVING_ROUTERS.ROUTERS.blogs_router import router as blogs_router
 from PAGE_SERVING_ROUTERS.ROUTERS.error_router import router as error_router
@@ -26,6 +32,7 @@ from API_ROUTERS.admin_users_api_router import router as admin_users_api_router
 from API_ROUTERS.serve_images_api_router import router as serve_images_api_router
 from API_ROUTERS.blogs_api_router import router as blogs_api_router
 from API_ROUTERS.case_studies_api_router import router as case_studies_api_router
+from API_ROUTERS.page_cache_api_router import router as page_cache_api_router
 
 from PAGE_SERVING_ROUTERS.ROUTERS.seo_router import router as seo_router
 
@@ -37,11 +44,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _log_static_site_build(task: asyncio.Task):
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        logger.error(f"Static site build failed; pages are rendered live: {task.exception()}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Manage application lifespan events (startup and shutdown).
-    Initializes database and connection pool on startup, closes pool on shutdown.
+    Initializes database, connection pool and lead buffer on startup and checks the storage bucket;
+    flushes the buffer, closes pool and stops the object storage threads on shutdown.
     """
     logger.info("Initializing database...")
     try:
@@ -54,11 +69,32 @@ async def lifespan(app: FastAPI):
     await db_pool.initialize(min_size=config.DB_POOL_MIN_SIZE, max_size=config.DB_POOL_MAX_SIZE)
     logger.info("Database connection pool initialized!")
     
+    await lead_buffer.start()
+    
+    try:
+        await object_storage.ensure_bucket()
+    except Exception as e:
+        logger.warning(f"Could not check/create bucket: {e}")
+    
+    static_site_build = None
+    if config.STATIC_SITE_BUILD_ON_STARTUP:
+        logger.info(f"Pre-rendering the static site to {config.STATIC_SITE_DIR} in the background...")
+        static_site_build = asyncio.create_task(generate_static_site(workers=config.STATIC_SITE_WORKERS))
+        static_site_build.add_done_callback(_log_static_site_build)
+    
     yield
     
+    if static_site_build is not None and not static_site_build.done():
+        static_site_build.cancel()
+    
+    logger.info("Flushing buffered leads...")
+    await lead_buffer.stop()
+    
     logger.info("Closing database connection pool...")
     await db_pool.close()
     logger.info("Database connection pool closed!")
+    
+    object_storage.close()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -75,18 +111,23 @@ app.add_middleware(
 async def add_cache_headers(request: Request, call_next):
     response = await call_next(request)
     path = request.url.path
-    # Add long cache headers for static assets
     if any(path.startswith(p) for p in ['/css/', '/js/', '/images/', '/icons/', '/fonts/']):
-        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        # Only content-hashed copies from fingerprint_static_assets.py are safe to cache forever;
+        # plain file names can change content in place, so they are revalidated on every use
+        if asset_manifest.is_fingerprinted(path):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
     return response
 
 
-app.mount("/css", StaticFiles(directory="PAGE_SERVING_ROUTERS/CSS"), name="css")
-app.mount("/icons", StaticFiles(directory="PAGE_SERVING_ROUTERS/ICONS"), name="icons")
-app.mount("/images", StaticFiles(directory="PAGE_SERVING_ROUTERS/IMAGES"), name="images")
-app.mount("/js", StaticFiles(directory="PAGE_SERVING_ROUTERS/JS"), name="js")
-app.mount("/pages", StaticFiles(directory="PAGE_SERVING_ROUTERS/PAGES"), name="pages")
-app.mount("/fonts", StaticFiles(directory="PAGE_SERVING_ROUTERS/FONTS"), name="fonts")
+# Serves the .gz/.br sidecars written by compress_static_assets.py when the client accepts them
+app.mount("/css", PrecompressedStaticFiles(directory="PAGE_SERVING_ROUTERS/CSS"), name="css")
+app.mount("/icons", PrecompressedStaticFiles(directory="PAGE_SERVING_ROUTERS/ICONS"), name="icons")
+app.mount("/images", PrecompressedStaticFiles(directory="PAGE_SERVING_ROUTERS/IMAGES"), name="images")
+app.mount("/js", PrecompressedStaticFiles(directory="PAGE_SERVING_ROUTERS/JS"), name="js")
+app.mount("/pages", PrecompressedStaticFiles(directory="PAGE_SERVING_ROUTERS/PAGES"), name="pages")
+app.mount("/fonts", PrecompressedStaticFiles(directory="PAGE_SERVING_ROUTERS/FONTS"), name="fonts")
 
 app.include_router(static_pages_router)
 app.include_router(blogs_router)
@@ -104,12 +145,13 @@ app.include_router(serve_images_api_router)
 app.include_router(blogs_api_router)
 
 app.include_router(case_studies_api_router)
+app.include_router(page_cache_api_router)
 app.include_router(seo_router)
 app.include_router(landing_pages_router)
 
 @app.exception_handler(404)
 async def custom_404_handler(request: Request, exc: HTTPException):
-    return FileResponse("PAGE_SERVING_ROUTERS/PAGES/404.html", status_code=404)
+    return HTMLResponse(content=template_store.render("404"), status_code=404)
 
 if __name__ == "__main__":
     uvicorn.run("app:app", host=config.API_HOST, port=config.API_PORT, reload=True)
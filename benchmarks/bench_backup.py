@@ -0,0 +1,196 @@
+"""
+Benchmark: db_backup_restore JSON backups vs COPY backups, and restores
+
+Creates a scratch database with the app's schema and 100k / 1M pdf_downloads rows (plus a few
+thousand blogs), then times backup_database in "json" format and in "copy" format, and reports
+wall time, peak memory growth and size on disk for each. Each backup is then restored over
+emptied tables with restore_database, against a baseline of one INSERT per row (the previous
+restore loop) on the first PER_ROW_SAMPLE leads. Finally, after NEW_LEADS more leads arrive, an
+incremental backup on top of the COPY one is timed against another full backup.
+
+Usage:
+    python benchmarks/bench_backup.py
+    python benchmarks/bench_backup.py --sizes 1000000 --jobs 8 --keep
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit
+
+import asyncpg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+import db_backup_restore
+
+DATABASE = "bench_backup"
+PER_ROW_SAMPLE = 20000
+NEW_LEADS = 1000
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATABASE_HANDLER", "init_db.sql")
+
+
+def scratch_url():
+    parts = urlsplit(config.DATABASE_URL)
+    return urlunsplit(parts._replace(path=f"/{DATABASE}"))
+
+
+async def seed(n_rows):
+    conn = await asyncpg.connect(config.DATABASE_URL)
+    try:
+        await conn.execute(f"DROP DATABASE IF EXISTS {DATABASE} WITH (FORCE)")
+        await conn.execute(f"CREATE DATABASE {DATABASE}")
+    finally:
+        await conn.close()
+
+    conn = await asyncpg.connect(scratch_url())
+    try:
+        with open(SCHEMA_FILE, encoding="utf-8") as f:
+            await conn.execute(f.read())
+        await conn.execute(
+            """
+            INSERT INTO pdf_downloads (timestamp, first_name, last_name, email, company_name, mobile_number, pdf_link)
+            SELECT NOW() - random() * INTERVAL '730 days', 'First ' || g, 'Last', 'user' || g || '@example.com', 'Company',
+                   '9999999999', '/pdfs/guide-' || (g % 50) || '.pdf'
+            FROM generate_series(1, $1) AS g
+            """,
+            n_rows
+        )
+        await conn.execute(
+            """
+            INSERT INTO blogs (title, slug, blogContent, status, type, category, created_at, updated_at)
+            SELECT 'Blog ' || g, 'blog-' || g, jsonb_build_object('sections', jsonb_build_array(repeat('word ', 400))),
+                   'published', 'GENERAL', 'Tech', NOW() - INTERVAL '30 days', NOW() - INTERVAL '30 days'
+            FROM generate_series(1, 5000) AS g
+            """
+        )
+    finally:
+        await conn.close()
+
+
+async def per_row_restore_rate(path):
+    """Rows per second of the previous restore loop: one INSERT ... ON CONFLICT DO NOTHING per row."""
+    with open(os.path.join(path, "pdf_downloads.json"), encoding="utf-8") as f:
+        data = json.load(f)["data"][:PER_ROW_SAMPLE]
+    columns = list(data[0].keys())
+    placeholders = ', '.join([f'${i + 1}' for i in range(len(columns))])
+    query = f'INSERT INTO pdf_downloads ({", ".join(columns)}) VALUES ({placeholders}) ON CONFLICT DO NOTHING'
+
+    conn = await asyncpg.connect(scratch_url())
+    try:
+        await conn.execute("TRUNCATE pdf_downloads")
+        started = time.perf_counter()
+        for row in data:
+            values = [datetime.fromisoformat(row[col]) if col == "timestamp" and row[col] else row[col] for col in columns]
+            await conn.execute(query, *values)
+        return len(data) / (time.perf_counter() - started)
+    finally:
+        await conn.close()
+
+
+async def add_leads(n_rows):
+    conn = await asyncpg.connect(scratch_url())
+    try:
+        await conn.execute(
+            """
+            INSERT INTO pdf_downloads (timestamp, first_name, last_name, email, company_name, mobile_number, pdf_link)
+            SELECT NOW() AT TIME ZONE 'UTC', 'New ' || g, 'Last', 'new' || g || '@example.com', 'Company', '9999999999', '/pdfs/guide-1.pdf'
+            FROM generate_series(1, $1) AS g
+            """,
+            n_rows
+        )
+    finally:
+        await conn.close()
+
+
+async def empty_tables():
+    conn = await asyncpg.connect(scratch_url())
+    try:
+        await conn.execute("TRUNCATE pdf_downloads, pdf_download_daily, pdf_download_totals, blogs, case_studies")
+    finally:
+        await conn.close()
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def bench_size(n_rows, jobs):
+    await seed(n_rows)
+    folder = tempfile.mkdtemp(prefix="bench_backup_")
+    try:
+        print(f"\nbackup_database with {n_rows} leads and 5000 blogs")
+        backups = {}
+        # COPY first: peak RSS only grows, so running it after JSON would hide its footprint
+        for backup_format in ("copy", "json"):
+            rss_before = peak_rss_mb()
+            started = time.perf_counter()
+            backups[backup_format] = await db_backup_restore.backup_database(folder, backup_format, jobs)
+            elapsed = time.perf_counter() - started
+            path = backups[backup_format]
+            size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+            print(f"  {backup_format:<5} {elapsed:8.2f}s  peak RSS +{peak_rss_mb() - rss_before:7.1f}MB  {size / 1024 / 1024:8.1f}MB on disk")
+            # Backup folders are named by the second
+            await asyncio.sleep(1)
+
+        print("\nrestore_database over emptied tables")
+        for backup_format, path in backups.items():
+            await empty_tables()
+            started = time.perf_counter()
+            results = await db_backup_restore.restore_database(path, jobs=jobs)
+            elapsed = time.perf_counter() - started
+            rows = sum(result["rows_restored"] for result in results.values())
+            print(f"  {backup_format:<5} {elapsed:8.2f}s  {rows / elapsed:10.0f} rows/s")
+        rate = await per_row_restore_rate(backups["json"])
+        print(f"  one INSERT per row          {rate:10.0f} rows/s on {PER_ROW_SAMPLE} leads, {n_rows / rate:.0f}s projected for all of them")
+
+        # Back to the state of the COPY backup, which the delta should build on rather than the newer JSON one
+        await empty_tables()
+        await db_backup_restore.restore_database(backups["copy"], jobs=jobs)
+        shutil.rmtree(backups["json"])
+        await add_leads(NEW_LEADS)
+        print(f"\nbackup_database after {NEW_LEADS} new leads")
+        for label, incremental in (("incremental", True), ("full", False)):
+            await asyncio.sleep(1)
+            started = time.perf_counter()
+            path = await db_backup_restore.backup_database(folder, "copy", jobs, incremental=incremental)
+            elapsed = time.perf_counter() - started
+            size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+            print(f"  {label:<11} {elapsed:8.2f}s  {size / 1024 / 1024:8.1f}MB on disk")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+async def main_async(sizes, jobs, keep):
+    db_backup_restore.DATABASE_URL = scratch_url()
+    try:
+        for size in sizes:
+            await bench_size(size, jobs)
+    finally:
+        if not keep:
+            conn = await asyncpg.connect(config.DATABASE_URL)
+            try:
+                await conn.execute(f"DROP DATABASE IF EXISTS {DATABASE} WITH (FORCE)")
+            finally:
+                await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON and COPY database backups")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--jobs", type=int, default=db_backup_restore.DEFAULT_BACKUP_JOBS)
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {DATABASE} database after the run")
+    args = parser.parse_args()
+
+    db_backup_restore.logger.setLevel("WARNING")
+    asyncio.run(main_async(args.sizes, args.jobs, args.keep))
+
+
+if __name__ == "__main__":
+    main()
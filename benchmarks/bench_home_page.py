@@ -0,0 +1,155 @@
+"""
+Benchmark: home page data path, whole-table get_blogs_html vs targeted concurrent queries
+
+Seeds a scratch schema with 100, 1k and 10k blogs (a handful typed BLOG_HOME_PAGE) plus a few
+case studies, then times the old home page path — get_blogs_html over every blog followed by the
+case study query on the same connection — against the new one, which runs the LIMIT 3 home page
+query and the case study query concurrently on two pooled connections. Reports p50/p99 for each.
+
+Usage:
+    python benchmarks/bench_home_page.py --requests 200 --concurrency 10
+    python benchmarks/bench_home_page.py --sizes 100 1000 10000 --keep
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+import asyncpg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+from DATABASE_HANDLER.connection_pool import init_connection
+from DATABASE_HANDLER.utils.generate_blog_sections import (
+    compute_blog_card_fields,
+    get_blogs_html,
+    get_home_blog_data,
+    get_home_insights_html,
+)
+from DATABASE_HANDLER.utils.generate_case_study_sections import compute_case_study_card_fields, get_case_study_for_home
+from bench_pool import report, run
+
+SCHEMA = "bench_home_page"
+BLOG_TYPES = ["GENERAL"] * 8 + ["EDITORS_CHOICE"]
+WORDS = "content strategy ghostwriting linkedin audience growth brand founder story pipeline".split()
+
+
+def fake_blog_content(index):
+    paragraphs = [
+        {"type": "paragraph", "data": {"content": " ".join(random.choices(WORDS, k=120))}}
+        for _ in range(8)
+    ]
+    return {
+        "blogTitle": f"Benchmark blog {index}",
+        "blogSummary": " ".join(random.choices(WORDS, k=40)),
+        "blogCategory": "Marketing",
+        "mainImageUrl": f"/images/bench-{index}.png",
+        "blogcontent": {"content": paragraphs},
+    }
+
+
+async def seed(conn, n_blogs):
+    await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    await conn.execute(f"CREATE TABLE {SCHEMA}.blogs (LIKE public.blogs INCLUDING ALL)")
+    await conn.execute(f"CREATE TABLE {SCHEMA}.case_studies (LIKE public.case_studies INCLUDING ALL)")
+
+    home_indexes = {0, n_blogs // 2, n_blogs - 1}
+    rows = []
+    for i in range(n_blogs):
+        content = fake_blog_content(i)
+        card = compute_blog_card_fields(content)
+        blog_type = "BLOG_HOME_PAGE" if i in home_indexes else random.choice(BLOG_TYPES)
+        rows.append((json.dumps(content), f"bench-blog-{i}", blog_type, card["category"], card["title"],
+                     card["summary"], card["cover_image"], card["read_time"]))
+    await conn.executemany(
+        f"""
+        INSERT INTO {SCHEMA}.blogs (blogContent, status, slug, type, category, title, summary, cover_image, read_time,
+                                    created_at)
+        VALUES ($1, 'published', $2, $3, $4, $5, $6, $7, $8, CURRENT_TIMESTAMP - random() * INTERVAL '365 days')
+        """,
+        rows
+    )
+
+    for i in range(5):
+        preview = {"blogTitle": f"Benchmark case study {i}", "text": "<p>summary</p>", "imageUrl": "/images/cs.png",
+                   "projectSnapshots": [{"label": "Reach", "value": "10x"}]}
+        card = compute_case_study_card_fields(preview)
+        await conn.execute(
+            f"""
+            INSERT INTO {SCHEMA}.case_studies (case_study, status, preview, slug, type, title, summary, cover_image)
+            VALUES ('{{}}', 'published', $1, $2, 'CASE STUDY', $3, $4, $5)
+            """,
+            json.dumps(preview), f"bench-case-{i}", card["title"], card["summary"], card["cover_image"]
+        )
+    await conn.execute(f"ANALYZE {SCHEMA}.blogs")
+
+
+async def bench_size(n_blogs, n_requests, concurrency):
+    conn = await asyncpg.connect(config.DATABASE_URL)
+    try:
+        await seed(conn, n_blogs)
+    finally:
+        await conn.close()
+
+    pool = await asyncpg.create_pool(
+        config.DATABASE_URL,
+        min_size=config.DB_POOL_MIN_SIZE,
+        max_size=max(config.DB_POOL_MAX_SIZE, concurrency * 2),
+        init=init_connection,
+        server_settings={"search_path": SCHEMA}
+    )
+    try:
+        async def old_path():
+            async with pool.acquire() as conn:
+                _, _, _, _, _, blog_home_data = await get_blogs_html(conn)
+                await get_home_insights_html(blog_home_data)
+                await get_case_study_for_home(conn)
+
+        async def new_path():
+            async def home_blogs():
+                async with pool.acquire() as conn:
+                    return await get_home_blog_data(conn)
+
+            async def home_case_study():
+                async with pool.acquire() as conn:
+                    return await get_case_study_for_home(conn)
+
+            blog_home_data, _ = await asyncio.gather(home_blogs(), home_case_study())
+            await get_home_insights_html(blog_home_data)
+
+        print(f"\n/ data path with {n_blogs} blogs ({n_requests} requests, concurrency {concurrency})")
+        report("get_blogs_html + case study", *await run(n_requests, concurrency, old_path))
+        report("LIMIT 3 || case study", *await run(n_requests, concurrency, new_path))
+    finally:
+        await pool.close()
+
+
+async def main_async(sizes, n_requests, concurrency, keep):
+    try:
+        for size in sizes:
+            await bench_size(size, n_requests, concurrency)
+    finally:
+        if not keep:
+            conn = await asyncpg.connect(config.DATABASE_URL)
+            try:
+                await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            finally:
+                await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the old and new home page data paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {SCHEMA} schema after the run")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.sizes, args.requests, args.concurrency, args.keep))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: serializing the /api/blogs payload, jsonable_encoder + JSONResponse vs FastJSONResponse
+
+Builds the listing payload for 100, 1k and 10k synthetic blogs with _format_blog_list (every
+field including blogContent, datetimes and UUIDs left for the serializer) and times FastAPI's
+default path — jsonable_encoder followed by JSONResponse — against FastJSONResponse, with orjson
+and with the stdlib fallback. No database is needed. Reports p50/p99 per response and throughput in MB/s.
+
+Usage:
+    python benchmarks/bench_json_response.py --rounds 50
+    python benchmarks/bench_json_response.py --sizes 1000 10000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from API_ROUTERS.blogs_api_router import _format_blog_list
+from DATABASE_HANDLER.utils import json_response
+from DATABASE_HANDLER.utils.json_response import FastJSONResponse
+from bench_home_page import fake_blog_content
+from bench_pool import percentile
+
+
+def fake_rows(n_blogs):
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "blogcontent": fake_blog_content(i),
+            "title": f"Benchmark blog {i}",
+            "summary": "Benchmark summary",
+            "cover_image": f"/images/bench-{i}.png",
+            "cover_image_alt": None,
+            "read_time": 5,
+            "status": "published",
+            "date": date.today() - timedelta(days=i % 365),
+            "keyword": {"primary": "growth", "secondary": ["brand", "linkedin"]},
+            "slug": f"bench-blog-{i}",
+            "type": "GENERAL",
+            "redirect_url": None,
+            "category": "Marketing",
+            "isdeleted": False,
+            "created_at": now - timedelta(hours=i),
+            "updated_at": now,
+            "editors_choice": "N",
+        }
+        for i in range(n_blogs)
+    ]
+
+
+def stdlib_response(content):
+    orjson, json_response.orjson = json_response.orjson, None
+    try:
+        return FastJSONResponse(content)
+    finally:
+        json_response.orjson = orjson
+
+
+def time_variant(label, rounds, fn):
+    samples = []
+    size = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        size = len(fn().body)
+        samples.append(time.perf_counter() - start)
+    mb_per_second = size * len(samples) / sum(samples) / 1e6
+    print(f"  {label:<32} p50={percentile(samples, 50):8.2f}ms  p99={percentile(samples, 99):8.2f}ms  "
+          f"mean={statistics.mean(samples) * 1000:8.2f}ms  {mb_per_second:7.1f} MB/s")
+
+
+def bench_size(n_blogs, rounds):
+    payload = {"status": "success", "blogs": _format_blog_list(fake_rows(n_blogs)), "count": n_blogs}
+    reference = json.loads(JSONResponse(jsonable_encoder(payload)).body)
+    assert json.loads(FastJSONResponse(payload).body) == reference, "FastJSONResponse output differs"
+
+    print(f"\n/api/blogs payload with {n_blogs} blogs ({rounds} rounds)")
+    time_variant("jsonable_encoder + JSONResponse", rounds, lambda: JSONResponse(jsonable_encoder(payload)))
+    time_variant("FastJSONResponse (stdlib json)", rounds, lambda: stdlib_response(payload))
+    if json_response.orjson is not None:
+        time_variant("FastJSONResponse (orjson)", rounds, lambda: FastJSONResponse(payload))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON response serializers on the blogs listing payload")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        bench_size(size, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: decoding JSONB on the blogs listing, per-row json.loads vs a connection-level codec
+
+Seeds a scratch schema with 100, 1k and 10k blogs, then times the /api/blogs listing with
+fields=* (the query plus _format_blog_list) three ways: JSONB fetched as text and parsed with
+json.loads per row (the old defensive path), a stdlib json codec installed on the pool, and the
+orjson codec installed by DatabasePool's init hook. Reports p50/p99 for each.
+
+Usage:
+    python benchmarks/bench_jsonb_codec.py --requests 100 --concurrency 4
+    python benchmarks/bench_jsonb_codec.py --sizes 1000 --keep
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+import asyncpg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+from API_ROUTERS.blogs_api_router import _format_blog_list
+from DATABASE_HANDLER.connection_pool import init_connection, orjson
+from DATABASE_HANDLER.utils.generate_blog_sections import compute_blog_card_fields
+from bench_home_page import fake_blog_content
+from bench_pool import report, run
+
+SCHEMA = "bench_jsonb_codec"
+LISTING_QUERY = """
+    SELECT id, slug, title, summary, cover_image, cover_image_alt, category, status, type, date, editors_choice,
+           redirect_url, read_time, isdeleted, created_at, updated_at, keyword, blogContent
+    FROM blogs
+    WHERE isdeleted = FALSE
+    ORDER BY date DESC
+"""
+
+
+async def init_stdlib_codec(conn):
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog", format="text")
+
+
+async def seed(conn, n_blogs):
+    await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    await conn.execute(f"CREATE TABLE {SCHEMA}.blogs (LIKE public.blogs INCLUDING ALL)")
+
+    rows = []
+    for i in range(n_blogs):
+        content = fake_blog_content(i)
+        card = compute_blog_card_fields(content)
+        keyword = {"primary": random.choice(content["blogSummary"].split()), "secondary": ["growth", "brand"]}
+        rows.append((content, keyword, f"bench-blog-{i}", card["category"], card["title"], card["summary"],
+                     card["cover_image"], card["read_time"]))
+    await conn.executemany(
+        f"""
+        INSERT INTO {SCHEMA}.blogs (blogContent, keyword, status, slug, type, category, title, summary, cover_image,
+                                    read_time, date)
+        VALUES ($1, $2, 'published', $3, 'GENERAL', $4, $5, $6, $7, $8, CURRENT_DATE - (random() * 365)::int)
+        """,
+        rows
+    )
+    await conn.execute(f"ANALYZE {SCHEMA}.blogs")
+
+
+def parse_rows(rows):
+    """The old reader path: JSONB arrives as text and every row is parsed by hand."""
+    parsed = []
+    for row in rows:
+        blog = dict(row)
+        blog["blogcontent"] = json.loads(blog["blogcontent"]) if blog["blogcontent"] else {}
+        blog["keyword"] = json.loads(blog["keyword"]) if blog["keyword"] else None
+        parsed.append(blog)
+    return parsed
+
+
+async def bench_size(n_blogs, n_requests, concurrency):
+    conn = await asyncpg.connect(config.DATABASE_URL)
+    try:
+        await init_connection(conn)
+        await seed(conn, n_blogs)
+    finally:
+        await conn.close()
+
+    variants = [("text + json.loads per row", None, parse_rows), ("json codec", init_stdlib_codec, None)]
+    if orjson is not None:
+        variants.append(("orjson codec", init_connection, None))
+
+    print(f"\n/api/blogs listing with {n_blogs} blogs ({n_requests} requests, concurrency {concurrency})")
+    for label, init, parse in variants:
+        pool = await asyncpg.create_pool(
+            config.DATABASE_URL,
+            min_size=concurrency,
+            max_size=concurrency,
+            init=init,
+            server_settings={"search_path": SCHEMA}
+        )
+        try:
+            async def listing():
+                async with pool.acquire() as conn:
+                    rows = await conn.fetch(LISTING_QUERY)
+                _format_blog_list(parse(rows) if parse else rows)
+
+            report(label, *await run(n_requests, concurrency, listing))
+        finally:
+            await pool.close()
+
+
+async def main_async(sizes, n_requests, concurrency, keep):
+    try:
+        for size in sizes:
+            await bench_size(size, n_requests, concurrency)
+    finally:
+        if not keep:
+            conn = await asyncpg.connect(config.DATABASE_URL)
+            try:
+                await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            finally:
+                await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSONB decoding strategies on the blogs listing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {SCHEMA} schema after the run")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.sizes, args.requests, args.concurrency, args.keep))
+
+
+if __name__ == "__main__":
+    main()
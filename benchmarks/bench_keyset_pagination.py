@@ -0,0 +1,131 @@
+"""
+Benchmark: paging /api/pdf-downloads with LIMIT/OFFSET + COUNT(*) vs keyset cursors and a cached count
+
+Seeds a scratch schema with 10k, 100k and 1M pdf_downloads rows, then times fetching one page
+near the start, middle and end of the listing three ways: the old COUNT(*) followed by
+LIMIT/OFFSET, the keyset query with the count in the same round trip (cold count cache), and
+the keyset query alone (warm count cache). Reports p50/p99 for each.
+
+Usage:
+    python benchmarks/bench_keyset_pagination.py --requests 50
+    python benchmarks/bench_keyset_pagination.py --sizes 100000 --keep
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+import asyncpg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+from API_ROUTERS.blogs_api_router import PDF_DOWNLOAD_COLUMNS
+from DATABASE_HANDLER.utils.pagination import count_cache, encode_cursor, fetch_page_with_total, keyset_query
+from bench_pool import report, run
+
+SCHEMA = "bench_keyset_pagination"
+PER_PAGE = 10
+OFFSET_QUERY = f"""
+    SELECT {', '.join(PDF_DOWNLOAD_COLUMNS)}
+    FROM pdf_downloads
+    ORDER BY timestamp DESC
+    LIMIT $1 OFFSET $2
+"""
+
+
+async def seed(conn, n_rows):
+    await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    await conn.execute(f"CREATE TABLE {SCHEMA}.pdf_downloads (LIKE public.pdf_downloads INCLUDING ALL)")
+    await conn.execute(
+        f"""
+        INSERT INTO {SCHEMA}.pdf_downloads (timestamp, first_name, last_name, email, company_name, mobile_number, pdf_link)
+        SELECT NOW() - g * INTERVAL '1 minute', 'First ' || g, 'Last', 'user' || g || '@example.com', 'Company',
+               '9999999999', '/pdfs/guide-' || (g % 50) || '.pdf'
+        FROM generate_series(1, $1) AS g
+        """,
+        n_rows
+    )
+    await conn.execute(f"ANALYZE {SCHEMA}.pdf_downloads")
+
+
+async def cursor_for_page(conn, page):
+    """Walk the keyset to the page so the cursor variants start where the OFFSET variant does."""
+    if page == 1:
+        return None
+    row = await conn.fetchrow(
+        "SELECT timestamp, id FROM pdf_downloads ORDER BY timestamp DESC, id DESC LIMIT 1 OFFSET $1",
+        (page - 1) * PER_PAGE - 1
+    )
+    return encode_cursor(row["timestamp"], row["id"])
+
+
+async def bench_size(n_rows, n_requests, concurrency):
+    conn = await asyncpg.connect(config.DATABASE_URL)
+    try:
+        await seed(conn, n_rows)
+    finally:
+        await conn.close()
+
+    pool = await asyncpg.create_pool(
+        config.DATABASE_URL,
+        min_size=concurrency,
+        max_size=concurrency,
+        server_settings={"search_path": SCHEMA}
+    )
+    try:
+        last_page = (n_rows + PER_PAGE - 1) // PER_PAGE
+        for label, page in [("first page", 1), ("middle page", last_page // 2), ("last page", last_page)]:
+            async with pool.acquire() as conn:
+                cursor = await cursor_for_page(conn, page)
+            query, query_params = keyset_query(
+                "pdf_downloads", PDF_DOWNLOAD_COLUMNS, [], [], "timestamp", True, cursor, PER_PAGE,
+                sort_columns={"timestamp": datetime.fromisoformat}
+            )
+
+            async def offset_page():
+                async with pool.acquire() as conn:
+                    await conn.fetchval("SELECT COUNT(*) FROM pdf_downloads")
+                    await conn.fetch(OFFSET_QUERY, PER_PAGE, (page - 1) * PER_PAGE)
+
+            async def keyset_page(cold):
+                if cold:
+                    count_cache.invalidate("pdf_downloads")
+                async with pool.acquire() as conn:
+                    await fetch_page_with_total(conn, "pdf_downloads", [], [], query, query_params, "timestamp", True)
+
+            print(f"\n/api/pdf-downloads {label} ({page}) of {n_rows} rows ({n_requests} requests, concurrency {concurrency})")
+            report("COUNT(*) + LIMIT/OFFSET", *await run(n_requests, concurrency, offset_page))
+            report("keyset, count in same query", *await run(n_requests, concurrency, lambda: keyset_page(True)))
+            report("keyset, cached count", *await run(n_requests, concurrency, lambda: keyset_page(False)))
+    finally:
+        await pool.close()
+
+
+async def main_async(sizes, n_requests, concurrency, keep):
+    try:
+        for size in sizes:
+            await bench_size(size, n_requests, concurrency)
+    finally:
+        if not keep:
+            conn = await asyncpg.connect(config.DATABASE_URL)
+            try:
+                await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            finally:
+                await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OFFSET and keyset pagination on the PDF downloads listing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {SCHEMA} schema after the run")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.sizes, args.requests, args.concurrency, args.keep))
+
+
+if __name__ == "__main__":
+    main()
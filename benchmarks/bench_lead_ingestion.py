@@ -0,0 +1,108 @@
+"""
+Benchmark: recording PDF download leads with one INSERT per request vs the spooled batch buffer
+
+Submits N leads from concurrent clients two ways against a scratch schema: the old
+RECORD_PDF_DOWNLOAD_QUERY per request, and LeadIngestionBuffer.submit (spool append + fsync,
+with COPY batches flushed in the background). Reports p50/p99 acknowledgement latency for each
+and how long the buffer takes to drain what is left at shutdown.
+
+Usage:
+    python benchmarks/bench_lead_ingestion.py --requests 2000
+    python benchmarks/bench_lead_ingestion.py --requests 5000 --concurrency 32 --keep
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import asyncpg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+from DATABASE_HANDLER.connection_pool import db_pool, init_connection
+from DATABASE_HANDLER.utils.lead_ingestion import LeadIngestionBuffer
+from DATABASE_HANDLER.utils.pdf_download_rollups import RECORD_PDF_DOWNLOAD_QUERY
+from bench_pool import report, run
+
+SCHEMA = "bench_lead_ingestion"
+
+
+async def seed(conn):
+    await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    for table in ("pdf_downloads", "pdf_download_daily", "pdf_download_totals"):
+        await conn.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)")
+
+
+def lead(n):
+    return (f"First {n}", "Last", f"user{n}@example.com", "Company", "9999999999", f"/pdfs/guide-{n % 50}.pdf")
+
+
+async def main_async(n_requests, concurrency, batch_size, keep):
+    conn = await asyncpg.connect(config.DATABASE_URL)
+    try:
+        await seed(conn)
+    finally:
+        await conn.close()
+
+    pool = await asyncpg.create_pool(
+        config.DATABASE_URL,
+        min_size=config.DB_POOL_MIN_SIZE,
+        max_size=config.DB_POOL_MAX_SIZE,
+        init=init_connection,
+        server_settings={"search_path": SCHEMA}
+    )
+    # The buffer writes through the app's pool; point it at the scratch schema
+    db_pool._pool = pool
+    try:
+        counter = iter(range(2 * n_requests))
+
+        async def direct():
+            async with pool.acquire() as conn:
+                await conn.execute(RECORD_PDF_DOWNLOAD_QUERY, *lead(next(counter)))
+
+        print(f"\nPDF download form, {n_requests} leads (concurrency {concurrency}, batch size {batch_size})")
+        report("INSERT per request", *await run(n_requests, concurrency, direct))
+
+        with tempfile.TemporaryDirectory() as spool_dir:
+            buffer = LeadIngestionBuffer(os.path.join(spool_dir, "leads.jsonl"), batch_size,
+                                         config.LEAD_FLUSH_INTERVAL, config.LEAD_DEDUPE_WINDOW)
+            await buffer.start()
+
+            async def buffered():
+                await buffer.submit(*lead(next(counter)))
+
+            report("spool + batched COPY", *await run(n_requests, concurrency, buffered))
+            started = time.perf_counter()
+            await buffer.stop()
+            print(f"  drained the rest on stop in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+        async with pool.acquire() as conn:
+            stored = await conn.fetchval("SELECT COUNT(*) FROM pdf_downloads")
+        print(f"  {stored} leads stored")
+    finally:
+        db_pool._pool = None
+        await pool.close()
+        if not keep:
+            conn = await asyncpg.connect(config.DATABASE_URL)
+            try:
+                await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            finally:
+                await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-request lead inserts with the batched lead buffer")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=config.LEAD_BATCH_SIZE)
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {SCHEMA} schema after the run")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.requests, args.concurrency, args.batch_size, args.keep))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: page latency during uploads, minio called on the event loop vs through ObjectStorage
+
+Serves a page route next to the image upload route from uvicorn, in a thread of its own, and
+measures page p50/p99 over HTTP three ways: with no
+uploads, while concurrent clients upload through a handler that calls the minio SDK directly (the
+old serve_images_api_router behaviour), and while they upload through /api/upload-image, which
+runs the SDK on the ObjectStorage thread pool. By default the SDK is replaced by one that blocks
+for --latency seconds per call, like a put to a remote bucket; --real uploads to the configured
+MinIO bucket instead (the objects are removed afterwards).
+
+Usage:
+    python benchmarks/bench_object_storage.py
+    python benchmarks/bench_object_storage.py --uploaders 16 --latency 0.2 --size 2000000 --seconds 20
+    python benchmarks/bench_object_storage.py --real
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+from io import BytesIO
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, File, UploadFile
+from fastapi.responses import HTMLResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from API_ROUTERS.serve_images_api_router import router as serve_images_api_router
+from DATABASE_HANDLER.utils.object_storage import object_storage
+from bench_pool import report
+
+PAGE = "<html><body>" + "<p>Benchmark page</p>" * 200 + "</body></html>"
+
+
+class SimulatedMinio:
+    """Stands in for the minio client: each call blocks its thread for `latency` seconds."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def put_object(self, bucket_name, object_name, data, length, content_type, **kwargs):
+        data.read()
+        time.sleep(self.latency)
+
+    def remove_object(self, bucket_name, object_name):
+        time.sleep(self.latency)
+
+
+def build_app():
+    app = FastAPI()
+    app.include_router(serve_images_api_router)
+
+    @app.get("/page")
+    async def page():
+        return HTMLResponse(PAGE)
+
+    @app.post("/blocking/upload-image")
+    async def blocking_upload_image(file: UploadFile = File(...)):
+        data = await file.read()
+        object_name = f"{uuid.uuid4()}.png"
+        object_storage.client.put_object(
+            bucket_name=object_storage.bucket_name,
+            object_name=object_name,
+            data=BytesIO(data),
+            length=len(data),
+            content_type="image/png"
+        )
+        return {"object_name": object_name}
+
+    return app
+
+
+async def main_async(seconds, concurrency, uploaders, payload_size, latency, real, port):
+    if not real:
+        object_storage.client = SimulatedMinio(latency)
+    payload = os.urandom(payload_size)
+    uploaded = []
+
+    # The server gets its own event loop, so a blocked loop shows up as client-side latency
+    server = uvicorn.Server(uvicorn.Config(build_app(), host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=concurrency + uploaders)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=None) as client:
+        async def pages(deadline, samples):
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get("/page")
+                response.raise_for_status()
+                samples.append(time.perf_counter() - started)
+
+        async def measure(label, upload_path):
+            stop = asyncio.Event()
+            completed = 0
+
+            async def uploader():
+                nonlocal completed
+                while not stop.is_set():
+                    response = await client.post(upload_path, files={"file": ("bench.png", payload, "image/png")})
+                    response.raise_for_status()
+                    uploaded.append(response.json()["object_name"])
+                    completed += 1
+
+            tasks = [asyncio.create_task(uploader()) for _ in range(uploaders if upload_path else 0)]
+            # Let the uploads get going before measuring
+            await asyncio.sleep(0.2 if tasks else 0)
+            # Timed rather than counted: with the SDK on the event loop, pages barely get a turn
+            samples = []
+            started = time.perf_counter()
+            await asyncio.gather(*(pages(started + seconds, samples) for _ in range(concurrency)))
+            wall = time.perf_counter() - started
+            stop.set()
+            await asyncio.gather(*tasks)
+            report(label, samples, wall)
+            if tasks:
+                print(f"  {'':<28} {completed} uploads of {payload_size} bytes alongside")
+
+        source = "the configured bucket" if real else f"a simulated bucket, {latency * 1000:.0f}ms per call"
+        print(f"\n/page latency ({seconds}s each, concurrency {concurrency}) with {uploaders} concurrent uploaders to {source}")
+        await measure("no uploads", None)
+        await measure("minio on the event loop", "/blocking/upload-image")
+        await measure("ObjectStorage thread pool", "/api/upload-image")
+
+    server.should_exit = True
+    thread.join()
+    if real:
+        for object_name in uploaded:
+            await object_storage.remove_object(object_name)
+    object_storage.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare page latency during uploads with and without the ObjectStorage thread pool")
+    parser.add_argument("--seconds", type=float, default=10, help="How long pages are requested in each case")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--uploaders", type=int, default=8)
+    parser.add_argument("--size", type=int, default=500000, help="Bytes per upload")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds each simulated minio call blocks")
+    parser.add_argument("--real", action="store_true", help="Upload to the configured MinIO bucket")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.seconds, args.concurrency, args.uploaders, args.size, args.latency, args.real, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: /api/pdf-downloads-kpi scanning pdf_downloads vs reading the rollups
+
+Seeds a scratch schema with 10k, 100k and 1M leads spread over two years and 50 PDFs, builds
+pdf_download_daily and pdf_download_totals from them, then times the old three full-table queries against
+fetch_pdf_download_kpis. Reports p50/p99 for each.
+
+Usage:
+    python benchmarks/bench_pdf_kpi.py --requests 50
+    python benchmarks/bench_pdf_kpi.py --sizes 100000 --keep
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import asyncpg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+from DATABASE_HANDLER.utils.pdf_download_rollups import fetch_pdf_download_kpis, rebuild_pdf_download_rollups
+from bench_pool import report, run
+
+SCHEMA = "bench_pdf_kpi"
+SCAN_QUERIES = [
+    "SELECT COUNT(*) FROM pdf_downloads WHERE timestamp >= date_trunc('month', CURRENT_DATE)",
+    "SELECT pdf_link, COUNT(*) AS download_count FROM pdf_downloads GROUP BY pdf_link ORDER BY download_count DESC LIMIT 1",
+    "SELECT COUNT(*) FROM pdf_downloads",
+]
+
+
+async def seed(conn, n_rows):
+    await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    for table in ("pdf_downloads", "pdf_download_daily", "pdf_download_totals"):
+        await conn.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)")
+    await conn.execute(
+        f"""
+        INSERT INTO {SCHEMA}.pdf_downloads (timestamp, first_name, email, pdf_link)
+        SELECT NOW() - random() * INTERVAL '730 days', 'First ' || g, 'user' || g || '@example.com',
+               '/pdfs/guide-' || (g % 50) || '.pdf'
+        FROM generate_series(1, $1) AS g
+        """,
+        n_rows
+    )
+    await conn.execute(f"SET search_path TO {SCHEMA}")
+    await rebuild_pdf_download_rollups(conn)
+    await conn.execute(f"ANALYZE {SCHEMA}.pdf_downloads")
+    await conn.execute(f"ANALYZE {SCHEMA}.pdf_download_daily")
+    await conn.execute(f"ANALYZE {SCHEMA}.pdf_download_totals")
+
+
+async def bench_size(n_rows, n_requests, concurrency):
+    conn = await asyncpg.connect(config.DATABASE_URL)
+    try:
+        await seed(conn, n_rows)
+    finally:
+        await conn.close()
+
+    pool = await asyncpg.create_pool(
+        config.DATABASE_URL,
+        min_size=concurrency,
+        max_size=concurrency,
+        server_settings={"search_path": SCHEMA}
+    )
+    try:
+        async def scan():
+            async with pool.acquire() as conn:
+                for query in SCAN_QUERIES:
+                    await conn.fetch(query)
+
+        async def rollups():
+            async with pool.acquire() as conn:
+                await fetch_pdf_download_kpis(conn)
+
+        print(f"\n/api/pdf-downloads-kpi with {n_rows} leads ({n_requests} requests, concurrency {concurrency})")
+        report("scan pdf_downloads (3 queries)", *await run(n_requests, concurrency, scan))
+        report("rollups (1 query)", *await run(n_requests, concurrency, rollups))
+    finally:
+        await pool.close()
+
+
+async def main_async(sizes, n_requests, concurrency, keep):
+    try:
+        for size in sizes:
+            await bench_size(size, n_requests, concurrency)
+    finally:
+        if not keep:
+            conn = await asyncpg.connect(config.DATABASE_URL)
+            try:
+                await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            finally:
+                await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PDF download KPI queries on the raw table and on the rollups")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--keep", action="store_true", help=f"Keep the {SCHEMA} schema after the run")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args.sizes, args.requests, args.concurrency, args.keep))
+
+
+if __name__ == "__main__":
+    main()
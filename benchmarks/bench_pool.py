@@ -0,0 +1,140 @@
+"""
+Benchmark: connect-per-request vs pooled connections
+
+Replays the queries behind `/blog/{slug}` and `/` against Postgres twice — once opening a
+fresh asyncpg connection per request (the old handler behaviour) and once borrowing from
+an asyncpg pool — and reports p50/p99 latency for each. Optionally also hits a running
+server over HTTP.
+
+Usage:
+    python benchmarks/bench_pool.py --requests 500 --concurrency 20
+    python benchmarks/bench_pool.py --base-url http://localhost:8000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import asyncpg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+
+BLOG_QUERY = """
+    SELECT id, blogContent, status, date, slug, isDeleted, created_at
+    FROM blogs
+    WHERE isDeleted = FALSE
+    ORDER BY created_at DESC
+"""
+HOME_BLOGS_QUERY = """
+    SELECT id, blogContent, date, created_at, slug, type
+    FROM blogs
+    WHERE isdeleted = FALSE
+    ORDER BY created_at DESC
+"""
+HOME_CASE_STUDY_QUERY = """
+    SELECT slug, preview
+    FROM case_studies
+    WHERE isdeleted = FALSE AND status = 'published' AND type = 'CASE STUDY'
+    ORDER BY CASE WHEN editors_choice = 'Y' THEN 0 ELSE 1 END, date DESC
+    LIMIT 1
+"""
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile (0-100) of samples in milliseconds."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index] * 1000
+
+
+def report(label, samples, wall):
+    print(f"  {label:<28} p50={percentile(samples, 50):7.2f}ms  p99={percentile(samples, 99):7.2f}ms  "
+          f"mean={statistics.mean(samples) * 1000:7.2f}ms  rps={len(samples) / wall:8.1f}")
+
+
+async def run(n_requests, concurrency, fn):
+    """Run fn n_requests times with bounded concurrency and return (latencies, wall time)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await fn()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n_requests)))
+    return latencies, time.perf_counter() - start
+
+
+async def blog_page(conn):
+    await conn.fetch(BLOG_QUERY)
+
+
+async def home_page(conn):
+    await conn.fetch(HOME_BLOGS_QUERY)
+    await conn.fetchrow(HOME_CASE_STUDY_QUERY)
+
+
+async def bench_database(n_requests, concurrency):
+    pool = await asyncpg.create_pool(config.DATABASE_URL, min_size=config.DB_POOL_MIN_SIZE,
+                                     max_size=max(config.DB_POOL_MAX_SIZE, concurrency))
+    try:
+        for name, page in (("/blog/{slug}", blog_page), ("/", home_page)):
+            print(f"\n{name} queries ({n_requests} requests, concurrency {concurrency})")
+
+            async def per_request():
+                conn = await asyncpg.connect(config.DATABASE_URL)
+                try:
+                    await page(conn)
+                finally:
+                    await conn.close()
+
+            async def pooled():
+                async with pool.acquire() as conn:
+                    await page(conn)
+
+            report("connect-per-request", *await run(n_requests, concurrency, per_request))
+            report("pooled", *await run(n_requests, concurrency, pooled))
+    finally:
+        await pool.close()
+
+
+async def bench_http(base_url, slug, n_requests, concurrency):
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        if slug is None:
+            response = await client.get("/api/blogs")
+            blogs = response.json().get("blogs", []) if response.status_code == 200 else []
+            slug = blogs[0]["slug"] if blogs else None
+
+        paths = ["/"] + ([f"/blog/{slug}"] if slug else [])
+        for path in paths:
+            async def hit():
+                response = await client.get(path)
+                response.raise_for_status()
+
+            print(f"\nHTTP GET {path} ({n_requests} requests, concurrency {concurrency})")
+            report(base_url, *await run(n_requests, concurrency, hit))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare connect-per-request and pooled connection latency")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--base-url", help="Also benchmark a running server, e.g. http://localhost:8000")
+    parser.add_argument("--slug", help="Blog slug to request over HTTP (defaults to the most recent blog)")
+    args = parser.parse_args()
+
+    asyncio.run(bench_database(args.requests, args.concurrency))
+    if args.base_url:
+        asyncio.run(bench_http(args.base_url, args.slug, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Static Asset Compression Script
+Writes .gz and .br sidecars next to every compressible file in the static directories so
+PrecompressedStaticFiles can serve them without compressing per request.
+
+Run as a build step (and after editing static files):
+    python compress_static_assets.py
+    python compress_static_assets.py --clean
+.br sidecars are only written when the brotli package is installed.
+"""
+
+import os
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from DATABASE_HANDLER.utils.compression import COMPRESSIBLE_EXTENSIONS, SIDECAR_EXTENSIONS, SUPPORTED_ENCODINGS, compress
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIRECTORIES = [
+    os.path.join(BASE_DIR, "PAGE_SERVING_ROUTERS", name)
+    for name in ("CSS", "JS", "IMAGES", "ICONS", "FONTS", "PAGES")
+]
+MIN_SIZE_BYTES = 512
+
+
+def iter_static_files(directories: list[str]):
+    """
+    Yield every compressible file under the given directories, skipping existing sidecars
+    """
+    sidecar_extensions = tuple(SIDECAR_EXTENSIONS.values())
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(sidecar_extensions):
+                    continue
+                if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                    yield os.path.join(root, name)
+
+
+def compress_file(path: str, force: bool = False) -> dict:
+    """
+    Write the sidecars for one file
+
+    Sidecars take the original's mtime, which is how the static server tells they are current.
+    A sidecar that would not be smaller than the original is not written.
+
+    Args:
+        path: Original file
+        force: Rewrite sidecars even if they are already current
+
+    Returns:
+        Dictionary of encoding -> (original size, compressed size) for the sidecars written
+    """
+    original_stat = os.stat(path)
+    written = {}
+    if original_stat.st_size < MIN_SIZE_BYTES:
+        return written
+
+    data = None
+    for encoding in SUPPORTED_ENCODINGS:
+        sidecar_path = path + SIDECAR_EXTENSIONS[encoding]
+        if not force and os.path.exists(sidecar_path) and os.stat(sidecar_path).st_mtime_ns == original_stat.st_mtime_ns:
+            continue
+
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        compressed = compress(data, encoding)
+        if len(compressed) >= len(data):
+            if os.path.exists(sidecar_path):
+                os.remove(sidecar_path)
+            continue
+
+        with open(sidecar_path, "wb") as f:
+            f.write(compressed)
+        os.utime(sidecar_path, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns))
+        written[encoding] = (len(data), len(compressed))
+    return written
+
+
+def build(directories: list[str], force: bool = False, workers: int = 4):
+    """
+    Write sidecars for every compressible static file
+    """
+    paths = list(iter_static_files(directories))
+    totals = {encoding: [0, 0, 0] for encoding in SUPPORTED_ENCODINGS}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for path, written in zip(paths, executor.map(lambda p: compress_file(p, force), paths)):
+            for encoding, (original_size, compressed_size) in written.items():
+                totals[encoding][0] += 1
+                totals[encoding][1] += original_size
+                totals[encoding][2] += compressed_size
+                logger.debug(f"{os.path.relpath(path, BASE_DIR)}{SIDECAR_EXTENSIONS[encoding]}: {original_size} -> {compressed_size} bytes")
+
+    logger.info(f"Scanned {len(paths)} compressible files")
+    for encoding, (count, original_size, compressed_size) in totals.items():
+        if count:
+            logger.info(f"Wrote {count} {encoding} sidecars: {original_size} -> {compressed_size} bytes")
+        else:
+            logger.info(f"All {encoding} sidecars already current")
+    if "br" not in SUPPORTED_ENCODINGS:
+        logger.warning("brotli is not installed; only gzip sidecars were written")
+
+
+def clean(directories: list[str]):
+    """
+    Remove every sidecar from the static directories
+    """
+    sidecar_extensions = tuple(SIDECAR_EXTENSIONS.values())
+    removed = 0
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(sidecar_extensions) and os.path.exists(os.path.join(root, name[:name.rfind(".")])):
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+    logger.info(f"Removed {removed} sidecars")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write .gz/.br sidecars for the static asset directories")
+    parser.add_argument("--force", action="store_true", help="Rewrite sidecars even if they are current")
+    parser.add_argument("--clean", action="store_true", help="Remove all sidecars instead of writing them")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    if args.clean:
+        clean(STATIC_DIRECTORIES)
+    else:
+        build(STATIC_DIRECTORIES, force=args.force, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _page_cache_policy(route: str, ttl: int, stale: int) -> tuple:
+    """
+    Read the (ttl, stale window) pair in seconds for one cached page route
+    Overridable through PAGE_CACHE_<ROUTE>_TTL and PAGE_CACHE_<ROUTE>_STALE
+    """
+    return (
+        int(os.getenv(f"PAGE_CACHE_{route}_TTL", str(ttl))),
+        int(os.getenv(f"PAGE_CACHE_{route}_STALE", str(stale)))
+    )
+
+
 class Config:
     """
     Application configuration management
@@ -19,6 +30,45 @@ class Config:
     DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
     DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
     
+    PAGE_CACHE_MAX_BYTES: int = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    PAGE_CACHE_POLICIES: dict = {
+        "home": _page_cache_policy("HOME", 60, 600),
+        "blogs_landing": _page_cache_policy("BLOGS_LANDING", 60, 600),
+        "blog": _page_cache_policy("BLOG", 300, 3600),
+        "case_study": _page_cache_policy("CASE_STUDY", 300, 3600),
+        "portfolio": _page_cache_policy("PORTFOLIO", 120, 600),
+        "sitemap": _page_cache_policy("SITEMAP", 3600, 86400),
+    }
+    
+    # Seconds a listing total is reused across pages before it is counted again; writes drop it sooner
+    COUNT_CACHE_TTL: int = int(os.getenv("COUNT_CACHE_TTL", "60"))
+    
+    # PDF download leads are spooled to this file and written to the database in batches
+    # (LEAD_BATCH_SIZE leads or every LEAD_FLUSH_INTERVAL seconds); repeats of an email + pdf_link
+    # within LEAD_DEDUPE_WINDOW seconds are coalesced. Each process needs its own spool file.
+    LEAD_SPOOL_PATH: str = os.getenv("LEAD_SPOOL_PATH", "lead_spool/pdf_downloads.jsonl")
+    LEAD_BATCH_SIZE: int = int(os.getenv("LEAD_BATCH_SIZE", "200"))
+    LEAD_FLUSH_INTERVAL: float = float(os.getenv("LEAD_FLUSH_INTERVAL", "2"))
+    LEAD_DEDUPE_WINDOW: float = float(os.getenv("LEAD_DEDUPE_WINDOW", "600"))
+    
+    # Threads running calls to the synchronous minio SDK for the image and file routes; more
+    # concurrent uploads or listings than this wait their turn instead of blocking the event loop
+    OBJECT_STORAGE_WORKERS: int = int(os.getenv("OBJECT_STORAGE_WORKERS", "8"))
+    # Uploads are streamed to the bucket in parts of this many bytes (5MB at least, the S3 minimum),
+    # so an upload holds one part in memory however large the file
+    OBJECT_STORAGE_PART_SIZE: int = int(os.getenv("OBJECT_STORAGE_PART_SIZE", str(5 * 1024 * 1024)))
+    
+    # Largest upload accepted per kind of file, in bytes; anything bigger is refused with 413
+    UPLOAD_MAX_IMAGE_BYTES: int = int(os.getenv("UPLOAD_MAX_IMAGE_BYTES", str(10 * 1024 * 1024)))
+    UPLOAD_MAX_PDF_BYTES: int = int(os.getenv("UPLOAD_MAX_PDF_BYTES", str(50 * 1024 * 1024)))
+    UPLOAD_MAX_FILE_BYTES: int = int(os.getenv("UPLOAD_MAX_FILE_BYTES", str(25 * 1024 * 1024)))
+    
+    # Pre-rendered site written by generate_static_site.py; pages are served from it when STATIC_SITE_SERVE is set
+    STATIC_SITE_DIR: str = os.getenv("STATIC_SITE_DIR", "static_site")
+    STATIC_SITE_SERVE: bool = os.getenv("STATIC_SITE_SERVE", "False").lower() == "true"
+    STATIC_SITE_BUILD_ON_STARTUP: bool = os.getenv("STATIC_SITE_BUILD_ON_STARTUP", "False").lower() == "true"
+    STATIC_SITE_WORKERS: int = int(os.getenv("STATIC_SITE_WORKERS", str(os.cpu_count() or 2)))
+    
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     API_PORT: int = int(os.getenv("API_PORT", "5000"))
     
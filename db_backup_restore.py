@@ -1,18 +1,24 @@
 """
 Database Backup and Restore Script
-Provides functionality to backup all tables to JSON files and restore them with table selection.
+Provides functionality to backup all tables to gzip-compressed CSV (via COPY) or JSON files,
+optionally with a snapshot of the object storage bucket, and restore them with table selection.
 """
 
 import os
+import gzip
 import json
 import asyncio
+import hashlib
 import logging
+import time
 import asyncpg
 from dotenv import load_dotenv
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from decimal import Decimal
 from uuid import UUID
 from typing import Optional
+from DATABASE_HANDLER.utils.pdf_download_rollups import rebuild_pdf_download_rollups
+from object_backup import backup_objects, load_snapshot
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -21,6 +27,38 @@ load_dotenv()
 DATABASE_URL = os.getenv("POSTGRES_CONNECTION_URL")
 DEFAULT_BACKUP_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "database_backup")
 
+# Tables copied at once in a COPY backup, each on its own connection
+DEFAULT_BACKUP_JOBS = 4
+
+# Pin the text output of COPY so a backup reads back the same whatever the server defaults are.
+# The time zone is UTC, as on the app's pool, so the watermark is on the clock the rows were stamped with
+COPY_SESSION_SETTINGS = {"DateStyle": "ISO, YMD", "IntervalStyle": "postgres", "extra_float_digits": "3", "timezone": "UTC"}
+
+# A restore session: COPY settings, and no tombstones for the rows it clears
+RESTORE_SESSION_SETTINGS = {**COPY_SESSION_SETTINGS, "app.skip_tombstones": "on"}
+
+# COPY output is gathered into writes (and restore reads) of this many bytes
+COPY_IO_CHUNK_SIZE = 1024 * 1024
+
+# Hard deletes recorded by the record_deleted_row trigger; backup bookkeeping, so never backed up itself
+TOMBSTONE_TABLE = "deleted_rows"
+
+# Columns that mark a row as new or changed; an incremental backup exports rows where any is past the watermark
+WATERMARK_COLUMNS = ("created_at", "updated_at", "timestamp")
+
+# Each incremental backup re-reads this far before the previous watermark, catching rows stamped
+# before it but committed after it (buffered leads carry the time they were submitted)
+INCREMENTAL_OVERLAP = timedelta(minutes=15)
+
+# The watermark is when the snapshot was taken, or earlier if a write that started before then is
+# still open: its rows carry its start time but are not in the snapshot. It is taken in the session
+# time zone, like the CURRENT_TIMESTAMP defaults it is compared with
+WATERMARK_QUERY = """
+    SELECT LEAST(clock_timestamp(), MIN(xact_start))::timestamp
+    FROM pg_stat_activity
+    WHERE backend_xid IS NOT NULL AND pid <> pg_backend_pid()
+"""
+
 
 class CustomJSONEncoder(json.JSONEncoder):
     """
@@ -101,12 +139,177 @@ async def get_table_schema(conn: asyncpg.Connection, table_name: str) -> list[di
     return [dict(row) for row in rows]
 
 
-async def backup_database(backup_folder: Optional[str] = None):
+async def copy_table_to_file(conn: asyncpg.Connection, table_name: str, file_path: str, query: Optional[str] = None, params: tuple = ()) -> tuple[int, str]:
+    """
+    Streams a table, or the rows of `query`, through COPY into a gzip-compressed CSV file with a header row.
+    Only COPY_IO_CHUNK_SIZE bytes are held at a time; compression runs off the event loop.
+    
+    Returns:
+        Row count and the sha256 of the uncompressed CSV
+    """
+    digest = hashlib.sha256()
+    pending = []
+    pending_size = 0
+    
+    with gzip.open(file_path, 'wb') as f:
+        async def write(chunk: bytes):
+            nonlocal pending_size
+            digest.update(chunk)
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= COPY_IO_CHUNK_SIZE:
+                data = b"".join(pending)
+                pending.clear()
+                pending_size = 0
+                await asyncio.to_thread(f.write, data)
+        
+        if query:
+            status = await conn.copy_from_query(query, *params, output=write, format='csv', header=True)
+        else:
+            status = await conn.copy_from_table(table_name, output=write, format='csv', header=True)
+        if pending:
+            await asyncio.to_thread(f.write, b"".join(pending))
+    
+    return int(status.split()[-1]), digest.hexdigest()
+
+
+async def backup_tables_copy(conn: asyncpg.Connection, tables: list[str], backup_subfolder: str, jobs: int, since: Optional[datetime] = None) -> dict:
+    """
+    Backs up tables concurrently, one COPY per table, on up to `jobs` connections.
+    Every worker imports the snapshot exported by `conn`, so all tables are copied as of the same moment.
+    
+    With `since`, only rows with a WATERMARK_COLUMNS value from INCREMENTAL_OVERLAP before it are
+    copied (tables without one are copied whole), along with the tombstones recorded in that window.
+    
+    Returns:
+        Dictionary with the metadata "tables" entries, the "watermark" and, with `since`, "tombstones"
+    """
+    # Largest first, so the long copies start early and the workers finish together
+    sizes = await conn.fetch(
+        "SELECT relname, pg_total_relation_size(oid) AS size FROM pg_class WHERE relname = ANY($1::text[]) AND relkind = 'r' AND relnamespace = 'public'::regnamespace",
+        tables
+    )
+    size_by_table = {row['relname']: row['size'] for row in sizes}
+    pending_tables = iter(sorted(tables, key=lambda table_name: size_by_table.get(table_name, 0), reverse=True))
+    lower_bound = since - INCREMENTAL_OVERLAP if since else None
+    
+    results = {}
+    backup = {}
+    async with conn.transaction(isolation='repeatable_read', readonly=True):
+        snapshot = await conn.fetchval("SELECT pg_export_snapshot()")
+        backup["watermark"] = await conn.fetchval(WATERMARK_QUERY)
+        
+        async def worker():
+            worker_conn = await asyncpg.connect(DATABASE_URL, server_settings=COPY_SESSION_SETTINGS)
+            try:
+                async with worker_conn.transaction(isolation='repeatable_read', readonly=True):
+                    await worker_conn.execute(f"SET TRANSACTION SNAPSHOT '{snapshot}'")
+                    for table_name in pending_tables:
+                        logger.info(f"Backing up table: {table_name}")
+                        schema = await get_table_schema(worker_conn, table_name)
+                        columns = [column['column_name'] for column in schema]
+                        watermark_columns = [col for col in WATERMARK_COLUMNS if col in columns]
+                        
+                        query = None
+                        if lower_bound and watermark_columns:
+                            query = f'SELECT * FROM "{table_name}" WHERE ' + ' OR '.join([f'"{col}" >= $1' for col in watermark_columns])
+                        
+                        file_name = f"{table_name}.csv.gz"
+                        row_count, checksum = await copy_table_to_file(
+                            worker_conn, table_name, os.path.join(backup_subfolder, file_name), query, (lower_bound,) if query else ()
+                        )
+                        results[table_name] = {
+                            "table_name": table_name,
+                            "row_count": row_count,
+                            "file": file_name,
+                            "format": "csv.gz",
+                            "sha256": checksum,
+                            "columns": columns,
+                            "schema": schema
+                        }
+                        if lower_bound:
+                            results[table_name]["mode"] = "delta" if query else "full"
+                        logger.info(f"  - Backed up {row_count} {'changed ' if query else ''}rows of {table_name}")
+            finally:
+                await worker_conn.close()
+        
+        await asyncio.gather(*(worker() for _ in range(max(1, min(jobs, len(tables))))))
+        
+        if lower_bound:
+            file_name = "_tombstones.csv.gz"
+            row_count, checksum = await copy_table_to_file(
+                conn, TOMBSTONE_TABLE, os.path.join(backup_subfolder, file_name),
+                f"SELECT table_name, row_id, deleted_at FROM {TOMBSTONE_TABLE} WHERE deleted_at >= $1 ORDER BY deleted_at", (lower_bound,)
+            )
+            backup["tombstones"] = {"file": file_name, "row_count": row_count, "sha256": checksum, "format": "csv.gz"}
+            logger.info(f"  - Backed up {row_count} tombstones")
+    
+    backup["tables"] = [results[table_name] for table_name in tables]
+    return backup
+
+
+async def backup_tables_json(conn: asyncpg.Connection, tables: list[str], backup_subfolder: str) -> list[dict]:
+    """
+    Backs up tables one at a time to indented JSON files, each holding its schema and every row.
+    """
+    entries = []
+    for table_name in tables:
+        logger.info(f"Backing up table: {table_name}")
+        
+        data = await get_table_data(conn, table_name)
+        schema = await get_table_schema(conn, table_name)
+        
+        table_backup = {
+            "table_name": table_name,
+            "schema": schema,
+            "row_count": len(data),
+            "data": data
+        }
+        
+        file_path = os.path.join(backup_subfolder, f"{table_name}.json")
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(table_backup, f, cls=CustomJSONEncoder, indent=2, ensure_ascii=False)
+        
+        entries.append({
+            "table_name": table_name,
+            "row_count": len(data),
+            "file": f"{table_name}.json"
+        })
+        
+        logger.info(f"  - Backed up {len(data)} rows")
+    return entries
+
+
+async def backup_database(backup_folder: Optional[str] = None, backup_format: str = "copy", jobs: int = DEFAULT_BACKUP_JOBS, incremental: bool = False,
+                          objects: bool = False, object_store=None):
     """
-    Backs up all tables in the database to JSON files in the specified folder.
+    Backs up all tables in the database to the specified folder.
+    
+    Args:
+        backup_folder: Folder holding the backup_<timestamp> folders
+        backup_format: "copy" streams each table through COPY into a gzip-compressed CSV, several
+            tables at once under one snapshot; "json" writes the original indented JSON files
+        jobs: Tables copied concurrently in "copy" format
+        incremental: Copy only what changed since the latest backup with a watermark, plus the
+            hard deletes since then, as a delta on that backup's chain; falls back to a full backup
+            when there is none. Always in "copy" format
+        objects: Also snapshot the object storage bucket into <backup_folder>/object_storage (see
+            object_backup.py) and link the snapshot manifest from the metadata
+        object_store: Store to snapshot instead of the app's bucket, e.g. a FilesystemObjectStore
     """
+    if backup_format not in ("copy", "json"):
+        raise ValueError(f"Unknown backup format: {backup_format}")
+    if incremental and backup_format != "copy":
+        raise ValueError("Incremental backups are always in copy format")
+    
     folder = backup_folder or DEFAULT_BACKUP_FOLDER
     
+    parent = None
+    if incremental:
+        parent = next((name for name in list_available_backups(folder) if get_backup_metadata(os.path.join(folder, name)).get("watermark")), None)
+        if parent is None:
+            logger.info("No earlier backup with a watermark to build on; taking a full backup")
+    
     if not os.path.exists(folder):
         os.makedirs(folder)
         logger.info(f"Created backup folder: {folder}")
@@ -116,46 +319,55 @@ async def backup_database(backup_folder: Optional[str] = None):
     os.makedirs(backup_subfolder)
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
+        conn = await asyncpg.connect(DATABASE_URL, server_settings=COPY_SESSION_SETTINGS)
         logger.info("Connected to database successfully")
         
-        tables = await get_all_tables(conn)
+        tables = [table_name for table_name in await get_all_tables(conn) if table_name != TOMBSTONE_TABLE]
         logger.info(f"Found {len(tables)} tables: {', '.join(tables)}")
         
         metadata = {
             "backup_timestamp": datetime.now().isoformat(),
+            "format": backup_format,
+            "kind": "incremental" if parent else "full",
             "tables": [],
             "database_url_masked": DATABASE_URL[:20] + "..." if DATABASE_URL else None
         }
         
-        for table_name in tables:
-            logger.info(f"Backing up table: {table_name}")
-            
-            data = await get_table_data(conn, table_name)
-            schema = await get_table_schema(conn, table_name)
-            
-            table_backup = {
-                "table_name": table_name,
-                "schema": schema,
-                "row_count": len(data),
-                "data": data
-            }
-            
-            file_path = os.path.join(backup_subfolder, f"{table_name}.json")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(table_backup, f, cls=CustomJSONEncoder, indent=2, ensure_ascii=False)
-            
-            metadata["tables"].append({
-                "table_name": table_name,
-                "row_count": len(data),
-                "file": f"{table_name}.json"
-            })
-            
-            logger.info(f"  - Backed up {len(data)} rows")
+        if parent:
+            since = datetime.fromisoformat(get_backup_metadata(os.path.join(folder, parent))["watermark"])
+            metadata["parent"] = parent
+            metadata["since"] = since
+            logger.info(f"Backing up changes since {since.isoformat()} on top of {parent}")
+            metadata.update(await backup_tables_copy(conn, tables, backup_subfolder, jobs, since))
+        elif backup_format == "copy":
+            metadata.update(await backup_tables_copy(conn, tables, backup_subfolder, jobs))
+        else:
+            metadata["watermark"] = await conn.fetchval(WATERMARK_QUERY)
+            metadata["tables"] = await backup_tables_json(conn, tables, backup_subfolder)
+        
+        if objects:
+            # A bucket that cannot be reached should not cost the database backup
+            try:
+                manifest_path = await asyncio.to_thread(backup_objects, object_store, os.path.join(folder, "object_storage"))
+                manifest = load_snapshot(manifest_path)
+                metadata["object_snapshot"] = {
+                    "manifest": os.path.relpath(manifest_path, backup_subfolder).replace(os.sep, "/"),
+                    "object_count": manifest["object_count"],
+                    "total_bytes": manifest["total_bytes"],
+                    "failed": len(manifest["failed"])
+                }
+            except Exception as e:
+                logger.error(f"Object storage backup failed: {e}")
+                metadata["object_snapshot"] = {"error": str(e)}
         
         metadata_path = os.path.join(backup_subfolder, "_metadata.json")
         with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+            json.dump(metadata, f, indent=2, cls=CustomJSONEncoder)
+        
+        if not parent and await conn.fetchval("SELECT to_regclass($1)", TOMBSTONE_TABLE):
+            # Deltas on this backup only read tombstones from its watermark on
+            status = await conn.execute(f"DELETE FROM {TOMBSTONE_TABLE} WHERE deleted_at < $1", metadata["watermark"] - INCREMENTAL_OVERLAP)
+            logger.info(f"Purged {status.split()[-1]} tombstones older than this backup")
         
         await conn.close()
         
@@ -175,6 +387,58 @@ async def backup_database(backup_folder: Optional[str] = None):
         raise
 
 
+def get_backup_metadata(backup_path: str) -> dict:
+    """
+    Reads a backup's _metadata.json.
+    """
+    metadata_path = os.path.join(backup_path, "_metadata.json")
+    
+    if not os.path.exists(metadata_path):
+        raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
+    
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def get_backup_chain(backup_path: str) -> list[str]:
+    """
+    Resolves the chain a backup restores from: its full backup followed by every delta up to it.
+    A full backup is a chain of one.
+    
+    Raises:
+        FileNotFoundError: If a backup in the chain is missing
+    """
+    chain = [backup_path]
+    metadata = get_backup_metadata(backup_path)
+    while metadata.get("parent"):
+        parent_path = os.path.join(os.path.dirname(backup_path), metadata["parent"])
+        if not os.path.exists(os.path.join(parent_path, "_metadata.json")):
+            raise FileNotFoundError(f"Backup {os.path.basename(chain[0])} builds on {metadata['parent']}, which is missing")
+        chain.insert(0, parent_path)
+        metadata = get_backup_metadata(parent_path)
+    return chain
+
+
+def describe_backup(backup_path: str) -> str:
+    """
+    Summarizes a backup for listings, e.g. "full, copy, 120 objects" or "incremental on backup_..., chain of 3".
+    """
+    metadata = get_backup_metadata(backup_path)
+    objects = ""
+    if metadata.get("object_snapshot", {}).get("manifest"):
+        objects = f", {metadata['object_snapshot']['object_count']} objects"
+    elif metadata.get("object_snapshot"):
+        objects = ", object backup FAILED"
+    
+    if metadata.get("kind") != "incremental":
+        return f"full, {metadata.get('format', 'json')}{objects}"
+    try:
+        chain = get_backup_chain(backup_path)
+    except FileNotFoundError:
+        return f"incremental on {metadata['parent']}, BROKEN CHAIN{objects}"
+    return f"incremental on {metadata['parent']}, chain of {len(chain)}{objects}"
+
+
 def list_available_backups(backup_folder: Optional[str] = None) -> list[str]:
     """
     Lists all available backup folders.
@@ -199,72 +463,301 @@ def get_backup_tables(backup_path: str) -> list[dict]:
     """
     Gets the list of tables available in a backup.
     """
-    metadata_path = os.path.join(backup_path, "_metadata.json")
+    return get_backup_metadata(backup_path).get("tables", [])
+
+
+async def get_column_types(conn: asyncpg.Connection, table_name: str) -> dict[str, str]:
+    """
+    Fetches the SQL type of every column of a table, e.g. {"id": "uuid", "email": "character varying(255)"}.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT attname, format_type(atttypid, atttypmod) AS column_type
+        FROM pg_attribute
+        WHERE attrelid = $1::regclass AND attnum > 0 AND NOT attisdropped
+        ORDER BY attnum
+        """,
+        f'"{table_name}"'
+    )
+    return {row['attname']: row['column_type'] for row in rows}
+
+
+async def get_primary_key(conn: asyncpg.Connection, table_name: str) -> list[str]:
+    """
+    Fetches the primary key columns of a table; empty if it has none.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT a.attname
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = $1::regclass AND i.indisprimary
+        ORDER BY array_position(i.indkey, a.attnum)
+        """,
+        f'"{table_name}"'
+    )
+    return [row['attname'] for row in rows]
+
+
+async def get_restore_order(conn: asyncpg.Connection, tables: list[str]) -> list[list[str]]:
+    """
+    Groups tables into waves that can be restored concurrently: a table referencing another
+    table being restored by foreign key waits for a later wave.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT conrelid::regclass::text AS child, confrelid::regclass::text AS parent
+        FROM pg_constraint
+        WHERE contype = 'f' AND conrelid <> confrelid
+        """
+    )
+    parents = {table_name: set() for table_name in tables}
+    for row in rows:
+        child, parent = row['child'].strip('"'), row['parent'].strip('"')
+        if child in parents and parent in parents:
+            parents[child].add(parent)
     
-    if not os.path.exists(metadata_path):
-        raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
+    waves = []
+    remaining = list(tables)
+    while remaining:
+        restored = {table_name for wave in waves for table_name in wave}
+        wave = [table_name for table_name in remaining if parents[table_name] <= restored]
+        if not wave:
+            # A reference cycle; restore the rest together rather than never
+            wave = remaining
+        waves.append(wave)
+        remaining = [table_name for table_name in remaining if table_name not in wave]
+    return waves
+
+
+def staging_value(value):
+    """
+    Converts a value from a JSON backup to the text the staging table holds; the merge casts it to the column type.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+async def create_staging_table(conn: asyncpg.Connection, table_name: str, columns: list[str]) -> str:
+    """
+    Creates a temp table with a text column per backed-up column, plus _row numbering the rows
+    in the order they are loaded. It is dropped when the restore transaction ends.
+    """
+    staging_table = f"restore_{table_name}"
+    column_definitions = ', '.join([f'"{col}" TEXT' for col in columns])
+    await conn.execute(
+        f'CREATE TEMP TABLE "{staging_table}" (_row BIGINT GENERATED ALWAYS AS IDENTITY, {column_definitions}) ON COMMIT DROP'
+    )
+    return staging_table
+
+
+async def merge_staged_rows(conn: asyncpg.Connection, table_name: str, staging_table: str, columns: list[str], upsert: bool = False) -> tuple[int, list[dict]]:
+    """
+    Moves staged rows into the table with one INSERT ... SELECT ... ON CONFLICT DO NOTHING, casting each
+    column to its type. If a value cannot be cast or breaks a constraint, falls back to one row at a time
+    under savepoints so only the bad rows are skipped.
+    With `upsert`, rows whose primary key already exists overwrite the existing row instead of being skipped.
     
-    with open(metadata_path, 'r', encoding='utf-8') as f:
-        metadata = json.load(f)
+    Returns:
+        Rows inserted, and the skipped rows as {"row": n, "reason": ..., <primary key>: ...}
+    """
+    column_types = await get_column_types(conn, table_name)
+    unknown_columns = [col for col in columns if col not in column_types]
+    if unknown_columns:
+        raise ValueError(f"Backup has columns {', '.join(unknown_columns)} that {table_name} no longer has")
     
-    return metadata.get("tables", [])
+    column_names = ', '.join([f'"{col}"' for col in columns])
+    casts = ', '.join([f'"{col}"::{column_types[col]}' for col in columns])
+    insert_query = f'INSERT INTO "{table_name}" ({column_names}) SELECT {casts} FROM "{staging_table}"'
+    
+    key_columns = [col for col in await get_primary_key(conn, table_name) if col in columns]
+    key_select = ''.join([f', "{col}"' for col in key_columns])
+    
+    on_conflict = "ON CONFLICT DO NOTHING"
+    update_columns = [col for col in columns if col not in key_columns]
+    if upsert and key_columns and update_columns:
+        key_list = ', '.join([f'"{col}"' for col in key_columns])
+        assignments = ', '.join([f'"{col}" = EXCLUDED."{col}"' for col in update_columns])
+        on_conflict = f"ON CONFLICT ({key_list}) DO UPDATE SET {assignments}"
+    
+    try:
+        async with conn.transaction():
+            if key_columns:
+                key_list = ', '.join([f'"{col}"' for col in key_columns])
+                key_casts = ', '.join([f'staged."{col}"::{column_types[col]}' for col in key_columns])
+                result = await conn.fetchrow(
+                    f"""
+                    WITH inserted AS (
+                        {insert_query} ORDER BY _row {on_conflict} RETURNING {key_list}
+                    ), skipped AS (
+                        SELECT _row AS row, 'conflict' AS reason{key_select}
+                        FROM "{staging_table}" AS staged
+                        WHERE NOT EXISTS (SELECT 1 FROM inserted WHERE ({key_list}) = ({key_casts}))
+                    )
+                    SELECT
+                        (SELECT COUNT(*) FROM inserted) AS inserted,
+                        (SELECT COALESCE(json_agg(skipped ORDER BY row), '[]') FROM skipped) AS skipped
+                    """
+                )
+                return result['inserted'], json.loads(result['skipped'])
+            
+            status = await conn.execute(f"{insert_query} ORDER BY _row {on_conflict}")
+            inserted = int(status.split()[-1])
+            staged = await conn.fetchval(f'SELECT COUNT(*) FROM "{staging_table}"')
+            # Without a primary key there is nothing to tell the skipped rows apart by
+            return inserted, [{"row": None, "reason": "conflict"}] * (staged - inserted)
+    except (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError) as e:
+        logger.warning(f"  - Bulk merge into {table_name} failed ({e}); retrying row by row")
+    
+    inserted = 0
+    skipped = []
+    staged_rows = await conn.fetch(f'SELECT _row{key_select} FROM "{staging_table}" ORDER BY _row')
+    for staged_row in staged_rows:
+        skipped_row = {"row": staged_row['_row'], **{col: staged_row[col] for col in key_columns}}
+        try:
+            async with conn.transaction():
+                status = await conn.execute(f"{insert_query} WHERE _row = $1 {on_conflict}", staged_row['_row'])
+            if status.endswith(" 1"):
+                inserted += 1
+            else:
+                skipped.append({**skipped_row, "reason": "conflict"})
+        except asyncpg.PostgresError as e:
+            skipped.append({**skipped_row, "reason": str(e)})
+    return inserted, skipped
 
 
-async def restore_table(conn: asyncpg.Connection, backup_path: str, table_name: str, clear_existing: bool = False):
+async def stage_copy_file(conn: asyncpg.Connection, backup_path: str, table_info: dict, staging_table: str):
     """
-    Restores a single table from backup.
+    COPYs a gzip-compressed CSV backup into the staging table and checks it against the checksum in the metadata.
     """
-    file_path = os.path.join(backup_path, f"{table_name}.json")
+    file_path = os.path.join(backup_path, table_info['file'])
     
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Backup file not found: {file_path}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        table_backup = json.load(f)
+    digest = hashlib.sha256()
     
-    data = table_backup.get("data", [])
+    async def read_chunks():
+        with gzip.open(file_path, 'rb') as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, COPY_IO_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                yield chunk
     
-    if not data:
-        logger.info(f"No data to restore for table: {table_name}")
-        return 0
+    await conn.copy_to_table(staging_table, source=read_chunks(), columns=table_info['columns'], format='csv', header=True)
     
-    if clear_existing:
-        await conn.execute(f'DELETE FROM "{table_name}"')
-        logger.info(f"  - Cleared existing data from {table_name}")
+    if table_info.get('sha256') and digest.hexdigest() != table_info['sha256']:
+        raise ValueError(f"Checksum mismatch for {table_info['file']}; the file is corrupt or was modified")
+
+
+async def restore_table(conn: asyncpg.Connection, backup_path: str, table_name: str, clear_existing: bool = False, table_info: Optional[dict] = None, upsert: bool = False) -> dict:
+    """
+    Restores a single table from backup in one transaction.
+    Rows are bulk-loaded into a staging table (COPY for compressed CSV backups, copy_records_to_table for
+    JSON ones) and merged with merge_staged_rows; a failure leaves the table as it was. `upsert` is
+    for the changed rows of an incremental backup, which replace the rows they were copied from.
     
-    columns = list(data[0].keys())
-    placeholders = ', '.join([f'${i+1}' for i in range(len(columns))])
-    column_names = ', '.join([f'"{col}"' for col in columns])
+    Returns:
+        Dictionary with rows_restored, rows_skipped, skipped_rows (row is the position in the backup, from 1),
+        seconds and rows_per_second
+    """
+    started = time.perf_counter()
     
-    insert_query = f'INSERT INTO "{table_name}" ({column_names}) VALUES ({placeholders}) ON CONFLICT DO NOTHING'
+    if table_info and table_info.get('format') == "csv.gz":
+        columns = table_info['columns']
+        data = None
+    else:
+        file_path = os.path.join(backup_path, f"{table_name}.json")
+        
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Backup file not found: {file_path}")
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            table_backup = json.load(f)
+        
+        data = table_backup.get("data", [])
+        
+        if not data:
+            logger.info(f"No data to restore for table: {table_name}")
+            return {"rows_restored": 0, "rows_skipped": 0, "skipped_rows": [], "seconds": 0.0, "rows_per_second": 0.0}
+        
+        columns = list(data[0].keys())
     
-    inserted_count = 0
-    for row in data:
-        values = []
-        for col in columns:
-            value = row.get(col)
-            if value is not None:
-                if col in ['created_at', 'updated_at', 'date', 'timestamp']:
-                    if isinstance(value, str):
-                        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
-            values.append(value)
+    async with conn.transaction():
+        if clear_existing:
+            await conn.execute(f'DELETE FROM "{table_name}"')
+            logger.info(f"  - Cleared existing data from {table_name}")
         
-        try:
-            await conn.execute(insert_query, *values)
-            inserted_count += 1
-        except asyncpg.PostgresError as e:
-            logger.warning(f"  - Skipped row due to error: {e}")
+        staging_table = await create_staging_table(conn, table_name, columns)
+        if data is None:
+            await stage_copy_file(conn, backup_path, table_info, staging_table)
+        else:
+            await conn.copy_records_to_table(
+                staging_table,
+                records=(tuple(staging_value(row.get(col)) for col in columns) for row in data),
+                columns=columns
+            )
+        
+        inserted, skipped = await merge_staged_rows(conn, table_name, staging_table, columns, upsert)
+    
+    seconds = time.perf_counter() - started
+    rows = inserted + len(skipped)
+    return {
+        "rows_restored": inserted,
+        "rows_skipped": len(skipped),
+        "skipped_rows": skipped,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds, 1) if seconds else 0.0
+    }
+
+
+async def apply_tombstones(conn: asyncpg.Connection, backup_path: str, tombstones: dict, tables: list[str]) -> dict[str, int]:
+    """
+    Deletes the rows an incremental backup recorded as hard-deleted, in one transaction.
     
-    return inserted_count
+    Returns:
+        Rows deleted per table
+    """
+    deleted = {}
+    async with conn.transaction():
+        columns = ["table_name", "row_id", "deleted_at"]
+        staging_table = await create_staging_table(conn, TOMBSTONE_TABLE, columns)
+        await stage_copy_file(conn, backup_path, {**tombstones, "columns": columns}, staging_table)
+        
+        for table_name in tables:
+            key_columns = await get_primary_key(conn, table_name)
+            if len(key_columns) != 1:
+                continue
+            key_type = (await get_column_types(conn, table_name))[key_columns[0]]
+            status = await conn.execute(
+                f'DELETE FROM "{table_name}" WHERE "{key_columns[0]}" IN (SELECT row_id::{key_type} FROM "{staging_table}" WHERE table_name = $1)',
+                table_name
+            )
+            deleted[table_name] = int(status.split()[-1])
+    return deleted
 
 
-async def restore_database(backup_path: str, selected_tables: Optional[list[str]] = None, clear_existing: bool = False):
+async def restore_database(backup_path: str, selected_tables: Optional[list[str]] = None, clear_existing: bool = False, jobs: int = DEFAULT_BACKUP_JOBS):
     """
     Restores tables from a backup with optional table selection.
+    Up to `jobs` tables are restored at once, each on its own connection; tables linked by a
+    foreign key are restored parent first.
+    
+    An incremental backup is restored by replaying its chain: the full backup it builds on (cleared
+    first if `clear_existing`), then each delta in order - its tombstones deleted, its changed rows
+    upserted, and tables it copied whole cleared and reloaded.
     """
     if not os.path.exists(backup_path):
         raise FileNotFoundError(f"Backup path not found: {backup_path}")
     
+    chain = get_backup_chain(backup_path)
     available_tables = get_backup_tables(backup_path)
     available_table_names = [t['table_name'] for t in available_tables]
     
@@ -281,31 +774,96 @@ async def restore_database(backup_path: str, selected_tables: Optional[list[str]
         return
     
     try:
-        conn = await asyncpg.connect(DATABASE_URL)
+        # Clearing or replaying deletes must not record tombstones of its own
+        conn = await asyncpg.connect(DATABASE_URL, server_settings=RESTORE_SESSION_SETTINGS)
         logger.info("Connected to database successfully")
         
         logger.info(f"\nRestoring {len(tables_to_restore)} tables: {', '.join(tables_to_restore)}")
+        if len(chain) > 1:
+            logger.info(f"Replaying {os.path.basename(chain[0])} and {len(chain) - 1} incremental backups on top of it")
         
-        results = {}
-        for table_name in tables_to_restore:
-            logger.info(f"Restoring table: {table_name}")
-            try:
-                count = await restore_table(conn, backup_path, table_name, clear_existing)
-                results[table_name] = {"status": "success", "rows_restored": count}
-                logger.info(f"  - Restored {count} rows")
-            except Exception as e:
-                results[table_name] = {"status": "error", "error": str(e)}
-                logger.error(f"  - Error: {e}")
+        started = time.perf_counter()
+        waves = await get_restore_order(conn, tables_to_restore)
+        semaphore = asyncio.Semaphore(max(1, jobs))
+        results = {
+            table_name: {"status": "success", "rows_restored": 0, "rows_skipped": 0, "rows_deleted": 0, "skipped_rows": [], "seconds": 0.0}
+            for table_name in tables_to_restore
+        }
+        
+        async def restore_one(step_path: str, table_name: str, table_info: Optional[dict], clear: bool, upsert: bool):
+            if results[table_name]["status"] != "success" or table_info is None:
+                return
+            async with semaphore:
+                logger.info(f"Restoring table: {table_name}")
+                try:
+                    table_conn = await asyncpg.connect(DATABASE_URL, server_settings=RESTORE_SESSION_SETTINGS)
+                    try:
+                        result = await restore_table(table_conn, step_path, table_name, clear, table_info, upsert)
+                    finally:
+                        await table_conn.close()
+                    total = results[table_name]
+                    for key in ("rows_restored", "rows_skipped", "skipped_rows", "seconds"):
+                        total[key] += result[key]
+                    logger.info(
+                        f"  - Restored {result['rows_restored']} rows of {table_name} ({result['rows_skipped']} skipped) "
+                        f"in {result['seconds']}s, {result['rows_per_second']} rows/s"
+                    )
+                except Exception as e:
+                    results[table_name] = {"status": "error", "error": str(e)}
+                    logger.error(f"  - Error restoring {table_name}: {e}")
+        
+        for step, step_path in enumerate(chain):
+            metadata = get_backup_metadata(step_path)
+            table_info_by_name = {t['table_name']: t for t in metadata.get("tables", [])}
+            
+            if step:
+                logger.info(f"\nApplying incremental backup {os.path.basename(step_path)}")
+                if metadata.get("tombstones", {}).get("row_count"):
+                    restorable = [t for t in tables_to_restore if results[t]["status"] == "success"]
+                    deleted = await apply_tombstones(conn, step_path, metadata["tombstones"], restorable)
+                    for table_name, count in deleted.items():
+                        results[table_name]["rows_deleted"] += count
+                    logger.info(f"  - Deleted {sum(deleted.values())} rows removed since the previous backup")
+            
+            for wave in waves:
+                steps = []
+                for table_name in wave:
+                    table_info = table_info_by_name.get(table_name)
+                    delta = bool(step) and table_info is not None and table_info.get("mode") == "delta"
+                    clear = clear_existing if not step else not delta
+                    steps.append(restore_one(step_path, table_name, table_info, clear, delta))
+                await asyncio.gather(*steps)
+        
+        for result in results.values():
+            if result["status"] == "success":
+                rows = result["rows_restored"] + result["rows_skipped"]
+                result["seconds"] = round(result["seconds"], 3)
+                result["rows_per_second"] = round(rows / result["seconds"], 1) if result["seconds"] else 0.0
+        
+        # Restored leads bypass the insert path that maintains the rollups, so recount them
+        if results.get("pdf_downloads", {}).get("status") == "success":
+            rollups = await rebuild_pdf_download_rollups(conn)
+            logger.info(f"Rebuilt {rollups} daily PDF download rollups")
         
         await conn.close()
         
+        elapsed = time.perf_counter() - started
+        total_rows = sum(r['rows_restored'] + r['rows_skipped'] for r in results.values() if r['status'] == "success")
+        
         logger.info(f"\n{'='*50}")
         logger.info("Restore completed!")
+        logger.info(f"{total_rows} rows in {elapsed:.2f}s ({total_rows / elapsed if elapsed else 0:.0f} rows/s)")
         logger.info(f"{'='*50}")
         
-        for table_name, result in results.items():
+        for table_name in tables_to_restore:
+            result = results[table_name]
             if result["status"] == "success":
-                logger.info(f"  ✓ {table_name}: {result['rows_restored']} rows")
+                deleted = f", {result['rows_deleted']} deleted" if result['rows_deleted'] else ""
+                logger.info(f"  ✓ {table_name}: {result['rows_restored']} rows, {result['rows_skipped']} skipped{deleted}, {result['rows_per_second']} rows/s")
+                for skipped_row in result['skipped_rows'][:10]:
+                    logger.info(f"      skipped {skipped_row}")
+                if result['rows_skipped'] > 10:
+                    logger.info(f"      ... and {result['rows_skipped'] - 10} more")
             else:
                 logger.info(f"  ✗ {table_name}: {result['error']}")
         
@@ -384,8 +942,8 @@ def interactive_menu():
     print("\n" + "="*60)
     print("         DATABASE BACKUP & RESTORE UTILITY")
     print("="*60)
-    print("\n1. Backup Database (export all tables to JSON)")
-    print("2. Restore Database (import from JSON backup)")
+    print("\n1. Backup Database (export all tables to compressed CSV, incrementally, or JSON)")
+    print("2. Restore Database (import from a backup)")
     print("3. List Available Backups")
     print("4. Drop All Tables (DANGEROUS)")
     print("5. Exit")
@@ -411,7 +969,7 @@ def interactive_restore():
         backup_path = os.path.join(DEFAULT_BACKUP_FOLDER, backup)
         tables = get_backup_tables(backup_path)
         total_rows = sum(t.get('row_count', 0) for t in tables)
-        print(f"  {i}. {backup} ({len(tables)} tables, {total_rows} rows)")
+        print(f"  {i}. {backup} ({describe_backup(backup_path)}; {len(tables)} tables, {total_rows} rows)")
     
     print("-"*40)
     
@@ -490,8 +1048,11 @@ def main():
         choice = interactive_menu()
         
         if choice == '1':
+            format_choice = input("Format - [c]ompressed CSV via COPY (default), [i]ncremental since the last backup, or [j]son: ").strip().lower()
+            backup_format = "json" if format_choice.startswith('j') else "copy"
+            objects = input("Also back up object storage (uploaded images and PDFs)? (y/N): ").strip().lower() == 'y'
             print("\nStarting database backup...")
-            asyncio.run(backup_database())
+            asyncio.run(backup_database(backup_format=backup_format, incremental=format_choice.startswith('i'), objects=objects))
             
         elif choice == '2':
             result = interactive_restore()
@@ -508,7 +1069,7 @@ def main():
                     backup_path = os.path.join(DEFAULT_BACKUP_FOLDER, backup)
                     tables = get_backup_tables(backup_path)
                     total_rows = sum(t.get('row_count', 0) for t in tables)
-                    print(f"  • {backup}")
+                    print(f"  • {backup} ({describe_backup(backup_path)})")
                     print(f"    Tables: {len(tables)}, Total rows: {total_rows}")
                 print("-"*40)
             else:
@@ -0,0 +1,209 @@
+"""
+Static Asset Fingerprinting Script
+Writes a content-hashed copy (name.<hash>.ext) of every file in the static directories and a
+manifest mapping each asset URL to its hashed copy. Pages are rewritten through the manifest at
+render time, so the hashed URLs can be cached as immutable while the plain ones always revalidate.
+
+Run as a build step, before compress_static_assets.py:
+    python fingerprint_static_assets.py
+    python fingerprint_static_assets.py --keep-days 14
+    python fingerprint_static_assets.py --clean
+Absolute asset URLs inside CSS and JS files are rewritten in the hashed copies, so a changed image
+also changes the hash of every stylesheet that references it.
+
+Copies that drop out of the manifest are listed under "retired" and kept for a grace period, since
+pages rendered before the build (page cache, pre-rendered site, CDN and browser caches) still link them.
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Tuple
+
+from DATABASE_HANDLER.utils.compression import SIDECAR_EXTENSIONS
+from PAGE_SERVING_ROUTERS.asset_manifest import ASSET_DIRECTORIES, ASSET_URL_PATTERN
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(BASE_DIR, "PAGE_SERVING_ROUTERS", "asset_manifest.json")
+HASH_LENGTH = 10
+HASHED_NAME_PATTERN = re.compile(rf"^(?P<stem>.+)\.[0-9a-f]{{{HASH_LENGTH}}}(?P<ext>\.[^.]+)$")
+
+# Files whose absolute asset references are rewritten before hashing; they are hashed after everything else
+REWRITTEN_EXTENSIONS = (".js", ".mjs", ".css")
+
+# Days a hashed copy is kept after it drops out of the manifest
+DEFAULT_RETIRED_COPY_DAYS = 7
+
+
+def iter_assets():
+    """
+    Yield (url, path) for every original static file, skipping hashed copies and compression sidecars
+    """
+    sidecar_extensions = tuple(SIDECAR_EXTENSIONS.values())
+    for prefix, directory in ASSET_DIRECTORIES.items():
+        directory = os.path.join(BASE_DIR, directory)
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.endswith(sidecar_extensions) or is_hashed_copy(root, name):
+                    continue
+                path = os.path.join(root, name)
+                yield prefix + os.path.relpath(path, directory).replace(os.sep, "/"), path
+
+
+def is_hashed_copy(root: str, name: str) -> bool:
+    """
+    Check whether a file is a hashed copy of another file in the same directory
+    """
+    match = HASHED_NAME_PATTERN.match(name)
+    return bool(match) and os.path.exists(os.path.join(root, match.group("stem") + match.group("ext")))
+
+
+def hashed_name(path: str, data: bytes) -> str:
+    """
+    Get the file name of the hashed copy for some file contents
+    """
+    stem, ext = os.path.splitext(os.path.basename(path))
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def fingerprint_file(url: str, path: str, manifest: dict) -> bool:
+    """
+    Write the hashed copy of one file and record it in the manifest
+
+    Args:
+        url: Asset URL of the original file
+        path: Original file
+        manifest: URL -> hashed URL mapping built so far; updated in place
+
+    Returns:
+        True if a new hashed copy was written
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(REWRITTEN_EXTENSIONS):
+        text = data.decode("utf-8", "surrogateescape")
+        text = ASSET_URL_PATTERN.sub(lambda match: manifest.get(match.group(0), match.group(0)), text)
+        data = text.encode("utf-8", "surrogateescape")
+
+    name = hashed_name(path, data)
+    manifest[url] = url[:url.rfind("/") + 1] + name
+    target = os.path.join(os.path.dirname(path), name)
+    if os.path.exists(target):
+        return False
+    with open(target, "wb") as f:
+        f.write(data)
+    return True
+
+
+def iter_hashed_copies() -> Iterator[Tuple[str, str]]:
+    """
+    Yield (hashed url, path) for every hashed copy on disk and each of its sidecars
+    """
+    for prefix, directory in ASSET_DIRECTORIES.items():
+        directory = os.path.join(BASE_DIR, directory)
+        for root, _, files in os.walk(directory):
+            for name in files:
+                base = name
+                for extension in SIDECAR_EXTENSIONS.values():
+                    if base.endswith(extension):
+                        base = base[:-len(extension)]
+                        break
+                if is_hashed_copy(root, base):
+                    yield prefix + os.path.relpath(os.path.join(root, base), directory).replace(os.sep, "/"), os.path.join(root, name)
+
+
+def remove_stale_copies(manifest: dict, retired: dict, grace_period: timedelta) -> Tuple[dict, int]:
+    """
+    Remove hashed copies (and their sidecars) that the manifest has not referenced for grace_period
+
+    Args:
+        manifest: Current URL -> hashed URL mapping
+        retired: Hashed URL -> when it dropped out of the manifest (ISO 8601), from the previous build
+        grace_period: How long a copy is kept once it is no longer referenced
+
+    Returns:
+        Tuple of (retired copies still kept, with when they were retired; files removed)
+    """
+    now = datetime.now(timezone.utc)
+    current = set(manifest.values())
+    kept = {}
+    removed = 0
+    for url, path in iter_hashed_copies():
+        if url in current:
+            continue
+        # Copies left by a build that predates this bookkeeping start their grace period now
+        retired_at = retired.get(url) or kept.get(url) or now.isoformat()
+        if now - datetime.fromisoformat(retired_at) < grace_period:
+            kept[url] = retired_at
+        else:
+            os.remove(path)
+            removed += 1
+    return kept, removed
+
+
+def read_retired() -> dict:
+    """
+    Get the retired copies recorded by the previous build
+    """
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+        return json.load(f).get("retired", {})
+
+
+def build(grace_period: timedelta = timedelta(days=DEFAULT_RETIRED_COPY_DAYS)):
+    """
+    Fingerprint every static file and write the manifest
+
+    Args:
+        grace_period: How long hashed copies are kept after they drop out of the manifest
+    """
+    assets = list(iter_assets())
+    # Referenced files first, so CSS and JS are hashed with their references already rewritten
+    assets.sort(key=lambda asset: asset[1].endswith(REWRITTEN_EXTENSIONS))
+
+    manifest = {}
+    written = sum(fingerprint_file(url, path, manifest) for url, path in assets)
+    retired, removed = remove_stale_copies(manifest, read_retired(), grace_period)
+
+    # Written to a temporary file and swapped in, so a running server never reads a partial manifest
+    with open(MANIFEST_PATH + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"assets": manifest, "retired": retired}, f, indent=2, sort_keys=True)
+    os.replace(MANIFEST_PATH + ".tmp", MANIFEST_PATH)
+
+    logger.info(f"Fingerprinted {len(manifest)} assets ({written} new copies)")
+    logger.info(f"Kept {len(retired)} retired hashed copies; removed {removed} files past their grace period")
+    logger.info(f"Wrote {os.path.relpath(MANIFEST_PATH, BASE_DIR)}")
+
+
+def clean():
+    """
+    Remove every hashed copy and the manifest
+    """
+    _, removed = remove_stale_copies({}, {}, timedelta(0))
+    if os.path.exists(MANIFEST_PATH):
+        os.remove(MANIFEST_PATH)
+    logger.info(f"Removed {removed} hashed copies and the manifest")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write content-hashed copies of the static assets and the asset manifest")
+    parser.add_argument("--clean", action="store_true", help="Remove all hashed copies and the manifest instead of writing them")
+    parser.add_argument("--keep-days", type=float, default=DEFAULT_RETIRED_COPY_DAYS, help="Days to keep hashed copies the manifest no longer references")
+    args = parser.parse_args()
+
+    if args.clean:
+        clean()
+    else:
+        build(timedelta(days=args.keep_days))
+
+
+if __name__ == "__main__":
+    main()
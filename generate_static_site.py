@@ -0,0 +1,47 @@
+"""
+Static Site Generation Script
+Pre-renders every published blog and case study page, the home page, /blogs and each
+/case-studies category listing to STATIC_SITE_DIR. With STATIC_SITE_SERVE=true the app answers
+those URLs from the files and only renders live on a miss.
+
+Run after deploying or as a scheduled job:
+    python generate_static_site.py
+    python generate_static_site.py --output /tmp/site --workers 8
+Setting STATIC_SITE_BUILD_ON_STARTUP=true runs the same build in the background when the app starts.
+"""
+
+import asyncio
+import argparse
+import logging
+
+from config import config
+from DATABASE_HANDLER.connection_pool import db_pool
+from DATABASE_HANDLER.utils.static_site import StaticSite
+from PAGE_SERVING_ROUTERS.static_site_generator import generate_static_site
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def run(output: str, workers: int):
+    await db_pool.initialize(min_size=1, max_size=config.DB_POOL_MAX_SIZE)
+    try:
+        summary = await generate_static_site(StaticSite(output), workers=workers)
+    finally:
+        await db_pool.close()
+
+    for name, count in summary.items():
+        logger.info(f"{name}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render the published site to static HTML files")
+    parser.add_argument("--output", default=config.STATIC_SITE_DIR, help="Output directory (default: STATIC_SITE_DIR)")
+    parser.add_argument("--workers", type=int, default=config.STATIC_SITE_WORKERS, help="Render worker processes")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.output, args.workers))
+
+
+if __name__ == "__main__":
+    main()
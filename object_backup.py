@@ -0,0 +1,306 @@
+"""
+Object Storage Backup Script
+Backs up the MinIO bucket holding the uploaded images and PDFs that blog and case study content
+links to. Each run lists the bucket, compares ETags with the previous snapshot manifest and
+downloads only new or changed objects, several at a time, streaming each one to disk.
+
+Blobs are stored once per ETag under <folder>/blobs, so every snapshot manifest under
+<folder>/snapshots describes the whole bucket while only changed objects take new space.
+db_backup_restore.py runs this alongside a database backup and links the manifest from its metadata.
+
+    python object_backup.py backup
+    python object_backup.py backup --source-dir /srv/bucket-copy --jobs 16
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+DEFAULT_OBJECT_BACKUP_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "database_backup", "object_storage")
+
+# Objects downloaded at once; downloads wait on the network, so threads are enough
+DEFAULT_OBJECT_BACKUP_JOBS = 8
+
+# Bytes read from the bucket and written to disk at a time
+OBJECT_IO_CHUNK_SIZE = 1024 * 1024
+
+
+class StoredObject:
+    """
+    One object in a bucket listing.
+    """
+
+    __slots__ = ("name", "etag", "size", "last_modified")
+
+    def __init__(self, name: str, etag: str, size: int, last_modified: Optional[datetime]):
+        self.name = name
+        self.etag = etag
+        self.size = size
+        self.last_modified = last_modified
+
+
+class MinioObjectStore:
+    """
+    Reads objects from a MinIO (or any S3-compatible) bucket.
+    """
+
+    # Single-part ETags stop being MD5s once server-side encryption is on
+    etags_are_md5 = False
+
+    def __init__(self, client, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.description = f"bucket {bucket_name}"
+
+    @classmethod
+    def from_env(cls) -> "MinioObjectStore":
+        """
+        Connects with the MINIO_* settings the app uses.
+        """
+        from minio import Minio
+
+        parsed_url = urlparse(os.getenv("MINIO_PUBLIC_ENDPOINT"))
+        client = Minio(
+            endpoint=parsed_url.netloc,
+            access_key=os.getenv("MINIO_ACCESS_KEY"),
+            secret_key=os.getenv("MINIO_SECRET_KEY"),
+            secure=parsed_url.scheme == 'https'
+        )
+        return cls(client, os.getenv("MINIO_BUCKET_NAME"))
+
+    def list_objects(self) -> Iterator[StoredObject]:
+        for obj in self.client.list_objects(self.bucket_name, recursive=True):
+            if not obj.is_dir:
+                yield StoredObject(obj.object_name, obj.etag.strip('"'), obj.size, obj.last_modified)
+
+    def download(self, obj: StoredObject, file) -> int:
+        response = self.client.get_object(self.bucket_name, obj.name)
+        try:
+            written = 0
+            for chunk in response.stream(OBJECT_IO_CHUNK_SIZE):
+                file.write(chunk)
+                written += len(chunk)
+            return written
+        finally:
+            response.close()
+            response.release_conn()
+
+
+class FilesystemObjectStore:
+    """
+    Reads objects from a local directory laid out like the bucket, one file per object name.
+    Stands in for MinIO in tests and for buckets mirrored to disk; ETags are the MD5 of each
+    file, as S3 computes them for objects uploaded in one part.
+    """
+
+    etags_are_md5 = True
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.description = f"directory {self.root}"
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, *name.split("/"))
+
+    def list_objects(self) -> Iterator[StoredObject]:
+        # os.walk would list a missing directory as an empty bucket
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(f"Object directory not found: {self.root}")
+        for directory, _, files in os.walk(self.root):
+            for file_name in sorted(files):
+                path = os.path.join(directory, file_name)
+                digest = hashlib.md5()
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(OBJECT_IO_CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                stat = os.stat(path)
+                yield StoredObject(
+                    os.path.relpath(path, self.root).replace(os.sep, "/"),
+                    digest.hexdigest(),
+                    stat.st_size,
+                    datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+                )
+
+    def download(self, obj: StoredObject, file) -> int:
+        with open(self._path(obj.name), 'rb') as source:
+            shutil.copyfileobj(source, file, OBJECT_IO_CHUNK_SIZE)
+            return source.tell()
+
+
+def blob_path(folder: str, etag: str) -> str:
+    """
+    Where the blob for an ETag is kept. Multipart ETags ("<md5>-<parts>") are kept as they are.
+    """
+    return os.path.join(folder, "blobs", etag[:2], etag)
+
+
+def list_snapshots(folder: Optional[str] = None) -> list[str]:
+    """
+    Lists snapshot manifests, newest first.
+    """
+    snapshots_folder = os.path.join(folder or DEFAULT_OBJECT_BACKUP_FOLDER, "snapshots")
+
+    if not os.path.exists(snapshots_folder):
+        return []
+
+    return sorted((name for name in os.listdir(snapshots_folder) if name.startswith("snapshot_") and name.endswith(".json")), reverse=True)
+
+
+def load_snapshot(manifest_path: str) -> dict:
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def download_object(store, obj: StoredObject, folder: str) -> int:
+    """
+    Streams one object to its blob, through a temporary file so an interrupted download never
+    leaves a partial blob behind. The byte count is checked, and the MD5 when the store's ETags are MD5s.
+
+    Returns:
+        Bytes written
+    """
+    path = blob_path(folder, obj.etag)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.part"
+
+    try:
+        with open(temp_path, 'wb') as f:
+            written = store.download(obj, f)
+
+        if written != obj.size:
+            raise IOError(f"Expected {obj.size} bytes of {obj.name}, got {written}")
+
+        if store.etags_are_md5 and "-" not in obj.etag:
+            digest = hashlib.md5()
+            with open(temp_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(OBJECT_IO_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            if digest.hexdigest() != obj.etag:
+                raise IOError(f"Checksum mismatch for {obj.name}; it changed during the download")
+
+        os.replace(temp_path, path)
+        return written
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def backup_objects(store=None, folder: Optional[str] = None, jobs: int = DEFAULT_OBJECT_BACKUP_JOBS) -> str:
+    """
+    Takes a snapshot of the bucket.
+
+    Objects whose ETag matches the previous snapshot, or whose blob is already on disk, are not
+    downloaded again; the rest are downloaded by up to `jobs` workers. Objects that fail to
+    download are left out of the snapshot and listed under "failed" in its manifest.
+
+    Args:
+        store: MinioObjectStore or FilesystemObjectStore; defaults to the app's bucket
+        folder: Folder holding blobs/ and snapshots/
+        jobs: Concurrent downloads
+
+    Returns:
+        Path of the snapshot manifest
+    """
+    store = store or MinioObjectStore.from_env()
+    folder = folder or DEFAULT_OBJECT_BACKUP_FOLDER
+    os.makedirs(os.path.join(folder, "snapshots"), exist_ok=True)
+
+    snapshots = list_snapshots(folder)
+    previous = load_snapshot(os.path.join(folder, "snapshots", snapshots[0]))["objects"] if snapshots else {}
+    logger.info(f"Backing up {store.description}" + (f", compared with {snapshots[0]}" if snapshots else ""))
+
+    objects = {}
+    unchanged = 0
+    to_download = {}
+    for obj in store.list_objects():
+        objects[obj.name] = obj
+        if previous.get(obj.name, {}).get("etag") == obj.etag:
+            unchanged += 1
+        # The blob may be on disk already: the object is unchanged, or another name has the same content
+        if not os.path.exists(blob_path(folder, obj.etag)):
+            to_download.setdefault(obj.etag, obj)
+
+    logger.info(f"Found {len(objects)} objects: {unchanged} unchanged since the previous snapshot, {len(to_download)} to download")
+
+    downloaded_bytes = 0
+    failed = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {executor.submit(download_object, store, obj, folder): obj for obj in to_download.values()}
+        for future in as_completed(futures):
+            obj = futures[future]
+            try:
+                downloaded_bytes += future.result()
+            except Exception as e:
+                failed[obj.etag] = str(e)
+                logger.error(f"  - Error downloading {obj.name}: {e}")
+
+    manifest = {
+        "snapshot_timestamp": datetime.now().isoformat(),
+        "source": store.description,
+        "previous": snapshots[0] if snapshots else None,
+        "object_count": 0,
+        "total_bytes": 0,
+        "downloaded_objects": len(to_download) - len(failed),
+        "downloaded_bytes": downloaded_bytes,
+        "objects": {},
+        "failed": {}
+    }
+    for name, obj in objects.items():
+        if obj.etag in failed:
+            manifest["failed"][name] = failed[obj.etag]
+            continue
+        manifest["objects"][name] = {
+            "etag": obj.etag,
+            "size": obj.size,
+            "last_modified": obj.last_modified.isoformat() if obj.last_modified else None,
+            "blob": os.path.relpath(blob_path(folder, obj.etag), folder).replace(os.sep, "/")
+        }
+        manifest["object_count"] += 1
+        manifest["total_bytes"] += obj.size
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    manifest_path = os.path.join(folder, "snapshots", f"snapshot_{timestamp}.json")
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, manifest_path)
+
+    logger.info(f"\n{'='*50}")
+    logger.info(f"Object backup completed{' with ' + str(len(manifest['failed'])) + ' failures' if manifest['failed'] else ''}!")
+    logger.info(f"Snapshot: {manifest_path}")
+    logger.info(f"Objects: {manifest['object_count']} ({manifest['total_bytes'] / 1024 / 1024:.1f}MB), "
+                f"downloaded {manifest['downloaded_objects']} ({downloaded_bytes / 1024 / 1024:.1f}MB)")
+    logger.info(f"{'='*50}")
+
+    return manifest_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back up the object storage bucket")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    backup = subcommands.add_parser("backup", help="Snapshot the bucket, downloading only new or changed objects")
+    backup.add_argument("--folder", default=DEFAULT_OBJECT_BACKUP_FOLDER, help="Folder holding blobs/ and snapshots/")
+    backup.add_argument("--jobs", type=int, default=DEFAULT_OBJECT_BACKUP_JOBS, help="Concurrent downloads")
+    backup.add_argument("--source-dir", help="Back up a local directory laid out like the bucket instead of MinIO")
+    args = parser.parse_args()
+
+    if args.command == "backup":
+        store = FilesystemObjectStore(args.source_dir) if args.source_dir else MinioObjectStore.from_env()
+        backup_objects(store, args.folder, args.jobs)
+
+
+if __name__ == "__main__":
+    main()